@@ -14,7 +14,7 @@ We switch from the density strategy to the greedy strategy as soon as the number
 The strategy() function makes it easy to modify the parameters defining the moment of changeover.
 In strategy(), we've chosen as the changeover condition: less than 15 cheeses remaining or the density of cheeses in the maze is less than 15%.
 Please note that the density search algorithm presented below is not optimal, as it is too complex.
-We didn't rely on the metagraph, which would have made operations less cumbersome.
+Distances are computed with a Metagraph, i.e., with a single batched Dijkstra search from the player and all pieces of cheese.
 However, the program has the merit of being more original than the basic greedy, but above all of working better than it.
 """
 
@@ -30,8 +30,13 @@ import numpy
 import threading
 
 # External imports
+import sys
+import os
 
 # Previously developed functions
+sys.path.append(os.path.join(os.path.dirname(os.path.realpath(__file__)), "pyrat-project-main", "pyrat_workspace", "programs"))
+from metagraph import Metagraph
+from tutorial import locations_to_action
 
 
 #####################################################################################################################################################
@@ -46,9 +51,10 @@ import threading
 def give_score ( graph:          Union[numpy.ndarray, Dict[int, Dict[int, int]]],
                  current_vertex: int,
                  targets:        List[int]
-               ):
+               ) ->              Tuple[Dict[int, float], Dict[int, float], Metagraph]:
     """
         Function that associates two scores to each target: a density score and a distance score
+        All distances are obtained with a single batched Dijkstra search from the current vertex and all targets.
         In:
             * graph:             Graph containing the vertices.
             * current_vertex:    Current location of the player in the maze.
@@ -57,26 +63,25 @@ def give_score ( graph:          Union[numpy.ndarray, Dict[int, Dict[int, int]]]
         Out:
             * scores_density:     Scores given to the target regarding the density of cheese arround it
             * distance_score:     Scores given to the target regarding its distance from current position
-            * routing_table:      Routing table obtained from the current vertex.
+            * metagraph:          Complete graph of the current vertex and the targets, to find routes from the current vertex.
     """
+    # Single traversal from all vertices of interest
+    metagraph = Metagraph(graph, [current_vertex] + [target for target in targets if target != current_vertex])
+
     # DISTANCE SCORE
-    distance_score, routing_table = dijkstra(current_vertex,graph)
-    print (distance_score) # the lower the distance score, the better
+    distance_score = {target: metagraph.distance(current_vertex, target) for target in targets} # the lower the distance score, the better
 
     # DENSITY SCORE
-    density_score = {v:0 for v in targets}
-    for target in targets:
-        distance = dijkstra(target, graph)[0]
-        for vertex in targets: 
-            if target!=vertex: 
-                density_score[target]+= distance[vertex] # to define a cheese's density score, we add up all the distances separating it from other cheeses
-    print(density_score) # the lower the density score, the better
-    
-    return density_score, distance_score, routing_table
+    # to define a cheese's density score, we add up all the distances separating it from other cheeses
+    target_indices = [metagraph.vertex_indices[target] for target in targets]
+    distances = metagraph.distances[numpy.ix_(target_indices, target_indices)].sum(axis=1).tolist()
+    density_score = {target: distances[i] for i, target in enumerate(targets)} # the lower the density score, the better
+
+    return density_score, distance_score, metagraph
 
 def graph_to_metagraph ( graph:    Union[numpy.ndarray, Dict[int, Dict[int, int]]],
                          vertices: List[int]
-                       ) ->        Tuple[numpy.ndarray, Dict[int, Dict[int, Union[None, int]]]]:
+                       ) ->        Tuple[Dict[int, Dict[int, float]], Dict[int, numpy.ndarray]]:
     
     """
         Function to build a complete graph out of locations of interest in a given graph.
@@ -88,21 +93,10 @@ def graph_to_metagraph ( graph:    Union[numpy.ndarray, Dict[int, Dict[int, int]
             * routing_tables: Dictionary of routing tables obtained by traversals used to build the complete graph.
     """
     
-    complete_graph = {}
-    routing_tables = {}
-
-    for vertice in vertices:
-
-        # We apply dijkstra to every vertice
-        distances_to_explored_vertices, routing_tables[vertice] = dijkstra(vertice, graph)
-
-        #We add all of the other vertices in the complete graph with the key of the vertice we're working on
-        for cheese in vertices:
-            if cheese != vertice:
-                if vertice not in complete_graph.keys():
-                    complete_graph[vertice] = {cheese: distances_to_explored_vertices[cheese]}
-                else:
-                    complete_graph[vertice][cheese] = distances_to_explored_vertices[cheese]
+    # We apply dijkstra to all vertices at once
+    metagraph = Metagraph(graph, vertices)
+    complete_graph = metagraph.as_dictionary()
+    routing_tables = {vertice: metagraph.routing_tables[i] for i, vertice in enumerate(metagraph.vertices)}
 
     return complete_graph, routing_tables
 
@@ -224,14 +218,14 @@ def turn ( maze:             Union[numpy.ndarray, Dict[int, Dict[int, int]]],
     """
     strat = strategy(cheese,maze_width,maze_height) 
     if strat == "density" :
-        density_score, distance_score, routing_table = give_score (maze, player_locations[name], cheese )
+        density_score, distance_score, metagraph = give_score (maze, player_locations[name], cheese )
         closest_cheese = find_closest(density_score,distance_score)
-        next_location = find_route (routing_table, player_locations[name], closest_cheese)[1]
+        next_location = metagraph.route(player_locations[name], closest_cheese)[1]
         action=locations_to_action(player_locations[name],next_location, maze_width)
     else: # otherwise strat == "greedy"
-        scores, routing_table = give_score_2 (maze, player_locations[name], cheese )
-        closest_cheese = find_closest_2(scores)
-        next_location = find_route (routing_table, player_locations[name], closest_cheese)[1]
+        _, distance_score, metagraph = give_score (maze, player_locations[name], cheese )
+        closest_cheese = min(distance_score, key=distance_score.get)
+        next_location = metagraph.route(player_locations[name], closest_cheese)[1]
         action=locations_to_action(player_locations[name],next_location, maze_width)
         
     return action
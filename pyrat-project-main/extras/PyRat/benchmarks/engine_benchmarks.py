@@ -0,0 +1,509 @@
+#####################################################################################################################################################
+######################################################################## INFO #######################################################################
+#####################################################################################################################################################
+
+"""
+    This script measures the time taken by the main steps of the PyRat engine, to detect performance regressions between engine versions.
+    Each benchmark prepares a fresh game, then times repeated calls to one step of the engine.
+    Results are saved as JSON, and can be compared to the results of a previous run with the "--compare" option.
+    Example: "python engine_benchmarks.py --output new.json --compare old.json".
+"""
+
+#####################################################################################################################################################
+###################################################################### IMPORTS ######################################################################
+#####################################################################################################################################################
+
+# External imports
+import argparse
+import contextlib
+import datetime
+import io
+import json
+import multiprocessing
+import os
+import platform
+import random
+import re
+import statistics
+import sys
+import time
+import numpy
+from typing import *
+from typing_extensions import *
+
+# PyRat parses the command line when imported, so the arguments of this script are put aside
+script_arguments = sys.argv[1:]
+sys.argv = sys.argv[:1]
+
+# PyRat imports
+sys.path.append(os.path.join(os.path.dirname(os.path.realpath(__file__)), ".."))
+import pyrat
+
+#####################################################################################################################################################
+############################################################### VARIABLES & CONSTANTS ###############################################################
+#####################################################################################################################################################
+
+"""
+    Sizes of the mazes on which benchmarks are run, as (width, height, number of pieces of cheese, number of players).
+    Full games are only played on the smallest maze, as trivial players take very long to finish larger ones.
+"""
+
+MAZE_SIZES = [(15, 11, 21, 2), (31, 29, 41, 4), (101, 101, 201, 8)]
+GAME_MAZE_SIZES = MAZE_SIZES[:1]
+
+#####################################################################################################################################################
+
+"""
+    Common configuration of the games used in benchmarks.
+"""
+
+GAME_CONFIG = {"random_seed": 42,
+               "render_mode": "no_rendering",
+               "preprocessing_time": 0.0,
+               "turn_time": 0.0,
+               "synchronous": True}
+
+#####################################################################################################################################################
+
+"""
+    Number of copies of a game simulated together when measuring batched games.
+"""
+
+BATCH_SIZE = 100
+
+#####################################################################################################################################################
+##################################################################### FUNCTIONS #####################################################################
+#####################################################################################################################################################
+
+def trivial_turn ( maze:             Union[numpy.ndarray, Dict[int, Dict[int, int]]],
+                   maze_width:       int,
+                   maze_height:      int,
+                   name:             str,
+                   teams:            Dict[str, List[str]],
+                   player_locations: Dict[str, int],
+                   player_scores:    Dict[str, float],
+                   player_muds:      Dict[str, Dict[str, Union[None, int]]],
+                   cheese:           List[int],
+                   possible_actions: List[str],
+                   memory:           Any
+                 ) ->                str:
+
+    """
+        Turn function of the players used in benchmarks, which costs almost nothing.
+        In:
+            * maze:             Map of the maze.
+            * maze_width:       Width of the maze in number of cells.
+            * maze_height:      Height of the maze in number of cells.
+            * name:             Name of the player controlled by this function.
+            * teams:            Recap of the teams of players.
+            * player_locations: Locations for all players in the game.
+            * player_scores:    Scores for all players in the game.
+            * player_muds:      Indicates which player is currently crossing mud.
+            * cheese:           List of available pieces of cheese in the maze.
+            * possible_actions: List of possible actions.
+            * memory:           Local memory of the player.
+        Out:
+            * action: One of the possible actions.
+    """
+
+    # Random possible action
+    action = random.choice(possible_actions)
+    return action
+
+#####################################################################################################################################################
+
+def make_game ( maze_width:  int,
+                maze_height: int,
+                nb_cheese:   int,
+                nb_players:  int,
+                **config:    Any
+              ) ->           pyrat.PyRat:
+
+    """
+        Creates a game with trivial players, and resets the random generators so that games are reproducible.
+        In:
+            * maze_width:  Width of the maze in number of cells.
+            * maze_height: Height of the maze in number of cells.
+            * nb_cheese:   Number of pieces of cheese in the maze.
+            * nb_players:  Number of players in the game.
+            * config:      Additional arguments of the PyRat constructor.
+        Out:
+            * game: Game ready to be started.
+    """
+
+    # Create the game
+    random.seed(GAME_CONFIG["random_seed"])
+    players = [{"name": "Player %d" % (i + 1), "turn_function": trivial_turn} for i in range(nb_players)]
+    game = pyrat.PyRat(players, maze_width=maze_width, maze_height=maze_height, nb_cheese=nb_cheese, **{**GAME_CONFIG, **config})
+    return game
+
+#####################################################################################################################################################
+
+def echo_process_function ( input_queue:  multiprocessing.Queue,
+                            output_queue: multiprocessing.Queue
+                          ) ->            None:
+
+    """
+        Answers every message received with an action, as a player process would, until None is received.
+        In:
+            * input_queue:  Queue to receive messages.
+            * output_queue: Queue to send answers.
+        Out:
+            * None.
+    """
+
+    # Answer until asked to stop
+    while input_queue.get() is not None:
+        output_queue.put(("nothing", 0.0))
+
+#####################################################################################################################################################
+
+def benchmark_create_maze_random ( maze_width:  int,
+                                   maze_height: int,
+                                   nb_cheese:   int,
+                                   nb_players:  int
+                                 ) ->           Callable[[], Any]:
+
+    """
+        Prepares the generation of a random maze with the default generator.
+        In:
+            * maze_width:  Width of the maze in number of cells.
+            * maze_height: Height of the maze in number of cells.
+            * nb_cheese:   Number of pieces of cheese in the maze.
+            * nb_players:  Number of players in the game.
+        Out:
+            * measured_function: Function to time.
+    """
+
+    # Generate the maze of the game again
+    game = make_game(maze_width, maze_height, nb_cheese, nb_players)
+    return game._create_maze_random
+
+#####################################################################################################################################################
+
+def benchmark_distribute_cheese ( maze_width:  int,
+                                  maze_height: int,
+                                  nb_cheese:   int,
+                                  nb_players:  int
+                                ) ->           Callable[[], Any]:
+
+    """
+        Prepares the random distribution of pieces of cheese in a maze.
+        In:
+            * maze_width:  Width of the maze in number of cells.
+            * maze_height: Height of the maze in number of cells.
+            * nb_cheese:   Number of pieces of cheese in the maze.
+            * nb_players:  Number of players in the game.
+        Out:
+            * measured_function: Function to time.
+    """
+
+    # Distribute the cheese of the game again
+    game = make_game(maze_width, maze_height, nb_cheese, nb_players)
+    return game._distribute_cheese
+
+#####################################################################################################################################################
+
+def benchmark_update_game_state ( maze_width:  int,
+                                  maze_height: int,
+                                  nb_cheese:   int,
+                                  nb_players:  int
+                                ) ->           Callable[[], Any]:
+
+    """
+        Prepares successive updates of the game state with random actions.
+        In:
+            * maze_width:  Width of the maze in number of cells.
+            * maze_height: Height of the maze in number of cells.
+            * nb_cheese:   Number of pieces of cheese in the maze.
+            * nb_players:  Number of players in the game.
+        Out:
+            * measured_function: Function to time.
+    """
+
+    # Actions are drawn in advance so that only the update is measured
+    game = make_game(maze_width, maze_height, nb_cheese, nb_players)
+    possible_actions = ["nothing", "north", "east", "south", "west"]
+    all_actions = [{player: random.choice(possible_actions) for player in game.player_locations} for _ in range(1000)]
+    turn = iter(range(10 ** 9))
+    measured_function = lambda: game._update_game_state(all_actions[next(turn) % len(all_actions)])
+    return measured_function
+
+#####################################################################################################################################################
+
+def benchmark_batched_step ( maze_width:  int,
+                             maze_height: int,
+                             nb_cheese:   int,
+                             nb_players:  int
+                           ) ->           Callable[[], Any]:
+
+    """
+        Prepares successive turns of a batch of copies of a game with random actions.
+        In:
+            * maze_width:  Width of the maze in number of cells.
+            * maze_height: Height of the maze in number of cells.
+            * nb_cheese:   Number of pieces of cheese in the maze.
+            * nb_players:  Number of players in the game.
+        Out:
+            * measured_function: Function to time.
+    """
+
+    # Actions are drawn in advance so that only the update is measured
+    game = make_game(maze_width, maze_height, nb_cheese, nb_players)
+    batched_game = pyrat.BatchedPyRat([game] * BATCH_SIZE)
+    all_actions = numpy.random.default_rng(GAME_CONFIG["random_seed"]).integers(0, len(pyrat.BatchedPyRat.POSSIBLE_ACTIONS), size=(1000, BATCH_SIZE, nb_players))
+    turn = iter(range(10 ** 9))
+    measured_function = lambda: batched_game.step(all_actions[next(turn) % len(all_actions)])
+    return measured_function
+
+#####################################################################################################################################################
+
+def benchmark_render_ascii ( maze_width:  int,
+                             maze_height: int,
+                             nb_cheese:   int,
+                             nb_players:  int
+                           ) ->           Callable[[], Any]:
+
+    """
+        Prepares the rendering of a game in ansi, the rendered text being discarded.
+        In:
+            * maze_width:  Width of the maze in number of cells.
+            * maze_height: Height of the maze in number of cells.
+            * nb_cheese:   Number of pieces of cheese in the maze.
+            * nb_players:  Number of players in the game.
+        Out:
+            * measured_function: Function to time.
+    """
+
+    # Render the first turn to a string that is thrown away
+    game = make_game(maze_width, maze_height, nb_cheese, nb_players, render_mode="ansi")
+    def measured_function ():
+        with contextlib.redirect_stderr(io.StringIO()):
+            game._render_ascii(True, 0, False)
+    return measured_function
+
+#####################################################################################################################################################
+
+def benchmark_start_in_process ( maze_width:  int,
+                                 maze_height: int,
+                                 nb_cheese:   int,
+                                 nb_players:  int
+                               ) ->           Callable[[], Any]:
+
+    """
+        Prepares a full game without rendering, with trivial players called in the main process.
+        The same game is played at each call.
+        In:
+            * maze_width:  Width of the maze in number of cells.
+            * maze_height: Height of the maze in number of cells.
+            * nb_cheese:   Number of pieces of cheese in the maze.
+            * nb_players:  Number of players in the game.
+        Out:
+            * measured_function: Function to time.
+    """
+
+    # Create and play a new game at each call
+    measured_function = lambda: make_game(maze_width, maze_height, nb_cheese, nb_players, in_process=True).start()
+    return measured_function
+
+#####################################################################################################################################################
+
+def benchmark_start_multiprocess ( maze_width:  int,
+                                   maze_height: int,
+                                   nb_cheese:   int,
+                                   nb_players:  int
+                                 ) ->           Callable[[], Any]:
+
+    """
+        Prepares a full game without rendering, with trivial players in their own processes taken from a pool.
+        The same game is played at each call.
+        In:
+            * maze_width:  Width of the maze in number of cells.
+            * maze_height: Height of the maze in number of cells.
+            * nb_cheese:   Number of pieces of cheese in the maze.
+            * nb_players:  Number of players in the game.
+        Out:
+            * measured_function: Function to time.
+    """
+
+    # The pool is created with the first game, so that the start of processes is not measured
+    players = [{"name": "Player %d" % (i + 1), "turn_function": trivial_turn} for i in range(nb_players)]
+    player_pool = pyrat.PlayerPool(players)
+    make_game(maze_width, maze_height, nb_cheese, nb_players, player_pool=player_pool).start()
+    measured_function = lambda: make_game(maze_width, maze_height, nb_cheese, nb_players, player_pool=player_pool).start()
+
+    # The pool is closed when the benchmark is over
+    measured_function.close = player_pool.close
+    return measured_function
+
+#####################################################################################################################################################
+
+def benchmark_ipc_round_trip ( maze_width:  int,
+                               maze_height: int,
+                               nb_cheese:   int,
+                               nb_players:  int
+                             ) ->           Callable[[], Any]:
+
+    """
+        Prepares the exchange of a turn message with a process, through the same kind of queues as players.
+        The message contains the changes of a turn where every player moved.
+        In:
+            * maze_width:  Width of the maze in number of cells.
+            * maze_height: Height of the maze in number of cells.
+            * nb_cheese:   Number of pieces of cheese in the maze.
+            * nb_players:  Number of players in the game.
+        Out:
+            * measured_function: Function to time.
+    """
+
+    # Build a typical message
+    game = make_game(maze_width, maze_height, nb_cheese, nb_players)
+    sent_game_state = pyrat._copy_game_state(game.player_locations, game.player_scores, game.player_muds, game.cheese)
+    game._update_game_state({player: random.choice(["north", "east", "south", "west"]) for player in game.player_locations})
+    game_state_delta = pyrat._make_game_state_delta(sent_game_state, game.player_locations, game.player_scores, game.player_muds, game.cheese)
+    message = (game_state_delta, 1, 0.1, None)
+
+    # Start a process that answers messages
+    sync_manager = pyrat._get_sync_manager()
+    input_queue = sync_manager.Queue()
+    output_queue = sync_manager.Queue()
+    process = multiprocessing.Process(target=echo_process_function, args=(input_queue, output_queue))
+    process.start()
+
+    # Send a message and wait for the answer
+    def measured_function ():
+        input_queue.put(message)
+        output_queue.get()
+
+    # The process is stopped when the benchmark is over
+    measured_function.close = lambda: (input_queue.put(None), process.join())
+    return measured_function
+
+#####################################################################################################################################################
+
+def measure ( benchmark:  Callable[..., Callable[[], Any]],
+              maze_size:  Tuple[int, int, int, int],
+              repeat:     int,
+              min_time:   float
+            ) ->          Dict[str, Any]:
+
+    """
+        Times a benchmark on a fresh game per repetition.
+        The number of calls per repetition is chosen on the first game so that a repetition lasts at least min_time seconds.
+        In:
+            * benchmark: Function preparing the function to time.
+            * maze_size: Size of the maze, as in MAZE_SIZES.
+            * repeat:    Number of repetitions.
+            * min_time:  Minimum duration of a repetition.
+        Out:
+            * result: Number of calls per repetition, and statistics on the duration of a call, in seconds.
+    """
+
+    # Time each repetition
+    number = None
+    durations = []
+    for _ in range(repeat):
+        measured_function = benchmark(*maze_size)
+        if number is None:
+            number = 1
+            start = time.perf_counter()
+            measured_function()
+            first_duration = time.perf_counter() - start
+            number = max(1, int(min_time / max(first_duration, 1e-9)))
+        start = time.perf_counter()
+        for _ in range(number):
+            measured_function()
+        durations.append((time.perf_counter() - start) / number)
+        if hasattr(measured_function, "close"):
+            measured_function.close()
+
+    # Summarize
+    result = {"number": number, "repeat": repeat, "min": min(durations), "median": statistics.median(durations), "mean": statistics.mean(durations)}
+    return result
+
+#####################################################################################################################################################
+
+def compare ( previous_results: Dict[str, Any],
+              results:          Dict[str, Any],
+              threshold:        float
+            ) ->                List[str]:
+
+    """
+        Prints the ratio between the current and previous durations of the benchmarks run in both cases.
+        Minimum durations are compared, as they are the least sensitive to the load of the machine.
+        In:
+            * previous_results: Results of a previous run.
+            * results:          Results of the current run.
+            * threshold:        Ratio above which a benchmark is reported as a regression.
+        Out:
+            * regressions: Names of the benchmarks that got slower.
+    """
+
+    # Compare benchmarks in common
+    regressions = []
+    print("Comparison with %s" % (previous_results["metadata"]["label"]))
+    for name in results["benchmarks"]:
+        if name in previous_results["benchmarks"]:
+            previous_duration = previous_results["benchmarks"][name]["min"]
+            duration = results["benchmarks"][name]["min"]
+            ratio = duration / previous_duration
+            if ratio > threshold:
+                regressions.append(name)
+            print("    %-40s %12.6f s -> %12.6f s  (x%.2f)%s" % (name, previous_duration, duration, ratio, "  REGRESSION" if ratio > threshold else ""))
+    return regressions
+
+#####################################################################################################################################################
+######################################################################## GO! ########################################################################
+#####################################################################################################################################################
+
+if __name__ == "__main__":
+
+    # Parse arguments
+    parser = argparse.ArgumentParser(description="Measures the time taken by the main steps of the PyRat engine")
+    parser.add_argument("--output",    type=str,   default="engine_benchmarks.json", help="File where to save the results")
+    parser.add_argument("--compare",   type=str,   default=None,                     help="File with results of a previous run, to compare with the current ones")
+    parser.add_argument("--threshold", type=float, default=1.2,                      help="Ratio of durations above which a benchmark is reported as a regression when comparing")
+    parser.add_argument("--filter",    type=str,   default=None,                     help="Regular expression to select benchmarks to run by name")
+    parser.add_argument("--repeat",    type=int,   default=5,                        help="Number of fresh games on which each benchmark is measured")
+    parser.add_argument("--min_time",  type=float, default=0.2,                      help="Minimum duration of a measure, used to choose the number of calls per measure")
+    parser.add_argument("--label",     type=str,   default=None,                     help="Name to identify the results, for instance the engine version")
+    args = parser.parse_args(script_arguments)
+
+    # List of benchmarks, named after the engine step they measure, with the maze sizes to use
+    benchmarks = {"create_maze_random": (benchmark_create_maze_random, MAZE_SIZES),
+                  "distribute_cheese": (benchmark_distribute_cheese, MAZE_SIZES),
+                  "update_game_state": (benchmark_update_game_state, MAZE_SIZES),
+                  "batched_step": (benchmark_batched_step, MAZE_SIZES),
+                  "render_ascii": (benchmark_render_ascii, MAZE_SIZES),
+                  "start_in_process": (benchmark_start_in_process, GAME_MAZE_SIZES),
+                  "start_multiprocess": (benchmark_start_multiprocess, GAME_MAZE_SIZES),
+                  "ipc_round_trip": (benchmark_ipc_round_trip, MAZE_SIZES)}
+
+    # Run the selected benchmarks on all maze sizes
+    results = {"metadata": {"label": args.label if args.label is not None else datetime.datetime.now().isoformat(timespec="seconds"),
+                            "python": platform.python_version(),
+                            "numpy": numpy.__version__,
+                            "platform": platform.platform(),
+                            "cpu_count": os.cpu_count()},
+               "benchmarks": {}}
+    for benchmark_name in benchmarks:
+        benchmark, maze_sizes = benchmarks[benchmark_name]
+        for maze_size in maze_sizes:
+            name = "%s[%dx%d]" % (benchmark_name, maze_size[0], maze_size[1])
+            if args.filter is None or re.search(args.filter, name):
+                results["benchmarks"][name] = measure(benchmark, maze_size, args.repeat, args.min_time)
+                print("%-40s %12.6f s" % (name, results["benchmarks"][name]["min"]))
+
+    # Save results
+    with open(args.output, "w") as output_file:
+        json.dump(results, output_file, indent=4)
+
+    # Compare with previous results if asked
+    if args.compare is not None:
+        with open(args.compare, "r") as previous_file:
+            previous_results = json.load(previous_file)
+        regressions = compare(previous_results, results, args.threshold)
+        sys.exit(1 if len(regressions) > 0 else 0)
+
+#####################################################################################################################################################
+#####################################################################################################################################################
@@ -23,9 +23,19 @@ import scipy.sparse as sparse
 import scipy.sparse.csgraph as csgraph
 import threading
 import multiprocessing
+import multiprocessing.managers
+import multiprocessing.shared_memory
+import multiprocessing.resource_tracker
 import queue
 import time
 import traceback
+import copy
+import collections
+import functools
+import inspect
+import types
+import asyncio
+import concurrent.futures
 import argparse
 import ast
 import sys
@@ -57,7 +67,9 @@ parser.add_argument("--cell_percentage",     type=float,
 parser.add_argument("--wall_percentage",     type=float,                                                 default=60.0,         help="Percentage of walls in the maze, 0%% being an empty maze, and 100%% being the maximum number of walls that keep the maze connected")
 parser.add_argument("--mud_percentage",      type=float,                                                 default=20.0,         help="Percentage of pairs of adjacent cells that are separated by mud in the maze")
 parser.add_argument("--mud_range",           type=list_type,                                             default=[4, 9],       help="Interval of turns needed to cross mud")
-parser.add_argument("--maze_representation", type=str, choices=["dictionary", "matrix"],                 default="dictionary", help="Representation of the maze in memory as given to players")
+parser.add_argument("--maze_generator",      type=str, choices=["v1", "v2"],                             default="v1",         help="Algorithm used to create random mazes, v1 being the historical one, and v2 being faster on large mazes but creating different mazes for a given seed")
+parser.add_argument("--maze_representation", type=str, choices=["dictionary", "matrix", "csr"],          default="dictionary", help="Representation of the maze in memory as given to players")
+parser.add_argument("--distance_oracle",     action="store_true",                                        default=False,        help="If set, shortest paths between all cells are computed once and given to players accepting a distance_oracle argument")
 parser.add_argument("--fixed_maze",          type=str,                                                   default=None,         help="Fixed maze in any PyRat accepted representation (takes priority over any maze description and will automatically set maze_height and maze_width)")
 parser.add_argument("--nb_cheese",           type=int,                                                   default=21,           help="Number of pieces of cheese in the maze")
 parser.add_argument("--fixed_cheese",        type=str,                                                   default=None,         help="Fixed list of cheese (takes priority over random number of cheese)")
@@ -67,6 +79,7 @@ parser.add_argument("--preprocessing_time",  type=float,
 parser.add_argument("--turn_time",           type=float,                                                 default=0.1,          help="Time after which players will miss a turn")
 parser.add_argument("--synchronous",         action="store_true",                                        default=False,        help="If set, waits for all players to return an action before moving, even if turn_time is exceeded",)
 parser.add_argument("--continue_on_error",   action="store_true",                                        default=False,        help="If a player crashes, continues the game anyway")
+parser.add_argument("--in_process",          action="store_true",                                        default=False,        help="If set, players are called directly in the main process instead of in a process per player (requires synchronous, useful for batch games)")
 parser.add_argument("--render_mode",         type=str, choices=["ascii", "ansi", "gui", "no_rendering"], default="gui",        help="Method to display the game, or no_rendering to play without rendering")
 parser.add_argument("--render_simplified",   action="store_true",                                        default=False,        help="If the maze is rendered, hides some elements that are not essential")
 parser.add_argument("--gui_speed",           type=float,                                                 default=1.0,          help="When rendering as GUI, controls the speed of the game")
@@ -76,6 +89,394 @@ parser.add_argument("--trace_length",        type=int,
 # Parse the arguments into a global variable
 args = parser.parse_args()
 
+#####################################################################################################################################################
+############################################################### MAZE REPRESENTATIONS ################################################################
+#####################################################################################################################################################
+
+class MazeCSR (NamedTuple):
+
+    """
+        Compact representation of the maze given to players when the "maze_representation" option is set to "csr".
+        It is an adjacency list in compressed sparse row format, with read-only arrays:
+            * The neighbors of vertex v are indices[indptr[v]:indptr[v + 1]].
+            * The weights of the corresponding edges are weights[indptr[v]:indptr[v + 1]].
+            * Cells that are not in the maze have no neighbors.
+        Arrays rows and cols give the row and column in the maze of each vertex.
+    """
+
+    # Attributes
+    indptr:  numpy.ndarray
+    indices: numpy.ndarray
+    weights: numpy.ndarray
+    rows:    numpy.ndarray
+    cols:    numpy.ndarray
+    width:   int
+    height:  int
+
+    #############################################################################################################################################
+    #                                                               STATIC METHODS                                                              #
+    #############################################################################################################################################
+
+    @staticmethod
+    def from_dictionary ( maze:        Dict[int, Dict[int, int]],
+                          maze_width:  int,
+                          maze_height: int
+                        ) ->           "MazeCSR":
+
+        """
+            Creates the compact representation of a maze given as a dictionary.
+            In:
+                * maze:        Maze as a dictionary, as used internally by PyRat.
+                * maze_width:  Width of the maze in number of cells.
+                * maze_height: Height of the maze in number of cells.
+            Out:
+                * maze_csr: Same maze in compressed sparse row format.
+        """
+
+        # Neighbors are sorted for each vertex
+        nb_vertices = maze_width * maze_height
+        degrees = numpy.zeros(nb_vertices + 1, dtype=numpy.int32)
+        indices = []
+        weights = []
+        for vertex in sorted(maze):
+            degrees[vertex + 1] = len(maze[vertex])
+            for neighbor in sorted(maze[vertex]):
+                indices.append(neighbor)
+                weights.append(maze[vertex][neighbor])
+        
+        # Build arrays and make them read-only
+        vertices = numpy.arange(nb_vertices, dtype=numpy.int32)
+        maze_csr = MazeCSR(numpy.cumsum(degrees, dtype=numpy.int32), numpy.array(indices, dtype=numpy.int32), numpy.array(weights, dtype=numpy.int32), vertices // maze_width, vertices % maze_width, maze_width, maze_height)
+        for array in maze_csr[:5]:
+            array.flags.writeable = False
+        return maze_csr
+
+#####################################################################################################################################################
+
+class DistanceOracle (NamedTuple):
+
+    """
+        Shortest paths between all pairs of cells of the maze, given to players when the "distance_oracle" option is set.
+        It is made of two read-only square arrays, indexed by cells:
+            * distances[u, v] is the number of turns needed to go from u to v.
+            * next_hops[u, v] is the cell to move to from u to go to v along a shortest path (u itself if u is v).
+        Both arrays contain UNREACHABLE for pairs of cells with no path between them, for instance cells that are not in the maze.
+        Note that the memory used grows with the square of the number of cells (4 bytes per pair).
+    """
+
+    # Attributes
+    distances: numpy.ndarray
+    next_hops: numpy.ndarray
+
+    # Value used for pairs of cells with no path between them
+    UNREACHABLE = numpy.iinfo(numpy.uint16).max
+
+    #############################################################################################################################################
+    #                                                               STATIC METHODS                                                              #
+    #############################################################################################################################################
+
+    @staticmethod
+    def from_dictionary ( maze:        Dict[int, Dict[int, int]],
+                          maze_width:  int,
+                          maze_height: int
+                        ) ->           "DistanceOracle":
+
+        """
+            Computes shortest paths between all pairs of cells of a maze given as a dictionary.
+            Sources are processed by blocks, to limit the memory needed during the computation.
+            In:
+                * maze:        Maze as a dictionary, as used internally by PyRat.
+                * maze_width:  Width of the maze in number of cells.
+                * maze_height: Height of the maze in number of cells.
+            Out:
+                * distance_oracle: Distances and next hops between all pairs of cells.
+        """
+
+        # Check the results fit in the arrays
+        nb_vertices = maze_width * maze_height
+        if nb_vertices >= DistanceOracle.UNREACHABLE:
+            raise Exception("Maze too large for a distance oracle")
+
+        # Distances are computed from blocks of sources
+        maze_csr = MazeCSR.from_dictionary(maze, maze_width, maze_height)
+        graph = sparse.csr_matrix((maze_csr.weights, maze_csr.indices, maze_csr.indptr), shape=(nb_vertices, nb_vertices))
+        distances = numpy.empty((nb_vertices, nb_vertices), dtype=numpy.uint16)
+        predecessors = numpy.empty((nb_vertices, nb_vertices), dtype=numpy.uint16)
+        block_size = 256
+        for block_start in range(0, nb_vertices, block_size):
+            sources = numpy.arange(block_start, min(block_start + block_size, nb_vertices))
+            block_distances, block_predecessors = csgraph.dijkstra(graph, indices=sources, return_predecessors=True)
+            unreachable = numpy.isinf(block_distances)
+            if numpy.max(block_distances, where=~unreachable, initial=0) >= DistanceOracle.UNREACHABLE:
+                raise Exception("Maze too large for a distance oracle")
+            block_distances[unreachable] = DistanceOracle.UNREACHABLE
+            block_predecessors[block_predecessors < 0] = DistanceOracle.UNREACHABLE
+            distances[sources] = block_distances
+            predecessors[sources] = block_predecessors
+
+        # The maze is symmetric, so the next hop from u to v is the predecessor of u on a shortest path from v
+        next_hops = numpy.ascontiguousarray(predecessors.T)
+        del predecessors
+
+        # A cell reaches itself without moving, unless it is not in the maze
+        in_maze = numpy.isin(numpy.arange(nb_vertices), list(maze))
+        maze_cells = numpy.flatnonzero(in_maze)
+        other_cells = numpy.flatnonzero(~in_maze)
+        next_hops[maze_cells, maze_cells] = maze_cells
+        distances[other_cells, other_cells] = DistanceOracle.UNREACHABLE
+
+        # Make arrays read-only
+        distance_oracle = DistanceOracle(distances, next_hops)
+        for array in distance_oracle:
+            array.flags.writeable = False
+        return distance_oracle
+
+    #############################################################################################################################################
+    #                                                               PUBLIC METHODS                                                              #
+    #############################################################################################################################################
+
+    def distance ( self:   Self,
+                   source: int,
+                   target: int
+                 ) ->      int:
+
+        """
+            Returns the number of turns needed to go from a cell to another.
+            In:
+                * self:   Reference to the current object.
+                * source: Cell from which to start.
+                * target: Cell to reach.
+            Out:
+                * distance: Length of a shortest path, or UNREACHABLE if there is none.
+        """
+
+        # Read the table
+        distance = int(self.distances[source, target])
+        return distance
+
+    #############################################################################################################################################
+
+    def route ( self:   Self,
+                source: int,
+                target: int
+              ) ->      List[int]:
+
+        """
+            Returns a shortest path from a cell to another.
+            In:
+                * self:   Reference to the current object.
+                * source: Cell from which to start.
+                * target: Cell to reach.
+            Out:
+                * route: Sequence of cells from source to target, both included.
+        """
+
+        # Follow the next hops
+        if self.distances[source, target] == DistanceOracle.UNREACHABLE:
+            raise Exception("No route from %d to %d" % (source, target))
+        route = [source]
+        while route[-1] != target:
+            route.append(int(self.next_hops[route[-1], target]))
+        return route
+
+#####################################################################################################################################################
+#################################################################### TIME LIMITS ####################################################################
+#####################################################################################################################################################
+
+class Deadline (NamedTuple):
+
+    """
+        End of the time given to a player to preprocess or to decide an action, given to preprocessing and turn functions that ask for it.
+        Functions that compute better answers when given more time can check how much time is left to stop just before the end.
+        The end is measured with time.monotonic, as done by the game to decide if a player missed a turn.
+        Note that in synchronous mode, the game waits for all players, and the deadline is only an indication.
+    """
+
+    # Attributes
+    end: float
+
+    #############################################################################################################################################
+    #                                                               PUBLIC METHODS                                                              #
+    #############################################################################################################################################
+
+    def remaining ( self: Self
+                  ) ->    float:
+
+        """
+            Returns the time left before the deadline.
+            In:
+                * self: Reference to the current object.
+            Out:
+                * remaining_time: Number of seconds left, or 0 if the deadline has passed.
+        """
+
+        # Compare to the current time
+        remaining_time = max(0.0, self.end - time.monotonic())
+        return remaining_time
+
+#####################################################################################################################################################
+
+class ThinkingTime ():
+
+    """
+        Given to the background function of a player, to know when it can work.
+        The background function runs in a thread, started once preprocessing is over, and sharing the memory of the player.
+        It should work by short steps, calling wait between them, and return when wait returns False.
+        Before a player function is called, the background functions of the players in the same process are paused:
+            * The game asks them to pause, and waits until they are blocked in wait (or have returned), but not beyond the end of the turn.
+            * A step that is still running at the end of the turn thus competes with the player function, and its processor time is counted in the duration of the turn.
+        Before postprocessing, the background function is stopped, and given the rest of the turn (at least MINIMUM_STOP_TIME) to return.
+        Afterwards, it is abandoned and an error is reported.
+        Results should be stored in memory as new objects (e.g., memory.route = new_route) rather than modified in place, so that the turn function always reads complete results.
+        Note that threads share the interpreter, so background computations mostly benefit from other cores when they release it (NumPy, SciPy...).
+    """
+
+    # Time given to a background function to return once stopped, even if the turn is over
+    MINIMUM_STOP_TIME = 0.1
+
+    #############################################################################################################################################
+    #                                                                CONSTRUCTOR                                                                #
+    #############################################################################################################################################
+
+    def __init__ ( self: Self
+                 ) ->    Self:
+
+        """
+            This function is the constructor of the class.
+            In:
+                * self: Reference to the current object.
+            Out:
+                * self: Reference to the current object.
+        """
+
+        # Inherit from parent class
+        super(ThinkingTime, self).__init__()
+
+        # The background function can work unless paused or stopped
+        # The game also needs to know when it is blocked in wait, or when it has returned
+        self._condition = threading.Condition()
+        self._paused = False
+        self._stopped = False
+        self._parked = False
+        self._finished = False
+
+    #############################################################################################################################################
+    #                                                               PUBLIC METHODS                                                              #
+    #############################################################################################################################################
+
+    def wait ( self: Self
+             ) ->    bool:
+
+        """
+            Blocks while a player function runs.
+            In:
+                * self: Reference to the current object.
+            Out:
+                * can_continue: False if the background function should return, True otherwise.
+        """
+
+        # Tell the game we are blocked, and wait until resumed or stopped
+        with self._condition:
+            self._parked = True
+            self._condition.notify_all()
+            self._condition.wait_for(lambda: not self._paused or self._stopped)
+            self._parked = False
+            can_continue = not self._stopped
+            return can_continue
+
+    #############################################################################################################################################
+    #                                                              PRIVATE METHODS                                                              #
+    #############################################################################################################################################
+
+    def _pause ( self: Self
+               ) ->    None:
+
+        """
+            Asks the background function to wait, before a player function is called.
+            In:
+                * self: Reference to the current object.
+            Out:
+                * None.
+        """
+
+        # Set the flag
+        with self._condition:
+            self._paused = True
+
+    #############################################################################################################################################
+
+    def _wait_until_parked ( self:    Self,
+                             timeout: float
+                           ) ->       bool:
+
+        """
+            Waits until the background function is blocked in wait, or has returned, after being asked to pause.
+            In:
+                * self:    Reference to the current object.
+                * timeout: Maximum time to wait.
+            Out:
+                * parked: Whether the background function is not running anymore.
+        """
+
+        # Wait for the background function to reach wait
+        with self._condition:
+            parked = self._condition.wait_for(lambda: self._parked or self._finished, timeout)
+            return parked
+
+    #############################################################################################################################################
+
+    def _resume ( self: Self
+                ) ->    None:
+
+        """
+            Lets the background function continue, after a player function is called.
+            In:
+                * self: Reference to the current object.
+            Out:
+                * None.
+        """
+
+        # Unset the flag and wake the background function up
+        with self._condition:
+            self._paused = False
+            self._condition.notify_all()
+
+    #############################################################################################################################################
+
+    def _stop ( self: Self
+              ) ->    None:
+
+        """
+            Asks the background function to return.
+            In:
+                * self: Reference to the current object.
+            Out:
+                * None.
+        """
+
+        # Set the flag and wake the background function up
+        with self._condition:
+            self._stopped = True
+            self._condition.notify_all()
+
+    #############################################################################################################################################
+
+    def _finish ( self: Self
+                ) ->    None:
+
+        """
+            Indicates that the background function has returned.
+            In:
+                * self: Reference to the current object.
+            Out:
+                * None.
+        """
+
+        # Set the flag and wake the game up if it is waiting
+        with self._condition:
+            self._finished = True
+            self._condition.notify_all()
+
 #####################################################################################################################################################
 ################################################################## GAME DEFINITION ##################################################################
 #####################################################################################################################################################
@@ -103,7 +504,9 @@ class PyRat ():
                    wall_percentage:     float = args.wall_percentage,
                    mud_percentage:      float = args.mud_percentage,
                    mud_range:           List[int] = args.mud_range,
+                   maze_generator:      str = args.maze_generator,
                    maze_representation: str = args.maze_representation,
+                   distance_oracle:     bool = args.distance_oracle,
                    fixed_maze:          Union[None, str, numpy.ndarray, Dict[int, Dict[int, int]]] = args.fixed_maze,
                    nb_cheese:           int = args.nb_cheese,
                    fixed_cheese:        Union[None, str, List[int]] = args.fixed_cheese,
@@ -117,7 +520,9 @@ class PyRat ():
                    preprocessing_time:  float = args.preprocessing_time,
                    turn_time:           float = args.turn_time,
                    synchronous:         bool = args.synchronous,
-                   continue_on_error:   bool = args.continue_on_error
+                   continue_on_error:   bool = args.continue_on_error,
+                   in_process:          bool = args.in_process,
+                   player_pool:         Union[None, "PlayerPool"] = None
                  ) ->                   Self:
 
         """
@@ -135,7 +540,9 @@ class PyRat ():
                 * wall_percentage:     Percentage of walls in the maze, 0%% being an empty maze, and 100%% being the maximum number of walls that keep the maze connected.
                 * mud_percentage:      Percentage of pairs of adjacent cells that are separated by mud in the maze.
                 * mud_range:           Interval of turns needed to cross mud.
+                * maze_generator:      Algorithm used to create random mazes, v1 being the historical one, and v2 being faster on large mazes but creating different mazes for a given seed.
                 * maze_representation: Representation of the maze in memory as given to players.
+                * distance_oracle:     If set, shortest paths between all cells are computed once and given to players accepting a distance_oracle argument.
                 * fixed_maze:          Fixed maze in any PyRat accepted representation (takes priority over any maze description and will automatically set maze_height and maze_width).
                 * nb_cheese:           Number of pieces of cheese in the maze.
                 * fixed_cheese:        Fixed list of cheese (takes priority over random number of cheese).
@@ -150,6 +557,8 @@ class PyRat ():
                 * turn_time:           Time after which players will miss a turn.
                 * synchronous:         If set, waits for all players to return an action before moving, even if turn_time is exceeded.
                 * continue_on_error:   If a player crashes, continues the game anyway.
+                * in_process:          If set, players are called directly in the main process instead of in a process per player (requires synchronous, useful for batch games).
+                * player_pool:         Pool of processes to use for the players instead of creating new ones (ignored when playing in-process).
                 
             Out:
                 * self: Reference to the current object.
@@ -169,6 +578,7 @@ class PyRat ():
         assert 0.0 <= preprocessing_time
         assert 0.0 <= turn_time
         assert 0 < len(players)
+        assert synchronous or not in_process
         
         # Store arguments (some might be overwritten later)
         self.maze_width = maze_width
@@ -177,7 +587,9 @@ class PyRat ():
         self.wall_percentage = wall_percentage
         self.mud_percentage = mud_percentage
         self.mud_range = mud_range
+        self.maze_generator = maze_generator
         self.maze_representation = maze_representation
+        self.distance_oracle = distance_oracle
         self.fixed_maze = fixed_maze
         self.nb_cheese = nb_cheese
         self.fixed_cheese = fixed_cheese
@@ -192,6 +604,8 @@ class PyRat ():
         self.turn_time = turn_time
         self.synchronous = synchronous
         self.continue_on_error = continue_on_error
+        self.in_process = in_process
+        self.player_pool = player_pool
         
         # Set random seeds
         self.random_seed_maze = random_seed if random_seed is not None else random_seed_maze if random_seed_maze is not None else nprandom.randint(numpy.iinfo(numpy.int32).max)
@@ -213,10 +627,16 @@ class PyRat ():
 
         # Initialize game elements
         self.maze, self.maze_public, self.maze_width, self.maze_height = self._create_maze()
+        self.maze_oracle = DistanceOracle.from_dictionary(self.maze, self.maze_width, self.maze_height) if self.distance_oracle else None
         for player in players:
             self._register_player(**player)
         self.cheese = self._distribute_cheese()
 
+        # Index elements to update them quickly at each turn
+        self.cheese_set = set(self.cheese)
+        self.player_teams = {player: team for team in self.teams for player in self.teams[team]}
+        self.team_scores = {team: round(sum([self.player_scores[player] for player in self.teams[team]]), 5) for team in self.teams}
+
     #############################################################################################################################################
     #                                                               STATIC METHODS                                                              #
     #############################################################################################################################################
@@ -252,6 +672,13 @@ class PyRat ():
                 * stats: Game statistics computed during the game.
         """
         
+        # Barriers and waiter queues of the game, to release the processes still waiting on them at the end
+        barriers = []
+        waiter_queues = []
+        temporary_pool = None
+        shared_memory = None
+        player_backgrounds = {}
+
         # We catch exceptions that may happen during the game
         try:
             
@@ -265,74 +692,141 @@ class PyRat ():
             for player in self.player_locations:
                 stats["players"][player] = {"actions": {"mud": 0, "error": 0, "miss": 0, "nothing": 0, "north": 0, "east": 0, "south": 0, "west": 0, "wall": 0}, "score": 0, "turn_durations": [], "preprocessing_duration": None}
             
-            # Create a process per player
-            turn_start_synchronizer = multiprocessing.Manager().Barrier(len(self.player_locations) + 1)
-            turn_timeout_lock = multiprocessing.Manager().Lock()
-            player_processs = {}
-            player_fixed_data = {}
-            for player in self.player_locations:
-                player_fixed_data[player] = [self.maze_public.copy(), self.maze_width, self.maze_height, self.teams.copy(), possible_actions.copy()]
-                player_processs[player] = {"process": None, "input_queue": multiprocessing.Manager().Queue(), "output_queue": multiprocessing.Manager().Queue(), "turn_end_synchronizer": multiprocessing.Manager().Barrier(2)}
-                player_processs[player]["process"] = multiprocessing.Process(target=_player_process_function, args=(player, player_processs[player]["input_queue"], player_processs[player]["output_queue"], turn_start_synchronizer, turn_timeout_lock, player_processs[player]["turn_end_synchronizer"], self.player_functions[player]["preprocessing"], self.player_functions[player]["turn"], self.player_functions[player]["postprocessing"],))
-                player_processs[player]["process"].start()
-
-            # If playing asynchrounously, we create processs to wait instead of missing players
-            if not self.synchronous:
-                waiter_processs = {}
-                for player in player_processs:
-                    waiter_processs[player] = {"process": None, "input_queue": multiprocessing.Manager().Queue()}
-                    waiter_processs[player]["process"] = multiprocessing.Process(target=_waiter_process_function, args=(waiter_processs[player]["input_queue"], turn_start_synchronizer,))
-                    waiter_processs[player]["process"].start()
+            # When playing in-process, each player gets its own copy of the game elements, memory and random state
+            # Memory is a namespace rather than a threading.local, to be shared with the background function
+            # The compact maze and the distance oracle are read-only, so they are shared
+            # Copying the random state mimics what happens when the player processes are forked
+            if self.in_process:
+                player_fixed_data = {}
+                player_memories = {}
+                player_random_states = {}
+                for player in self.player_locations:
+                    player_fixed_data[player] = [self.maze_public if isinstance(self.maze_public, MazeCSR) else copy.deepcopy(self.maze_public)] + copy.deepcopy([self.maze_width, self.maze_height, self.teams, possible_actions]) + [self.maze_oracle]
+                    player_memories[player] = types.SimpleNamespace()
+                    player_random_states[player] = nprandom.get_state()
+
+            # Otherwise, each player is handled by a process from the given pool, or from a pool created for this game only
+            # All synchronization primitives and queues are served by the same manager
+            # Processes start the game with the random state they would have had if forked now
+            # Read-only arrays of the maze and distance oracle are put in shared memory, so that players do not get a copy each
+            else:
+                player_pool = self.player_pool
+                if player_pool is None:
+                    temporary_pool = PlayerPool([{"name": player, "preprocessing_function": self.player_functions[player]["preprocessing"], "turn_function": self.player_functions[player]["turn"], "postprocessing_function": self.player_functions[player]["postprocessing"], "background_function": self.player_functions[player]["background"]} for player in self.player_locations])
+                    player_pool = temporary_pool
+                sync_manager = _get_sync_manager()
+                turn_start_synchronizer = sync_manager.Barrier(len(self.player_locations) + 1)
+                turn_timeout_lock = sync_manager.Lock()
+                barriers.append(turn_start_synchronizer)
+                turn_answer_notifier = sync_manager.Queue() if not self.synchronous else None
+                player_processs = {}
+                player_fixed_data = {}
+                player_sent_states = {}
+                random_state = nprandom.get_state()
+                shared_memory, (shared_maze, shared_oracle) = _share_arrays([self.maze_public, self.maze_oracle])
+                shared_memory_name = shared_memory.name if shared_memory is not None else None
+                for player in self.player_locations:
+                    player_fixed_data[player] = [copy.copy(shared_maze), self.maze_width, self.maze_height, self.teams.copy(), possible_actions.copy(), shared_oracle]
+                    player_sent_states[player] = _copy_game_state(self.player_locations, self.player_scores, self.player_muds, self.cheese)
+                    player_processs[player] = {"input_queue": sync_manager.Queue(), "output_queue": sync_manager.Queue(), "turn_end_synchronizer": sync_manager.Barrier(2)}
+                    player_pool._start_player_game(player, (random_state, player, player_fixed_data[player], shared_memory_name, player_sent_states[player], player_processs[player]["input_queue"], player_processs[player]["output_queue"], turn_start_synchronizer, turn_timeout_lock, player_processs[player]["turn_end_synchronizer"], turn_answer_notifier))
+                    barriers.append(player_processs[player]["turn_end_synchronizer"])
+
+                # If playing asynchrounously, we also need processs to wait instead of missing players
+                if not self.synchronous:
+                    waiter_processs = {}
+                    for player in player_processs:
+                        waiter_processs[player] = {"input_queue": sync_manager.Queue()}
+                        player_pool._start_waiter_game(player, (None, waiter_processs[player]["input_queue"], turn_start_synchronizer))
+                        waiter_queues.append(waiter_processs[player]["input_queue"])
 
             # Initial rendering of the maze
             self._render(turn, done)
             
             # We play until the game is over
-            players_ready = list(player_processs.keys())
-            players_running = {player: True for player in player_processs}
+            players_ready = list(self.player_locations.keys())
+            players_running = {player: True for player in self.player_locations}
             while any(players_running.values()):
 
-                # We communicate the state of the game to the players not in mud
-                for player in players_ready:
-                    final_stats = stats.copy() if done else None
-                    player_processs[player]["input_queue"].put((*player_fixed_data[player], self.player_locations.copy(), self.player_scores.copy(), self.player_muds.copy(), self.cheese.copy(), turn, final_stats))
-                turn_start_synchronizer.wait()
-                
-                # Check that a turn lasts al least the time it should for each player
-                # Useful to guarantee processs have at least the required time
-                sleep_time = self.preprocessing_time if turn == 0 else self.turn_time
-                time.sleep(sleep_time)
-                
-                # In synchronous mode, we wait for everyone
-                actions_as_text = {player: "postprocessing" for player in player_processs}
-                durations = {player: None for player in player_processs}
-                if self.synchronous:
-                    for player in player_processs:
-                        player_processs[player]["turn_end_synchronizer"].wait()
-                        actions_as_text[player], durations[player] = player_processs[player]["output_queue"].get()
-
-                # Otherwise, we block the possibility to return an action and check who answered in time
+                # Actions and durations reported by the players during this turn
+                actions_as_text = {player: "postprocessing" for player in self.player_locations}
+                durations = {player: None for player in self.player_locations}
+                turn_duration = self.preprocessing_time if turn == 0 else self.turn_time
+
+                # In-process, we directly ask the players for an action, one after the other
+                if self.in_process:
+                    for player in players_ready:
+                        final_stats = stats.copy() if done else None
+                        player_muds = {other_player: self.player_muds[other_player].copy() for other_player in self.player_muds}
+                        game_random_state = nprandom.get_state()
+                        nprandom.set_state(player_random_states[player])
+                        # Background functions of all players run in this process, so they are all paused while a player decides
+                        deadline = Deadline(time.monotonic() + turn_duration)
+                        if final_stats is not None:
+                            _stop_background_function(player_backgrounds, player, deadline.remaining())
+                        _pause_background_functions(player_backgrounds, deadline.remaining())
+                        actions_as_text[player], durations[player] = _call_player_function(player, *player_fixed_data[player], self.player_locations.copy(), self.player_scores.copy(), player_muds, self.cheese.copy(), turn, deadline, final_stats, player_memories[player], self.player_functions[player]["preprocessing"], self.player_functions[player]["turn"], self.player_functions[player]["postprocessing"])
+                        _resume_background_functions(player_backgrounds)
+                        _start_background_function(player_backgrounds, player, final_stats, *player_fixed_data[player], player_memories[player], self.player_functions[player]["background"])
+                        player_random_states[player] = nprandom.get_state()
+                        nprandom.set_state(game_random_state)
+
+                # Otherwise, we communicate the state of the game to the players not in mud
                 else:
+                    for player in players_ready:
+                        final_stats = stats.copy() if done else None
+                        game_state_delta = _make_game_state_delta(player_sent_states[player], self.player_locations, self.player_scores, self.player_muds, self.cheese)
+                        player_processs[player]["input_queue"].put((game_state_delta, turn, turn_duration, final_stats))
+                    turn_start_synchronizer.wait()
+                
+                    # In synchronous mode, check that a turn lasts al least the time it should for each player
+                    # Useful to guarantee processs have at least the required time
+                    if self.synchronous:
+                        time.sleep(turn_duration)
 
-                    # Wait at least for those in mud
-                    for player in player_processs:
-                        if self._is_in_mud(player) and players_running[player]:
+                    # Otherwise, the turn can end as soon as all running players not in mud have answered
+                    # Players notify when they answer, and we then check again who we are still waiting for, until the deadline
+                    else:
+                        deadline = Deadline(time.monotonic() + turn_duration)
+                        players_waited = [player for player in player_processs if players_running[player] and not self._is_in_mud(player)]
+                        while True:
+                            players_waited = [player for player in players_waited if player_processs[player]["output_queue"].empty()]
+                            remaining_time = deadline.remaining()
+                            if len(players_waited) == 0 or remaining_time <= 0:
+                                break
+                            try:
+                                turn_answer_notifier.get(timeout=remaining_time)
+                            except queue.Empty:
+                                break
+                
+                    # In synchronous mode, we wait for everyone
+                    if self.synchronous:
+                        for player in player_processs:
                             player_processs[player]["turn_end_synchronizer"].wait()
                             actions_as_text[player], durations[player] = player_processs[player]["output_queue"].get()
 
-                    # For others, set timeout and wait for output info of those who passed just before timeout
-                    with turn_timeout_lock:
+                    # Otherwise, we block the possibility to return an action and check who answered in time
+                    else:
+
+                        # Wait at least for those in mud
                         for player in player_processs:
-                            if not self._is_in_mud(player) and players_running[player]:
-                                if not player_processs[player]["output_queue"].empty():
-                                    player_processs[player]["turn_end_synchronizer"].wait()
-                                    actions_as_text[player], durations[player] = player_processs[player]["output_queue"].get()
-                                else:
-                                    actions_as_text[player] = "miss"
+                            if self._is_in_mud(player) and players_running[player]:
+                                player_processs[player]["turn_end_synchronizer"].wait()
+                                actions_as_text[player], durations[player] = player_processs[player]["output_queue"].get()
+
+                        # For others, set timeout and wait for output info of those who passed just before timeout
+                        with turn_timeout_lock:
+                            for player in player_processs:
+                                if not self._is_in_mud(player) and players_running[player]:
+                                    if not player_processs[player]["output_queue"].empty():
+                                        player_processs[player]["turn_end_synchronizer"].wait()
+                                        actions_as_text[player], durations[player] = player_processs[player]["output_queue"].get()
+                                    else:
+                                        actions_as_text[player] = "miss"
                         
                 # Check which players are ready to continue
                 players_ready = []
-                for player in player_processs:
+                for player in self.player_locations:
                     if actions_as_text[player].startswith("postprocessing"):
                         players_running[player] = False
                     if not self.synchronous and (actions_as_text[player].startswith("postprocessing") or actions_as_text[player] == "miss"):
@@ -340,102 +834,271 @@ class PyRat ():
                     else:
                         players_ready.append(player)
 
-                # Check for errors
-                if any([actions_as_text[player].endswith("error") for player in player_processs]) and not self.continue_on_error:
-                    raise Exception("A player has crashed, exiting")
-
-                # We save the turn info if we are not postprocessing
-                if not done:
-                
-                    # Apply the actions
-                    locations_before = self.player_locations.copy()
-                    corrected_actions = {player: actions_as_text[player] if actions_as_text[player] in possible_actions else "nothing" for player in player_processs}
-                    done = self._update_game_state(corrected_actions)
-                    
-                    # Save stats
-                    for player in player_processs:
-                        if not actions_as_text[player].startswith("preprocessing"):
-                            if actions_as_text[player] in ["north", "west", "south", "east"] and locations_before[player] == self.player_locations[player] and not self._is_in_mud(player):
-                                stats["players"][player]["actions"]["wall"] += 1
-                                stats["players"][player]["actions"][actions_as_text[player]] -= 1
-                            else:
-                                stats["players"][player]["actions"][actions_as_text[player]] += 1
-                            if actions_as_text[player] != "mud":
-                                self.actions_history[player].append(corrected_actions[player])
-                        if durations[player] is not None:
-                            if actions_as_text[player].startswith("preprocessing"):
-                                stats["players"][player]["preprocessing_duration"] = durations[player]
-                            else:
-                                stats["players"][player]["turn_durations"].append(durations[player])
-                        stats["players"][player]["score"] = self.player_scores[player]
-                    stats["turns"] = turn
-                    
-                    # Go to next turn
-                    turn += 1
-                    self._render(turn, done)
+                # Apply the actions and go to next turn
+                turn, done = self._end_turn(turn, done, actions_as_text, durations, possible_actions, stats)
 
         # In case of an error, we ignore stats
         except:
             print(traceback.format_exc(), file=sys.stderr)
             stats = {}
+
+        # Background functions of players playing in-process are stopped
+        for player in list(player_backgrounds):
+            _stop_background_function(player_backgrounds, player, 0.0)
+
+        # Processes still waiting (waiters, or players after a crash) exit when their barrier is broken
+        for barrier in barriers:
+            try:
+                barrier.abort()
+            except:
+                pass
+        for waiter_queue in waiter_queues:
+            waiter_queue.put(True)
+        
+        # Stop the processes if they were created for this game only
+        if temporary_pool is not None:
+            temporary_pool.close()
+
+        # Players have mapped the shared arrays, so they can be released
+        if shared_memory is not None:
+            shared_memory.close()
+            shared_memory.unlink()
         
         # Clean before returning
         self._close()
         return stats
 
     #############################################################################################################################################
-    #                                                              PRIVATE METHODS                                                              #
-    #                                                             (GAME MANAGEMENT)                                                             #
-    #############################################################################################################################################
 
-    def _close ( self: Self
-               ) ->    None:
-        
+    async def start_async ( self:     Self,
+                            executor: Union[None, concurrent.futures.ThreadPoolExecutor] = None
+                          ) ->        Dict[str, Any]:
+
         """
-            Actions to do at the end of the game if needed.
+            Starts a game in the running asyncio event loop, asking players for decisions until the game is over.
+            Players are called in the current process, so that many games can be played concurrently in a single event loop.
+            Players whose turn function is defined with "async def" are awaited in the event loop, and should not block it.
+            Their preprocessing and postprocessing functions, if any, must also be defined with "async def".
+            Other players are called in a thread of the executor, so that they do not block the event loop.
+            Only thread executors are supported, since player functions need to share the memory of the player across calls.
+            Unless the game is synchronous, players not answering before the end of the turn miss it:
+                * Coroutines are cancelled.
+                * Calls in the executor cannot be interrupted, so the player misses the next turns until the call returns, and its late action is ignored.
+            Contrary to start, players share the random state of the process, and durations include the time taken by the other games of the event loop.
+            The in_process and player_pool options are ignored, and background functions are not supported.
             In:
-                * self: Reference to the current object.
+                * self:     Reference to the current object.
+                * executor: Thread executor used to call players that are not coroutines, or None to use the default executor of the event loop.
             Out:
-                * None.
+                * stats: Game statistics computed during the game.
         """
-        
-        # We save the game if asked
-        if self.save_game:
-            
-            # Generic config stuff we want to save
-            config = {"synchronous": True, "continue_on_error": False}
-            
-            # We save the maze as it was given (fixed or random)
-            if self.fixed_maze is not None:
-                config["fixed_maze"] = self.fixed_maze
-            else:
-                config["maze_width"] = self.maze_width
-                config["maze_height"] = self.maze_height
-                config["random_seed_maze"] = self.random_seed_maze
-                config["cell_percentage"] = self.cell_percentage
-                config["wall_percentage"] = self.wall_percentage
-                config["mud_percentage"] = self.mud_percentage
-                config["mud_range"] = self.mud_range
-            
-            # Same for the cheese
-            if self.fixed_cheese is not None:
-                config["fixed_cheese"] = self.fixed_cheese
-            else:
-                config["nb_cheese"] = self.nb_cheese
-                config["random_seed_cheese"] = self.game_random_seed_cheese
-            
-            # Create the players' file, forcing players to their initial locations
-            output_file_name = os.path.join(self.save_path, datetime.datetime.now().strftime("%Y_%m_%d_%H_%M_%S_%f.py"))
-            with open(os.path.join(os.path.dirname(os.path.realpath(__file__)), "save_template.py"), "r") as save_template_file:
-                save_template = save_template_file.read()
-                save_template = save_template.replace("{ACTIONS}", str(self.actions_history).replace("], '", "],\n                      '"))
-                save_template = save_template.replace("{PLAYERS}", str([{"\"name\": \"%s\", \"team\": \"%s\", \"skin\": \"%s\", \"turn_function\": turn, \"location\": %d" % (player, [team for team in self.teams if player in self.teams[team]][0], self.player_skins[player], self.player_initial_locations[player])} for player in self.player_locations]).replace("'", "").replace("},", "},\n              "))
-                save_template = save_template.replace("{CONFIG}", str(config).replace(", '", ",\n              '"))
-                with open(output_file_name, "w") as output_file:
-                    print(save_template, file=output_file)
 
-        # Wait for GUI to be exited to quit if there is one
-        if self.gui_process is not None:
+        # Check arguments are correct
+        if any([self.player_functions[player]["background"] is not None for player in self.player_functions]):
+            raise Exception("Background functions are not supported when playing in an event loop")
+        if executor is not None and not isinstance(executor, concurrent.futures.ThreadPoolExecutor):
+            raise Exception("Only thread executors are supported when playing in an event loop")
+        for player in self.player_functions:
+            if inspect.iscoroutinefunction(self.player_functions[player]["turn"]) and any([function is not None and not inspect.iscoroutinefunction(function) for function in [self.player_functions[player]["preprocessing"], self.player_functions[player]["postprocessing"]]]):
+                raise Exception("Player %s has an asynchronous turn function, so its preprocessing and postprocessing functions should be asynchronous too" % (player))
+
+        # We catch exceptions that may happen during the game
+        event_loop = asyncio.get_running_loop()
+        executor_calls = {}
+        try:
+
+            # Start the game
+            turn = 0
+            done = False
+            possible_actions = ["nothing", "north", "east", "south", "west"]
+
+            # Initialize stats
+            stats = {"players": {}, "turns": -1}
+            for player in self.player_locations:
+                stats["players"][player] = {"actions": {"mud": 0, "error": 0, "miss": 0, "nothing": 0, "north": 0, "east": 0, "south": 0, "west": 0, "wall": 0}, "score": 0, "turn_durations": [], "preprocessing_duration": None}
+
+            # Each player gets its own copy of the game elements and memory
+            # The compact maze and the distance oracle are read-only, so they are shared
+            player_fixed_data = {}
+            player_memories = {}
+            for player in self.player_locations:
+                player_fixed_data[player] = [self.maze_public if isinstance(self.maze_public, MazeCSR) else copy.deepcopy(self.maze_public)] + copy.deepcopy([self.maze_width, self.maze_height, self.teams, possible_actions]) + [self.maze_oracle]
+                player_memories[player] = types.SimpleNamespace()
+
+            # Initial rendering of the maze
+            self._render(turn, done)
+
+            # We play until the game is over
+            players_ready = list(self.player_locations.keys())
+            while len(players_ready) > 0:
+
+                # Actions and durations reported by the players during this turn
+                actions_as_text = {player: "postprocessing" for player in self.player_locations}
+                durations = {player: None for player in self.player_locations}
+                turn_duration = self.preprocessing_time if turn == 0 else self.turn_time
+                deadline = Deadline(time.monotonic() + turn_duration)
+
+                # Ask all players at once
+                # Players with a call still running in the executor miss the turn, except at the end of the game where we wait for them
+                calls = {}
+                for player in players_ready:
+                    if player in executor_calls:
+                        if not executor_calls[player].done() and not done:
+                            actions_as_text[player] = "miss"
+                            continue
+                        await asyncio.wait([executor_calls.pop(player)])
+                    final_stats = stats.copy() if done else None
+                    player_muds = {other_player: self.player_muds[other_player].copy() for other_player in self.player_muds}
+                    arguments = (player, *player_fixed_data[player], self.player_locations.copy(), self.player_scores.copy(), player_muds, self.cheese.copy(), turn, deadline, final_stats, player_memories[player], self.player_functions[player]["preprocessing"], self.player_functions[player]["turn"], self.player_functions[player]["postprocessing"])
+                    if inspect.iscoroutinefunction(self.player_functions[player]["turn"]):
+                        calls[player] = _call_player_coroutine(*arguments)
+                    else:
+                        executor_calls[player] = event_loop.run_in_executor(executor, _call_player_function, *arguments)
+                        calls[player] = asyncio.shield(executor_calls[player])
+
+                # Wait for the answers until the end of the turn, except for postprocessing which is not timed
+                timeout = None if self.synchronous or done else turn_duration
+                answers = await asyncio.gather(*[_wait_for_answer(calls[player], timeout) for player in calls])
+                for player, (action, duration) in zip(calls, answers):
+                    actions_as_text[player], durations[player] = action, duration
+                    if player in executor_calls and executor_calls[player].done():
+                        del executor_calls[player]
+
+                # Players that did not postprocess yet continue
+                players_ready = [player for player in self.player_locations if not actions_as_text[player].startswith("postprocessing")]
+
+                # Apply the actions and go to next turn
+                turn, done = self._end_turn(turn, done, actions_as_text, durations, possible_actions, stats)
+
+        # In case of an error, we ignore stats
+        except:
+            print(traceback.format_exc(), file=sys.stderr)
+            stats = {}
+
+        # Calls still running in the executor are not waited for
+        for executor_call in executor_calls.values():
+            executor_call.cancel()
+
+        # Clean before returning
+        self._close()
+        return stats
+
+    #############################################################################################################################################
+    #                                                              PRIVATE METHODS                                                              #
+    #                                                             (GAME MANAGEMENT)                                                             #
+    #############################################################################################################################################
+
+    def _end_turn ( self:             Self,
+                    turn:             int,
+                    done:             bool,
+                    actions_as_text:  Dict[str, str],
+                    durations:        Dict[str, Union[None, float]],
+                    possible_actions: List[str],
+                    stats:            Dict[str, Any]
+                  ) ->                Tuple[int, bool]:
+        
+        """
+            Applies the actions returned by the players, and saves the statistics of the turn.
+            In:
+                * self:             Reference to the current object.
+                * turn:             Current turn number.
+                * done:             Whether the game was over before this turn.
+                * actions_as_text:  Actions returned by the players, or descriptions of what happened (mud, preprocessing, error...).
+                * durations:        Time taken by the players to decide, or None if no decision was asked.
+                * possible_actions: List of possible actions.
+                * stats:            Game statistics, updated in place.
+            Out:
+                * turn: Next turn number.
+                * done: Whether the game is over.
+        """
+
+        # Check for errors
+        if any([actions_as_text[player].endswith("error") for player in self.player_locations]) and not self.continue_on_error:
+            raise Exception("A player has crashed, exiting")
+
+        # We save the turn info if we are not postprocessing
+        if not done:
+        
+            # Apply the actions
+            locations_before = self.player_locations.copy()
+            corrected_actions = {player: actions_as_text[player] if actions_as_text[player] in possible_actions else "nothing" for player in self.player_locations}
+            done = self._update_game_state(corrected_actions)
+            
+            # Save stats
+            for player in self.player_locations:
+                if not actions_as_text[player].startswith("preprocessing"):
+                    if actions_as_text[player] in ["north", "west", "south", "east"] and locations_before[player] == self.player_locations[player] and not self._is_in_mud(player):
+                        stats["players"][player]["actions"]["wall"] += 1
+                        stats["players"][player]["actions"][actions_as_text[player]] -= 1
+                    else:
+                        stats["players"][player]["actions"][actions_as_text[player]] += 1
+                    if actions_as_text[player] != "mud":
+                        self.actions_history[player].append(corrected_actions[player])
+                if durations[player] is not None:
+                    if actions_as_text[player].startswith("preprocessing"):
+                        stats["players"][player]["preprocessing_duration"] = durations[player]
+                    else:
+                        stats["players"][player]["turn_durations"].append(durations[player])
+                stats["players"][player]["score"] = self.player_scores[player]
+            stats["turns"] = turn
+            
+            # Go to next turn
+            turn += 1
+            self._render(turn, done)
+
+        return turn, done
+
+    #############################################################################################################################################
+
+    def _close ( self: Self
+               ) ->    None:
+        
+        """
+            Actions to do at the end of the game if needed.
+            In:
+                * self: Reference to the current object.
+            Out:
+                * None.
+        """
+        
+        # We save the game if asked
+        if self.save_game:
+            
+            # Generic config stuff we want to save
+            config = {"synchronous": True, "continue_on_error": False}
+            
+            # We save the maze as it was given (fixed or random)
+            if self.fixed_maze is not None:
+                config["fixed_maze"] = self.fixed_maze
+            else:
+                config["maze_width"] = self.maze_width
+                config["maze_height"] = self.maze_height
+                config["random_seed_maze"] = self.random_seed_maze
+                config["cell_percentage"] = self.cell_percentage
+                config["wall_percentage"] = self.wall_percentage
+                config["mud_percentage"] = self.mud_percentage
+                config["mud_range"] = self.mud_range
+                config["maze_generator"] = self.maze_generator
+            
+            # Same for the cheese
+            if self.fixed_cheese is not None:
+                config["fixed_cheese"] = self.fixed_cheese
+            else:
+                config["nb_cheese"] = self.nb_cheese
+                config["random_seed_cheese"] = self.game_random_seed_cheese
+            
+            # Create the players' file, forcing players to their initial locations
+            output_file_name = os.path.join(self.save_path, datetime.datetime.now().strftime("%Y_%m_%d_%H_%M_%S_%f.py"))
+            with open(os.path.join(os.path.dirname(os.path.realpath(__file__)), "save_template.py"), "r") as save_template_file:
+                save_template = save_template_file.read()
+                save_template = save_template.replace("{ACTIONS}", str(self.actions_history).replace("], '", "],\n                      '"))
+                save_template = save_template.replace("{PLAYERS}", str([{"\"name\": \"%s\", \"team\": \"%s\", \"skin\": \"%s\", \"turn_function\": turn, \"location\": %d" % (player, [team for team in self.teams if player in self.teams[team]][0], self.player_skins[player], self.player_initial_locations[player])} for player in self.player_locations]).replace("'", "").replace("},", "},\n              "))
+                save_template = save_template.replace("{CONFIG}", str(config).replace(", '", ",\n              '"))
+                with open(output_file_name, "w") as output_file:
+                    print(save_template, file=output_file)
+
+        # Wait for GUI to be exited to quit if there is one
+        if self.gui_process is not None:
             self.gui_process.join()
         
     #############################################################################################################################################
@@ -470,8 +1133,8 @@ class PyRat ():
                 * scores: Dictionary of scores.
         """
         
-        # Aggregate players of the team
-        scores = {team: round(sum([self.player_scores[player] for player in self.teams[team]]), 5) for team in self.teams}
+        # Scores are aggregated when they change
+        scores = self.team_scores.copy()
         return scores
 
     #############################################################################################################################################
@@ -521,19 +1184,30 @@ class PyRat ():
                     self.player_muds[player]["target"] = None
 
         # Update cheese and scores
-        remaining_cheese = []
-        for c in self.cheese:
-            players_on_cheese = [player for player in self.player_locations if c == self.player_locations[player]]
+        # Players are grouped by location, so that only their locations are checked
+        players_per_location = {}
+        for player in self.player_locations:
+            if self.player_locations[player] not in players_per_location:
+                players_per_location[self.player_locations[player]] = []
+            players_per_location[self.player_locations[player]].append(player)
+        eaten_cheese = [location for location in players_per_location if location in self.cheese_set]
+        scoring_teams = set()
+        for piece_of_cheese in eaten_cheese:
+            players_on_cheese = players_per_location[piece_of_cheese]
             for player in players_on_cheese:
                 self.player_scores[player] += 1.0 / len(players_on_cheese)
-            if len(players_on_cheese) == 0:
-                remaining_cheese.append(c)
-        self.cheese = remaining_cheese
+                scoring_teams.add(self.player_teams[player])
+
+        # The list of cheese and team scores only change if some cheese was eaten
+        if len(eaten_cheese) > 0:
+            self.cheese_set.difference_update(eaten_cheese)
+            self.cheese = [piece_of_cheese for piece_of_cheese in self.cheese if piece_of_cheese in self.cheese_set]
+            for team in scoring_teams:
+                self.team_scores[team] = round(sum([self.player_scores[player] for player in self.teams[team]]), 5)
         
-        # Store trace for GUI
+        # Store trace for GUI (the whole trace is kept if no maximum length is given)
         for player in self.player_locations:
             self.player_traces[player].append(self.player_locations[player])
-            self.player_traces[player] = self.player_traces[player][-self.trace_length:]
         
         # Update the state of the game
         team_scores = self._score_per_team()
@@ -552,7 +1226,7 @@ class PyRat ():
     #############################################################################################################################################
     
     def _create_maze ( self: Self
-                     ) ->    Tuple[Dict[int, Dict[int, int]], Union[numpy.ndarray, Dict[int, Dict[int, int]]], int, int]:
+                     ) ->    Tuple[Dict[int, Dict[int, int]], Union[numpy.ndarray, Dict[int, Dict[int, int]], MazeCSR], int, int]:
         
         """
             Creates a maze, according to the provided criteria.
@@ -584,6 +1258,8 @@ class PyRat ():
             for vertex in maze:
                 for neighbor in maze[vertex]:
                     maze_public[vertex, neighbor] = maze[vertex][neighbor]
+        elif self.maze_representation == "csr":
+            maze_public = MazeCSR.from_dictionary(maze, maze_width, maze_height)
         else:
             raise Exception("Invalid public representation of the maze %s" % self.maze_representation)
 
@@ -663,54 +1339,161 @@ class PyRat ():
         """
     
         # Initialize an empty maze, and add cells until it reaches the asked density
-        maze_sparse = sparse.lil_matrix((self.maze_width * self.maze_height, self.maze_width * self.maze_height), dtype=int)
-        cells = [(self.maze_height // 2, self.maze_width // 2)]
-        while len(cells) / maze_sparse.shape[0] * 100 < self.cell_percentage:
-            row, col = cells[nprandom.randint(len(cells))]
-            neighbor_row, neighbor_col = [(row - 1, col), (row + 1, col), (row, col - 1), (row, col + 1)][nprandom.randint(4)]
-            if 0 <= neighbor_row < self.maze_height and 0 <= neighbor_col < self.maze_width:
-                maze_sparse[self._rc_to_i(row, col, self.maze_width), self._rc_to_i(neighbor_row, neighbor_col, self.maze_width)] = 1
-                maze_sparse[self._rc_to_i(neighbor_row, neighbor_col, self.maze_width), self._rc_to_i(row, col, self.maze_width)] = 1
-                for next_neighbor_row, next_neighbor_col in [(neighbor_row - 1, neighbor_col), (neighbor_row + 1, neighbor_col), (neighbor_row, neighbor_col - 1), (neighbor_row, neighbor_col + 1)]:
-                    if (next_neighbor_row, next_neighbor_col) in cells:
-                        maze_sparse[self._rc_to_i(next_neighbor_row, next_neighbor_col, self.maze_width), self._rc_to_i(neighbor_row, neighbor_col, self.maze_width)] = 1
-                        maze_sparse[self._rc_to_i(neighbor_row, neighbor_col, self.maze_width), self._rc_to_i(next_neighbor_row, next_neighbor_col, self.maze_width)] = 1
-                if (neighbor_row, neighbor_col) not in cells:
-                    cells.append((neighbor_row, neighbor_col))
+        nb_vertices = self.maze_width * self.maze_height
+        vertices = numpy.arange(nb_vertices)
+        rows, cols = vertices // self.maze_width, vertices % self.maze_width
+        cell_neighbors = numpy.stack([numpy.where(rows > 0, vertices - self.maze_width, -1), numpy.where(rows < self.maze_height - 1, vertices + self.maze_width, -1), numpy.where(cols > 0, vertices - 1, -1), numpy.where(cols < self.maze_width - 1, vertices + 1, -1)], axis=1).tolist()
+        nb_cells = 1
+        while nb_cells / nb_vertices * 100 < self.cell_percentage:
+            nb_cells += 1
+        if self.maze_generator == "v1":
+            is_cell = self._grow_cells_v1(cell_neighbors, nb_cells)
+        elif self.maze_generator == "v2":
+            is_cell = self._grow_cells_v2(cell_neighbors, nb_cells)
+        else:
+            raise Exception("Invalid maze generator %s" % self.maze_generator)
+
+        # All pairs of adjacent cells are connected
+        is_cell = numpy.frombuffer(is_cell, dtype=numpy.uint8).astype(bool)
+        horizontal = vertices[(cols < self.maze_width - 1) & is_cell & numpy.roll(is_cell, -1)]
+        vertical = vertices[(rows < self.maze_height - 1) & is_cell & numpy.roll(is_cell, -self.maze_width)]
+        sources = numpy.concatenate([horizontal, horizontal + 1, vertical, vertical + self.maze_width])
+        targets = numpy.concatenate([horizontal + 1, horizontal, vertical + self.maze_width, vertical])
+        maze_sparse = sparse.csr_matrix((numpy.ones(sources.shape[0], dtype=int), (sources, targets)), shape=(nb_vertices, nb_vertices))
+        maze_sparse.sort_indices()
         
         # Add walls
+        # Shuffling the indices of the walls makes the same random choices as shuffling the walls
         maze_full = csgraph.minimum_spanning_tree(maze_sparse)
         maze_full += maze_full.transpose()
         walls = sparse.triu(maze_sparse - maze_full).nonzero()
-        walls = [(walls[0][i], walls[1][i]) for i in range(walls[0].shape[0])]
-        nprandom.shuffle(walls)
-        for i in range(int(numpy.ceil(self.wall_percentage / 100.0 * len(walls)))):
-            maze_sparse[walls[i][0], walls[i][1]] = 0
-            maze_sparse[walls[i][1], walls[i][0]] = 0
+        walls_order = numpy.arange(walls[0].shape[0])
+        nprandom.shuffle(walls_order)
+        walls_order = walls_order[:int(numpy.ceil(self.wall_percentage / 100.0 * walls_order.shape[0]))]
+        walls_sparse = sparse.csr_matrix((numpy.ones(walls_order.shape[0], dtype=int), (walls[0][walls_order], walls[1][walls_order])), shape=maze_sparse.shape)
+        maze_sparse = maze_sparse - walls_sparse - walls_sparse.transpose()
+        maze_sparse.eliminate_zeros()
 
         # Add mud
+        # Drawing all weights at once makes the same random choices as calling nprandom.choice for each path
         paths = sparse.triu(maze_sparse).nonzero()
-        paths = [(paths[0][i], paths[1][i]) for i in range(paths[0].shape[0])]
-        nprandom.shuffle(paths)
-        for i in range(int(numpy.ceil(self.mud_percentage / 100.0 * len(paths)))):
-            mud_weight = nprandom.choice(range(self.mud_range[0], self.mud_range[1] + 1))
-            maze_sparse[paths[i][0], paths[i][1]] = mud_weight
-            maze_sparse[paths[i][1], paths[i][0]] = mud_weight
+        paths_order = numpy.arange(paths[0].shape[0])
+        nprandom.shuffle(paths_order)
+        paths_order = paths_order[:int(numpy.ceil(self.mud_percentage / 100.0 * paths_order.shape[0]))]
+        mud_weights = nprandom.randint(0, self.mud_range[1] - self.mud_range[0] + 1, size=paths_order.shape[0]) + self.mud_range[0]
+        mud_sparse = sparse.csr_matrix((mud_weights - 1, (paths[0][paths_order], paths[1][paths_order])), shape=maze_sparse.shape)
+        maze_sparse = maze_sparse + mud_sparse + mud_sparse.transpose()
+        maze_sparse.sort_indices()
 
         # Convert to dictionary
         maze = {}
-        for vertex in range(maze_sparse.shape[0]):
-            neighbors = maze_sparse[vertex].rows[0]
-            if len(neighbors) > 0:
-                maze[vertex] = {}
-                for neighbor in neighbors:
-                    maze[vertex][neighbor] = maze_sparse[vertex, neighbor]
+        indptr, indices, weights = maze_sparse.indptr.tolist(), maze_sparse.indices.tolist(), maze_sparse.data.tolist()
+        for vertex in range(nb_vertices):
+            if indptr[vertex] < indptr[vertex + 1]:
+                maze[vertex] = dict(zip(indices[indptr[vertex]:indptr[vertex + 1]], weights[indptr[vertex]:indptr[vertex + 1]]))
         
         # Return the maze and dimensions
         return maze, self.maze_width, self.maze_height
 
     #############################################################################################################################################
 
+    def _grow_cells_v1 ( self:           Self,
+                         cell_neighbors: List[List[int]],
+                         nb_cells:       int
+                       ) ->              bytearray:
+        
+        """
+            Chooses the cells of a random maze, starting from the center, as done by the "v1" maze generator.
+            At each step, a random cell is chosen, and its neighbor in a random direction (north, south, west, east) is added if possible.
+            Choices are the ones nprandom.randint(len(cells)) and nprandom.randint(4) would make, but computed from random 32-bit words drawn in bulk.
+            Then, the random generator is set to the state it would have reached with these calls.
+            In:
+                * self:           Reference to the current object.
+                * cell_neighbors: Neighbors of each cell in the grid, in the order north, south, west, east (-1 when outside the grid).
+                * nb_cells:       Number of cells to choose.
+            Out:
+                * is_cell: Indicates for each cell of the grid if it is in the maze.
+        """
+        
+        # Start from the center
+        cells = [self._rc_to_i(self.maze_height // 2, self.maze_width // 2, self.maze_width)]
+        is_cell = bytearray(len(cell_neighbors))
+        is_cell[cells[0]] = 1
+
+        # Grow until enough cells are found
+        random_state = nprandom.get_state()
+        random_words = []
+        nb_random_words_used = 0
+        cell_mask = 0
+        while len(cells) < nb_cells:
+            if nb_random_words_used + 2 > len(random_words):
+                random_words += nprandom.randint(0, 2 ** 32, size=max(4096, len(random_words)), dtype=numpy.uint32).tolist()
+            cell_index = 0
+            if cell_mask != 0:
+                cell_index = random_words[nb_random_words_used] & cell_mask
+                nb_random_words_used += 1
+                if cell_index >= len(cells):
+                    continue
+            neighbor = cell_neighbors[cells[cell_index]][random_words[nb_random_words_used] & 3]
+            nb_random_words_used += 1
+            if neighbor >= 0 and not is_cell[neighbor]:
+                is_cell[neighbor] = 1
+                cells.append(neighbor)
+                cell_mask = (1 << (len(cells) - 1).bit_length()) - 1
+
+        # Set the random generator as if words were drawn one by one
+        nprandom.set_state(random_state)
+        nprandom.randint(0, 2 ** 32, size=nb_random_words_used, dtype=numpy.uint32)
+        return is_cell
+
+    #############################################################################################################################################
+
+    def _grow_cells_v2 ( self:           Self,
+                         cell_neighbors: List[List[int]],
+                         nb_cells:       int
+                       ) ->              bytearray:
+        
+        """
+            Chooses the cells of a random maze, starting from the center, as done by the "v2" maze generator.
+            At each step, a cell is chosen uniformly among those adjacent to the maze, and added to it.
+            Contrary to the "v1" generator, each step adds a cell, so the number of steps is the number of cells.
+            In:
+                * self:           Reference to the current object.
+                * cell_neighbors: Neighbors of each cell in the grid, in the order north, south, west, east (-1 when outside the grid).
+                * nb_cells:       Number of cells to choose.
+            Out:
+                * is_cell: Indicates for each cell of the grid if it is in the maze.
+        """
+        
+        # Start from the center, with its neighbors as frontier
+        # The position of each cell in the frontier is stored to remove it in constant time
+        is_cell = bytearray(len(cell_neighbors))
+        frontier = []
+        frontier_positions = [-1] * len(cell_neighbors)
+        new_cell = self._rc_to_i(self.maze_height // 2, self.maze_width // 2, self.maze_width)
+        
+        # Add cells with all random choices drawn at once
+        for random_value in nprandom.random_sample(nb_cells).tolist():
+            
+            # Add the cell to the maze, and its new neighbors to the frontier
+            is_cell[new_cell] = 1
+            for neighbor in cell_neighbors[new_cell]:
+                if neighbor >= 0 and not is_cell[neighbor] and frontier_positions[neighbor] < 0:
+                    frontier_positions[neighbor] = len(frontier)
+                    frontier.append(neighbor)
+
+            # Choose the next cell and remove it from the frontier
+            if len(frontier) > 0:
+                new_cell = frontier[int(random_value * len(frontier))]
+                frontier[frontier_positions[new_cell]] = frontier[-1]
+                frontier_positions[frontier[-1]] = frontier_positions[new_cell]
+                frontier.pop()
+        
+        # Done
+        return is_cell
+
+    #############################################################################################################################################
+
     def _distribute_cheese ( self: Self,
                            ) ->    List[int]:
         
@@ -792,9 +1575,10 @@ class PyRat ():
 
     def _register_player ( self:                    Self,
                            name:                    str,
-                           turn_function:           Callable[[Union[numpy.ndarray, Dict[int, Dict[int, int]]], int, int, str, Dict[str, List[str]], Dict[str, int], Dict[str, float], Dict[str, Dict[str, Union[None, int]]], List[int], List[str], threading.local], str],
-                           preprocessing_function:  Union[None, Callable[[Union[numpy.ndarray, Dict[int, Dict[int, int]]], int, int, str, Dict[str, List[str]], Dict[str, int], List[int], List[str], threading.local], None]] = None,
-                           postprocessing_function: Union[None, Callable[[Union[numpy.ndarray, Dict[int, Dict[int, int]]], int, int, str, Dict[str, List[str]], Dict[str, int], Dict[str, float], Dict[str, Dict[str, Union[None, int]]], List[int], List[str], threading.local, Dict[str, Any]], None]] = None,
+                           turn_function:           Callable[[Union[numpy.ndarray, Dict[int, Dict[int, int]]], int, int, str, Dict[str, List[str]], Dict[str, int], Dict[str, float], Dict[str, Dict[str, Union[None, int]]], List[int], List[str], types.SimpleNamespace], str],
+                           preprocessing_function:  Union[None, Callable[[Union[numpy.ndarray, Dict[int, Dict[int, int]]], int, int, str, Dict[str, List[str]], Dict[str, int], List[int], List[str], types.SimpleNamespace], None]] = None,
+                           postprocessing_function: Union[None, Callable[[Union[numpy.ndarray, Dict[int, Dict[int, int]]], int, int, str, Dict[str, List[str]], Dict[str, int], Dict[str, float], Dict[str, Dict[str, Union[None, int]]], List[int], List[str], types.SimpleNamespace, Dict[str, Any]], None]] = None,
+                           background_function:     Union[None, Callable[[Union[numpy.ndarray, Dict[int, Dict[int, int]]], int, int, str, Dict[str, List[str]], List[str], types.SimpleNamespace, ThinkingTime], None]] = None,
                            skin:                    str = "default",
                            team:                    str = "",
                            location:                str = "center"
@@ -807,6 +1591,7 @@ class PyRat ():
                 * turn_function:           Function used to control the player at each turn.
                 * preprocessing_function:  Preprocessing function used by the player at the beginning of the game (optional).
                 * postprocessing_function: Function called at the end of the game (optional).
+                * background_function:     Function running in a thread between preprocessing and postprocessing, to use the time when no player function runs (optional, see ThinkingTime).
                 * team:                    Team of the player.
                 * skin:                    Skin of the player (rad, python, default, or an existing directory).
                 * location:                Controls initial location of the player (random, same, center, or a fixed index).
@@ -849,8 +1634,8 @@ class PyRat ():
         self.player_scores[name] = 0
         self.player_skins[name] = skin
         self.player_muds[name] = {"target": None, "count": 0}
-        self.player_traces[name] = []
-        self.player_functions[name] = {"preprocessing": preprocessing_function, "postprocessing": postprocessing_function, "turn": turn_function}
+        self.player_traces[name] = collections.deque(maxlen=self.trace_length if self.trace_length > 0 else None)
+        self.player_functions[name] = {"preprocessing": preprocessing_function, "postprocessing": postprocessing_function, "turn": turn_function, "background": background_function}
         self.actions_history[name] = []
         
     #############################################################################################################################################
@@ -1102,8 +1887,8 @@ class PyRat ():
         if turn == 0:
 
             # Initialize the GUI process
-            gui_initialized_synchronizer = multiprocessing.Manager().Barrier(2)
-            self.gui_process_queue = multiprocessing.Manager().Queue()
+            gui_initialized_synchronizer = _get_sync_manager().Barrier(2)
+            self.gui_process_queue = _get_sync_manager().Queue()
             self.gui_process = multiprocessing.Process(target=_gui_process_function, args=(gui_initialized_synchronizer, self.gui_process_queue, self.maze, self.maze_width, self.maze_height, self.player_locations, self.teams, self.cheese, self.nb_cheese, self.fullscreen, self.player_skins, self.render_simplified, self.trace_length, self.gui_speed, self._rc_to_i, self._i_to_rc))
             self.gui_process.start()
             gui_initialized_synchronizer.wait()
@@ -1115,99 +1900,1338 @@ class PyRat ():
             self.gui_process_queue.put((self._score_per_team(), new_player_locations, mud_values, self.cheese, done, turn))
         
 #####################################################################################################################################################
-################################################################## MULTIPROCESSING ##################################################################
+#################################################################### PLAYER POOL ####################################################################
 #####################################################################################################################################################
 
-def _player_process_function ( player:                  str,
-                               input_queue:             multiprocessing.Queue,
-                               output_queue:            multiprocessing.Queue,
-                               turn_start_synchronizer: multiprocessing.Barrier,
-                               turn_timeout_lock:       multiprocessing.Lock,
-                               turn_end_synchronizer:   multiprocessing.Barrier,
-                               preprocessing_function:  Callable[[Any, int, int, str, Dict[str, Any], Dict[str, Tuple[int, int]], Dict[str, Tuple[int, int]], Dict[str, Dict[str, int]], Dict[Tuple[int, int], int], List[str], Any], None],
-                               turn_function:           Callable[[Any, int, int, str, Dict[str, Any], Dict[str, Tuple[int, int]], Dict[str, Tuple[int, int]], Dict[str, Dict[str, int]], Dict[Tuple[int, int], int], List[str], Any], str],
-                               postprocessing_function: Callable[[Any, int, int, str, Dict[str, Any], Dict[str, Tuple[int, int]], Dict[str, Dict[str, int]], Dict[Tuple[int, int], int], List[str], Any, Dict[str, Any]], None]
-                             ) ->                       None:
-    
+class PlayerPool ():
+
     """
-        This function is executed in a separate process per player.
-        It handles the communication with the player and calls the functions given as arguments.
-        In:
-            * player:                  Name of the player.
-            * input_queue:             Queue to receive the game state.
-            * output_queue:            Queue to send the action.
-            * turn_start_synchronizer: Barrier to synchronize the start of the turn.
-            * turn_timeout_lock:       Lock to synchronize the timeout of the turn.
-            * turn_end_synchronizer:   Barrier to synchronize the end of the turn.
-            * preprocessing_function:  Function to call before the game starts.
-            * turn_function:           Function to call at each turn.
-            * postprocessing_function: Function to call after the game ends.
-        Out:
-            * None.
+        A pool of processes for the players, that can be reused across consecutive games.
+        Processes are created once, and receive the elements of each new game they take part in.
+        The memory of the players is reset between games.
+        Pass it to PyRat with the player_pool argument, or use the play method directly.
     """
 
-    # We catch exceptions that may happen during the game
-    try:
+    #############################################################################################################################################
+    #                                                                CONSTRUCTOR                                                                #
+    #############################################################################################################################################
 
-        # Main loop
-        memory = threading.local()
-        while True:
-            
-            # Wait for all players ready
-            turn_start_synchronizer.wait()
-            maze, maze_width, maze_height, teams, possible_actions, player_locations, player_scores, player_muds, cheese, turn, final_stats = input_queue.get()
-            duration = None
-            try:
-                
-                # Call postprocessing once the game is over
-                if final_stats is not None:
-                    action = "postprocessing_error"
-                    if postprocessing_function is not None:
-                        postprocessing_function(maze, maze_width, maze_height, player, teams, player_locations, player_scores, player_muds, cheese, possible_actions, memory, final_stats)
-                    action = "postprocessing"
-                    
-                # If in mud, we return immediately (main process will wait for us in all cases)
-                elif player_muds[player]["target"] is not None:
-                    action = "mud"
-                
-                # Otherwise, we ask for an action
-                else:
-                
-                    # Measure start time
-                    start = time.process_time()
-                    
-                    # Go
-                    if turn == 0:
-                        action = "preprocessing_error"
-                        if preprocessing_function is not None:
-                            preprocessing_function(maze, maze_width, maze_height, player, teams, player_locations, cheese, possible_actions, memory)
-                        action = "preprocessing"
-                    else:
-                        action = "error"
-                        a = turn_function(maze, maze_width, maze_height, player, teams, player_locations, player_scores, player_muds, cheese, possible_actions, memory)
-                        if a not in possible_actions:
-                            raise Exception("Invalid action %s by player %s" % (str(a), player))
-                        action = a
-                    
-                    # Set end time
-                    end_time = time.process_time()
-                    duration = end_time - start
-                        
-            # Print error message in case of a crash
-            except:
-                print("Player %s has crashed with the following error:" % (player), file=sys.stderr)
-                print(traceback.format_exc(), file=sys.stderr)
-                    
-            # Turn is over
-            with turn_timeout_lock:
-                output_queue.put((action, duration))
-            turn_end_synchronizer.wait()
-            if action.startswith("postprocessing"):
-                break
+    def __init__ ( self:    Self,
+                   players: List[Dict[str, Any]]
+                 ) ->       Self:
 
-    # Ignore
-    except:
-        pass
+        """
+            This function is the constructor of the class.
+            In:
+                * self:    Reference to the current object.
+                * players: List of players handled by the pool, given as dictionaries with keys as defined in PyRat._register_player.
+            Out:
+                * self: Reference to the current object.
+        """
+
+        # Inherit from parent class
+        super(PlayerPool, self).__init__()
+
+        # Check arguments are correct
+        assert 0 < len(players)
+        
+        # Store arguments
+        self.players = players
+
+        # Create a process per player
+        # Waiter processes are only needed for asynchronous games, and are created on first use
+        self.player_workers = {}
+        self.waiter_workers = {}
+        for player in self.players:
+            if player["name"] in self.player_workers:
+                raise Exception("Use distinct names for players")
+            functions = (player.get("preprocessing_function", None), player["turn_function"], player.get("postprocessing_function", None), player.get("background_function", None))
+            self.player_workers[player["name"]] = self._start_worker(_player_process_function, functions)
+    
+    #############################################################################################################################################
+    #                                                               PUBLIC METHODS                                                              #
+    #############################################################################################################################################
+
+    def play ( self: Self,
+               **config
+             ) ->    Dict[str, Any]:
+
+        """
+            Plays a game with all the players of the pool.
+            In:
+                * self:   Reference to the current object.
+                * config: Game configuration, as keyword arguments of the PyRat constructor.
+            Out:
+                * stats: Game statistics computed during the game.
+        """
+
+        # Create and start the game
+        game = PyRat(self.players, player_pool=self, **config)
+        stats = game.start()
+        return stats
+
+    #############################################################################################################################################
+
+    def close ( self: Self
+              ) ->    None:
+
+        """
+            Stops all processes of the pool.
+            The pool cannot be used anymore afterwards.
+            In:
+                * self: Reference to the current object.
+            Out:
+                * None.
+        """
+
+        # Ask the processes to stop once their current game is over
+        workers = list(self.player_workers.values()) + list(self.waiter_workers.values())
+        for worker in workers:
+            worker["setup_queue"].put(None)
+        for worker in workers:
+            worker["process"].join()
+        self.player_workers = {}
+        self.waiter_workers = {}
+
+    #############################################################################################################################################
+
+    def __enter__ ( self: Self
+                  ) ->    Self:
+
+        """
+            Allows using the pool in a with statement.
+            In:
+                * self: Reference to the current object.
+            Out:
+                * self: Reference to the current object.
+        """
+
+        # Nothing to do
+        return self
+
+    #############################################################################################################################################
+
+    def __exit__ ( self: Self,
+                   *args
+                 ) ->    None:
+
+        """
+            Closes the pool when exiting a with statement.
+            In:
+                * self: Reference to the current object.
+                * args: Exception information, ignored.
+            Out:
+                * None.
+        """
+
+        # Stop processes
+        self.close()
+
+    #############################################################################################################################################
+    #                                                              PRIVATE METHODS                                                              #
+    #############################################################################################################################################
+
+    def _start_worker ( self:       Self,
+                        target:     Callable[..., None],
+                        fixed_args: Tuple[Any, ...]
+                      ) ->          Dict[str, Any]:
+
+        """
+            Creates a process that will run a function for each game it receives.
+            In:
+                * self:       Reference to the current object.
+                * target:     Function to run for each game.
+                * fixed_args: Arguments of the function that do not change across games.
+            Out:
+                * worker: Dictionary with the process and the queue to send it games.
+        """
+
+        # Start the process
+        # It should use the resource tracker of the current process, that owns the shared memory blocks of the games
+        multiprocessing.resource_tracker.ensure_running()
+        worker = {"process": None, "setup_queue": _get_sync_manager().Queue()}
+        worker["process"] = multiprocessing.Process(target=_pool_worker_function, args=(worker["setup_queue"], target, fixed_args,))
+        worker["process"].start()
+        return worker
+
+    #############################################################################################################################################
+
+    def _start_player_game ( self:      Self,
+                             player:    str,
+                             game_args: Tuple[Any, ...]
+                           ) ->         None:
+
+        """
+            Sends the elements of a new game to the process of a player.
+            In:
+                * self:      Reference to the current object.
+                * player:    Name of the player.
+                * game_args: Arguments of _player_process_function that are specific to the game, with the random state to use first.
+            Out:
+                * None.
+        """
+
+        # Check the player is handled
+        if player not in self.player_workers:
+            raise Exception("Player %s is not in the pool" % (player))
+        
+        # Send the game
+        self.player_workers[player]["setup_queue"].put(game_args)
+
+    #############################################################################################################################################
+
+    def _start_waiter_game ( self:      Self,
+                             player:    str,
+                             game_args: Tuple[Any, ...]
+                           ) ->         None:
+
+        """
+            Sends the elements of a new game to the waiter process of a player, creating it if needed.
+            In:
+                * self:      Reference to the current object.
+                * player:    Name of the player.
+                * game_args: Arguments of _waiter_process_function that are specific to the game, with the random state to use first.
+            Out:
+                * None.
+        """
+
+        # Create the process if needed
+        if player not in self.waiter_workers:
+            self.waiter_workers[player] = self._start_worker(_waiter_process_function, ())
+        
+        # Send the game
+        self.waiter_workers[player]["setup_queue"].put(game_args)
+
+#####################################################################################################################################################
+################################################################### BATCHED GAMES ###################################################################
+#####################################################################################################################################################
+
+class BatchedPyRat ():
+
+    """
+        Many independent games with the same dimensions and players, advanced together with the rules of PyRat.
+        Players are not called: actions are given for all games at once, as an array of indices in POSSIBLE_ACTIONS.
+        This is useful to simulate a large number of games quickly, for instance to evaluate policies or for reinforcement learning.
+        The state of all games is stored in NumPy arrays, with games as first dimension:
+            * player_locations[g, p] is the cell of player p in game g.
+            * mud_targets[g, p] is the cell player p is going to through mud in game g, or -1 if not in mud.
+            * mud_counts[g, p] is the number of turns left before player p leaves mud in game g.
+            * cheese[g, v] indicates if there is a piece of cheese in cell v in game g.
+            * player_scores[g, p] is the score of player p in game g.
+            * turns[g] is the number of turns played in game g.
+            * done[g] indicates if game g is over (in which case it is not updated anymore).
+        Players are indexed in the order of player_names, and cells as in PyRat.
+    """
+
+    # Actions, indexed as in the arrays of actions given to step
+    POSSIBLE_ACTIONS = ["nothing", "north", "east", "south", "west"]
+
+    #############################################################################################################################################
+    #                                                                CONSTRUCTOR                                                                #
+    #############################################################################################################################################
+
+    def __init__ ( self:  Self,
+                   games: List["PyRat"]
+                 ) ->     Self:
+
+        """
+            This function is the constructor of the class.
+            The games are copied in their current state, and are not modified afterwards.
+            In:
+                * self:  Reference to the current object.
+                * games: Games to simulate, with the same dimensions and players.
+            Out:
+                * self: Reference to the current object.
+        """
+
+        # Inherit from parent class
+        super(BatchedPyRat, self).__init__()
+
+        # Check arguments are correct
+        assert 0 < len(games)
+        self.maze_width = games[0].maze_width
+        self.maze_height = games[0].maze_height
+        self.player_names = list(games[0].player_locations)
+        for game in games:
+            if game.maze_width != self.maze_width or game.maze_height != self.maze_height or list(game.player_locations) != self.player_names:
+                raise Exception("All games should have the same dimensions and players")
+
+        # Teams are indexed in order of appearance, and given as a matrix to sum scores per team
+        team_names = list(games[0].teams)
+        player_teams = numpy.array([team_names.index(games[0].player_teams[player]) for player in self.player_names])
+        self.team_matrix = numpy.zeros((len(self.player_names), len(team_names)))
+        self.team_matrix[numpy.arange(len(self.player_names)), player_teams] = 1.0
+
+        # For each game, cell and action, we store the cell reached and the weight of the move (0 if impossible)
+        # Tables are flattened, so that moves are found with a single indexing operation
+        nb_games = len(games)
+        nb_vertices = self.maze_width * self.maze_height
+        self.moves = numpy.tile(numpy.arange(nb_vertices, dtype=numpy.int32)[:, None], (nb_games, 1, len(self.POSSIBLE_ACTIONS)))
+        self.move_weights = numpy.zeros((nb_games, nb_vertices, len(self.POSSIBLE_ACTIONS)), dtype=numpy.int32)
+        offsets = {1: -self.maze_width, 2: 1, 3: self.maze_width, 4: -1}
+        for g, game in enumerate(games):
+            for vertex in game.maze:
+                for action in offsets:
+                    target = vertex + offsets[action]
+                    if target in game.maze[vertex]:
+                        self.moves[g, vertex, action] = target
+                        self.move_weights[g, vertex, action] = game.maze[vertex][target]
+        self.moves = self.moves.reshape(-1)
+        self.move_weights = self.move_weights.reshape(-1)
+        self.game_offsets = numpy.arange(nb_games, dtype=numpy.int64)[:, None] * nb_vertices
+
+        # Copy the state of the games
+        self.player_locations = numpy.array([[game.player_locations[player] for player in self.player_names] for game in games], dtype=numpy.int32)
+        self.mud_targets = numpy.array([[game.player_muds[player]["target"] if game.player_muds[player]["target"] is not None else -1 for player in self.player_names] for game in games], dtype=numpy.int32)
+        self.mud_counts = numpy.array([[game.player_muds[player]["count"] for player in self.player_names] for game in games], dtype=numpy.int32)
+        self.cheese = numpy.zeros((nb_games, nb_vertices), dtype=bool)
+        for g, game in enumerate(games):
+            self.cheese[g, game.cheese] = True
+        self.player_scores = numpy.array([[game.player_scores[player] for player in self.player_names] for game in games], dtype=numpy.float64)
+        self.turns = numpy.zeros(nb_games, dtype=numpy.int32)
+        self.done = numpy.zeros(nb_games, dtype=bool)
+
+    #############################################################################################################################################
+    #                                                               STATIC METHODS                                                              #
+    #############################################################################################################################################
+
+    @staticmethod
+    def from_seeds ( players:      List[Dict[str, Any]],
+                     random_seeds: List[int],
+                     **config:     Any
+                   ) ->            "BatchedPyRat":
+
+        """
+            Creates random games, one per random seed, and simulates them together.
+            In:
+                * players:      List of players, as given to PyRat (functions are not needed).
+                * random_seeds: Random seed of each game.
+                * config:       Other arguments of the PyRat constructor, common to all games.
+            Out:
+                * batched_game: Games ready to be simulated.
+        """
+
+        # Create the games
+        players = [{"turn_function": None, **player} for player in players]
+        games = [PyRat(players, random_seed=random_seed, render_mode="no_rendering", **config) for random_seed in random_seeds]
+        batched_game = BatchedPyRat(games)
+        return batched_game
+
+    #############################################################################################################################################
+    #                                                               PUBLIC METHODS                                                              #
+    #############################################################################################################################################
+
+    def step ( self:    Self,
+               actions: numpy.ndarray
+             ) ->       numpy.ndarray:
+
+        """
+            Plays a turn in all games that are not over, with the same rules as PyRat._update_game_state.
+            Actions of players in mud are ignored.
+            In:
+                * self:    Reference to the current object.
+                * actions: Indices in POSSIBLE_ACTIONS of the actions of all players, as an array of shape (number of games, number of players).
+            Out:
+                * done: Indicates which games are over.
+        """
+
+        # Check arguments are correct
+        actions = numpy.asarray(actions)
+        if actions.shape != self.player_locations.shape or actions.min(initial=0) < 0 or actions.max(initial=0) >= len(self.POSSIBLE_ACTIONS):
+            raise Exception("Invalid actions")
+
+        # Move players that are not in mud, in games that are not over
+        moving = (self.mud_targets < 0) & ~self.done[:, None]
+        move_indices = ((self.game_offsets + self.player_locations) * len(self.POSSIBLE_ACTIONS) + actions)[moving]
+        targets = self.moves[move_indices]
+        weights = self.move_weights[move_indices]
+        locations = self.player_locations[moving]
+        mud_targets = self.mud_targets[moving]
+        mud_counts = self.mud_counts[moving]
+        locations[weights == 1] = targets[weights == 1]
+        mud_targets[weights > 1] = targets[weights > 1]
+        mud_counts[weights > 1] = weights[weights > 1]
+        self.player_locations[moving] = locations
+        self.mud_targets[moving] = mud_targets
+        self.mud_counts[moving] = mud_counts
+
+        # All players in mud advance a bit
+        in_mud = (self.mud_targets >= 0) & ~self.done[:, None]
+        self.mud_counts[in_mud] -= 1
+        out_of_mud = in_mud & (self.mud_counts == 0)
+        self.player_locations[out_of_mud] = self.mud_targets[out_of_mud]
+        self.mud_targets[out_of_mud] = -1
+
+        # Players on a piece of cheese share it with the players at the same location
+        game_indices = numpy.arange(len(self.done))[:, None]
+        on_cheese = self.cheese[game_indices, self.player_locations] & ~self.done[:, None]
+        if numpy.any(on_cheese):
+            nb_players_on_cell = numpy.sum(self.player_locations[:, :, None] == self.player_locations[:, None, :], axis=2)
+            self.player_scores += on_cheese / nb_players_on_cell
+            self.cheese[numpy.broadcast_to(game_indices, on_cheese.shape)[on_cheese], self.player_locations[on_cheese]] = False
+
+        # A game is over when all cheese is eaten, or when the second best team cannot catch up with the best one
+        self.turns[~self.done] += 1
+        team_scores = numpy.round(self.player_scores @ self.team_matrix, 5)
+        nb_cheese = numpy.sum(self.cheese, axis=1)
+        if team_scores.shape[1] > 1:
+            best_scores = numpy.partition(team_scores, -2, axis=1)
+            self.done |= (best_scores[:, -2] + nb_cheese < best_scores[:, -1]) | (nb_cheese == 0)
+        else:
+            self.done |= nb_cheese == 0
+        return self.done.copy()
+
+#####################################################################################################################################################
+#################################################################### ENVIRONMENT ####################################################################
+#####################################################################################################################################################
+
+class Env ():
+
+    """
+        Game driven step by step by the caller, rather than by PyRat.start calling the players.
+        This is useful to train agents or to run search algorithms, without processes.
+        The game is created with the same functions as PyRat (maze, players and cheese), and updated with the same rules.
+        Observations contain what players receive at each turn: maze, dimensions, teams, locations, scores, muds, cheese, and turn number.
+        The state of the game can be saved with clone, and set back with restore, for instance to explore different actions from the same state.
+    """
+
+    #############################################################################################################################################
+    #                                                                CONSTRUCTOR                                                                #
+    #############################################################################################################################################
+
+    def __init__ ( self:     Self,
+                   players:  List[Dict[str, Any]],
+                   **config: Any
+                 ) ->        Self:
+
+        """
+            This function is the constructor of the class.
+            The game is only created when reset is called.
+            In:
+                * self:    Reference to the current object.
+                * players: List of players, as given to PyRat (functions are not needed).
+                * config:  Other arguments of the PyRat constructor (rendering and timing options are not used).
+            Out:
+                * self: Reference to the current object.
+        """
+
+        # Inherit from parent class
+        super(Env, self).__init__()
+
+        # Store arguments
+        # Traces are only used for rendering, so only the last location is kept by default (a length of 0 would keep the whole trace)
+        self.players = [{"turn_function": None, **player} for player in players]
+        self.config = {"trace_length": 1, **config, "render_mode": "no_rendering"}
+        self.possible_actions = ["nothing", "north", "east", "south", "west"]
+
+        # The game does not exist yet
+        self.game = None
+        self.turn = 0
+        self.done = False
+
+    #############################################################################################################################################
+    #                                                               PUBLIC METHODS                                                              #
+    #############################################################################################################################################
+
+    def reset ( self: Self,
+                seed: Union[None, int] = None
+              ) ->    Dict[str, Any]:
+
+        """
+            Creates a new game.
+            In:
+                * self: Reference to the current object.
+                * seed: Random seed for all elements of the game, or None to use the ones given in the configuration.
+            Out:
+                * observation: Initial state of the game.
+        """
+
+        # Create the game
+        config = self.config if seed is None else {**self.config, "random_seed": seed}
+        self.game = PyRat(self.players, **config)
+        self.turn = 0
+        self.done = False
+        observation = self._observe()
+        return observation
+
+    #############################################################################################################################################
+
+    def step ( self:    Self,
+               actions: Dict[str, str]
+             ) ->       Tuple[Dict[str, Any], Dict[str, float], bool, Dict[str, Any]]:
+
+        """
+            Plays a turn with the given actions.
+            Players that are not given an action do nothing, and actions of players in mud are ignored, as in PyRat.
+            In:
+                * self:    Reference to the current object.
+                * actions: Action of each player, among possible_actions.
+            Out:
+                * observation: State of the game after the turn.
+                * rewards:     Points scored by each player during the turn.
+                * done:        Whether the game is over.
+                * info:        Additional information (scores per team).
+        """
+
+        # Check arguments are correct
+        if self.game is None or self.done:
+            raise Exception("The game is over or was not created, call reset first")
+        if any([player not in self.game.player_locations or actions[player] not in self.possible_actions for player in actions]):
+            raise Exception("Invalid actions", actions)
+
+        # Update the game
+        scores_before = self.game.player_scores.copy()
+        corrected_actions = {player: "nothing" if self.game._is_in_mud(player) else actions.get(player, "nothing") for player in self.game.player_locations}
+        self.done = self.game._update_game_state(corrected_actions)
+        self.turn += 1
+
+        # Return the new state
+        observation = self._observe()
+        rewards = {player: self.game.player_scores[player] - scores_before[player] for player in self.game.player_scores}
+        info = {"team_scores": self.game._score_per_team()}
+        return observation, rewards, self.done, info
+
+    #############################################################################################################################################
+
+    def clone ( self: Self
+              ) ->    Dict[str, Any]:
+
+        """
+            Saves the current state of the game.
+            Only elements that change during the game are copied, so that this is cheap as long as traces are short.
+            In:
+                * self: Reference to the current object.
+            Out:
+                * state: Saved state, to give to restore.
+        """
+
+        # Copy the elements modified by _update_game_state
+        state = {"player_locations": self.game.player_locations.copy(),
+                 "player_scores": self.game.player_scores.copy(),
+                 "player_muds": {player: self.game.player_muds[player].copy() for player in self.game.player_muds},
+                 "cheese": self.game.cheese.copy(),
+                 "team_scores": self.game.team_scores.copy(),
+                 "player_traces": {player: self.game.player_traces[player].copy() for player in self.game.player_traces},
+                 "turn": self.turn,
+                 "done": self.done}
+        return state
+
+    #############################################################################################################################################
+
+    def restore ( self:  Self,
+                  state: Dict[str, Any]
+                ) ->     None:
+
+        """
+            Sets the game back to a saved state.
+            The state is copied, so that it can be restored several times.
+            In:
+                * self:  Reference to the current object.
+                * state: State returned by clone.
+            Out:
+                * None.
+        """
+
+        # Copy the elements back
+        self.game.player_locations = state["player_locations"].copy()
+        self.game.player_scores = state["player_scores"].copy()
+        self.game.player_muds = {player: state["player_muds"][player].copy() for player in state["player_muds"]}
+        self.game.cheese = state["cheese"].copy()
+        self.game.cheese_set = set(self.game.cheese)
+        self.game.team_scores = state["team_scores"].copy()
+        self.game.player_traces = {player: state["player_traces"][player].copy() for player in state["player_traces"]}
+        self.turn = state["turn"]
+        self.done = state["done"]
+
+    #############################################################################################################################################
+    #                                                              PRIVATE METHODS                                                              #
+    #############################################################################################################################################
+
+    def _observe ( self: Self
+                 ) ->    Dict[str, Any]:
+
+        """
+            Describes the current state of the game, with the elements given to players.
+            In:
+                * self: Reference to the current object.
+            Out:
+                * observation: Copy of the state of the game.
+        """
+
+        # Elements that do not change are not copied
+        observation = {"maze": self.game.maze_public,
+                       "maze_width": self.game.maze_width,
+                       "maze_height": self.game.maze_height,
+                       "teams": self.game.teams,
+                       "player_locations": self.game.player_locations.copy(),
+                       "player_scores": self.game.player_scores.copy(),
+                       "player_muds": {player: self.game.player_muds[player].copy() for player in self.game.player_muds},
+                       "cheese": self.game.cheese.copy(),
+                       "turn": self.turn}
+        return observation
+
+#####################################################################################################################################################
+################################################################## MULTIPROCESSING ##################################################################
+#####################################################################################################################################################
+
+# Manager serving the synchronization primitives and queues, shared by all games of the interpreter
+_sync_manager = None
+_sync_manager_pid = None
+
+#####################################################################################################################################################
+
+def _get_sync_manager () -> multiprocessing.managers.SyncManager:
+
+    """
+        Returns the manager used to create the synchronization primitives and queues shared with the processes.
+        A single manager server is started per interpreter, and reused by all the games played in it.
+        If the current process was forked from a process that already had a manager, a new one is started.
+        In:
+            * None.
+        Out:
+            * sync_manager: Manager to use.
+    """
+
+    # Start the manager if needed
+    global _sync_manager, _sync_manager_pid
+    if _sync_manager is None or _sync_manager_pid != os.getpid():
+        _sync_manager = multiprocessing.Manager()
+        _sync_manager_pid = os.getpid()
+    return _sync_manager
+
+#####################################################################################################################################################
+
+def _copy_game_state ( player_locations: Dict[str, int],
+                       player_scores:    Dict[str, float],
+                       player_muds:      Dict[str, Dict[str, Union[None, int]]],
+                       cheese:           List[int]
+                     ) ->                Dict[str, Any]:
+    
+    """
+        Makes a copy of the elements of the game that change during the game.
+        In:
+            * player_locations: Locations for all players in the game.
+            * player_scores:    Scores for all players in the game.
+            * player_muds:      Indicates which player is currently crossing mud.
+            * cheese:           List of available pieces of cheese in the maze.
+        Out:
+            * game_state: Dictionary with a copy of each element.
+    """
+
+    # Copy everything
+    game_state = {"player_locations": player_locations.copy(), "player_scores": player_scores.copy(), "player_muds": {player: player_muds[player].copy() for player in player_muds}, "cheese": cheese.copy()}
+    return game_state
+
+#####################################################################################################################################################
+
+def _make_game_state_delta ( sent_game_state:  Dict[str, Any],
+                             player_locations: Dict[str, int],
+                             player_scores:    Dict[str, float],
+                             player_muds:      Dict[str, Dict[str, Union[None, int]]],
+                             cheese:           List[int]
+                           ) ->                Dict[str, Any]:
+    
+    """
+        Computes what changed in the game since a player last received the game state.
+        The state known by the player is then updated.
+        In:
+            * sent_game_state:  State of the game as last sent to the player, as built by _copy_game_state (updated).
+            * player_locations: Locations for all players in the game.
+            * player_scores:    Scores for all players in the game.
+            * player_muds:      Indicates which player is currently crossing mud.
+            * cheese:           List of available pieces of cheese in the maze.
+        Out:
+            * game_state_delta: Changed locations, scores and muds, and list of pieces of cheese eaten since then.
+    """
+
+    # Only keep what changed
+    game_state_delta = {"player_locations": {player: player_locations[player] for player in player_locations if player_locations[player] != sent_game_state["player_locations"][player]},
+                        "player_scores": {player: player_scores[player] for player in player_scores if player_scores[player] != sent_game_state["player_scores"][player]},
+                        "player_muds": {player: player_muds[player].copy() for player in player_muds if player_muds[player] != sent_game_state["player_muds"][player]},
+                        "eaten_cheese": []}
+    if len(cheese) != len(sent_game_state["cheese"]):
+        remaining_cheese = set(cheese)
+        game_state_delta["eaten_cheese"] = [piece_of_cheese for piece_of_cheese in sent_game_state["cheese"] if piece_of_cheese not in remaining_cheese]
+
+    # The player now knows the current state
+    _apply_game_state_delta(sent_game_state, game_state_delta)
+    return game_state_delta
+
+#####################################################################################################################################################
+
+def _apply_game_state_delta ( game_state:       Dict[str, Any],
+                              game_state_delta: Dict[str, Any]
+                            ) ->                None:
+    
+    """
+        Updates a game state with the changes computed by _make_game_state_delta.
+        In:
+            * game_state:       State of the game, as built by _copy_game_state (updated).
+            * game_state_delta: Changes to apply.
+        Out:
+            * None.
+    """
+
+    # Update the elements that changed, keeping the order of the remaining pieces of cheese
+    game_state["player_locations"].update(game_state_delta["player_locations"])
+    game_state["player_scores"].update(game_state_delta["player_scores"])
+    game_state["player_muds"].update({player: game_state_delta["player_muds"][player].copy() for player in game_state_delta["player_muds"]})
+    if len(game_state_delta["eaten_cheese"]) > 0:
+        eaten_cheese = set(game_state_delta["eaten_cheese"])
+        game_state["cheese"] = [piece_of_cheese for piece_of_cheese in game_state["cheese"] if piece_of_cheese not in eaten_cheese]
+
+#####################################################################################################################################################
+
+class _SharedArray (NamedTuple):
+
+    """
+        Description of an array stored in a shared memory block, sent to processes instead of the array itself.
+    """
+
+    # Attributes
+    offset: int
+    shape:  Tuple[int, ...]
+    dtype:  str
+
+#####################################################################################################################################################
+
+def _map_arrays ( data:      Any,
+                  leaf_type: type,
+                  function:  Callable[[Any], Any]
+                ) ->         Any:
+
+    """
+        Applies a function to all elements of a given type found in lists and named tuples (such as MazeCSR or DistanceOracle).
+        In:
+            * data:      Data to explore.
+            * leaf_type: Type of the elements to transform.
+            * function:  Function to apply to these elements.
+        Out:
+            * new_data: Same data, with transformed elements.
+    """
+
+    # Explore the containers
+    if isinstance(data, leaf_type):
+        new_data = function(data)
+    elif isinstance(data, tuple) and hasattr(data, "_fields"):
+        new_data = type(data)(*[_map_arrays(element, leaf_type, function) for element in data])
+    elif isinstance(data, list):
+        new_data = [_map_arrays(element, leaf_type, function) for element in data]
+    else:
+        new_data = data
+    return new_data
+
+#####################################################################################################################################################
+
+def _share_arrays ( data: Any
+                  ) ->    Tuple[Union[None, multiprocessing.shared_memory.SharedMemory], Any]:
+
+    """
+        Copies the read-only arrays found in the data to a shared memory block, to send them to processes without copying them.
+        Writable arrays are not shared, as players may modify their own copy.
+        The block should be closed and unlinked once the processes do not need it anymore.
+        In:
+            * data: Data to share, as lists and named tuples.
+        Out:
+            * shared_memory: Block containing the arrays, or None if there is none.
+            * shared_data:   Same data, where shared arrays are replaced by their description in the block.
+    """
+
+    # Find the arrays to share, aligned in the block
+    arrays = []
+    block_size = 0
+    def __register (array):
+        nonlocal block_size
+        if array.flags.writeable:
+            return array
+        arrays.append((array, block_size))
+        shared_array = _SharedArray(block_size, array.shape, array.dtype.str)
+        block_size += (array.nbytes + 63) // 64 * 64
+        return shared_array
+    shared_data = _map_arrays(data, numpy.ndarray, __register)
+    if len(arrays) == 0:
+        return None, data
+
+    # Copy the arrays
+    shared_memory = multiprocessing.shared_memory.SharedMemory(create=True, size=max(block_size, 1))
+    for array, offset in arrays:
+        numpy.ndarray(array.shape, array.dtype, buffer=shared_memory.buf, offset=offset)[...] = array
+    return shared_memory, shared_data
+
+#####################################################################################################################################################
+
+def _attach_arrays ( shared_memory_name: Union[None, str],
+                     shared_data:        Any
+                   ) ->                  Tuple[Union[None, multiprocessing.shared_memory.SharedMemory], Any]:
+
+    """
+        Replaces the arrays described in data built by _share_arrays with read-only views on the shared memory block.
+        In:
+            * shared_memory_name: Name of the block, or None if nothing was shared.
+            * shared_data:        Data as built by _share_arrays.
+        Out:
+            * shared_memory: Block containing the arrays, or None if nothing was shared.
+            * data:          Same data, with views on the shared arrays.
+    """
+
+    # Nothing to do if nothing was shared
+    if shared_memory_name is None:
+        return None, shared_data
+
+    # Create views
+    shared_memory = multiprocessing.shared_memory.SharedMemory(name=shared_memory_name)
+    def __attach (shared_array):
+        array = numpy.ndarray(shared_array.shape, numpy.dtype(shared_array.dtype), buffer=shared_memory.buf, offset=shared_array.offset)
+        array.flags.writeable = False
+        return array
+    data = _map_arrays(shared_data, _SharedArray, __attach)
+    return shared_memory, data
+
+#####################################################################################################################################################
+
+def _call_player_function ( player:                  str,
+                            maze:                    Union[numpy.ndarray, Dict[int, Dict[int, int]], MazeCSR],
+                            maze_width:              int,
+                            maze_height:             int,
+                            teams:                   Dict[str, List[str]],
+                            possible_actions:        List[str],
+                            distance_oracle:         Union[None, DistanceOracle],
+                            player_locations:        Dict[str, int],
+                            player_scores:           Dict[str, float],
+                            player_muds:             Dict[str, Dict[str, Union[None, int]]],
+                            cheese:                  List[int],
+                            turn:                    int,
+                            deadline:                Deadline,
+                            final_stats:             Union[None, Dict[str, Any]],
+                            memory:                  types.SimpleNamespace,
+                            preprocessing_function:  Union[None, Callable[[Union[numpy.ndarray, Dict[int, Dict[int, int]]], int, int, str, Dict[str, List[str]], Dict[str, int], List[int], List[str], types.SimpleNamespace], None]],
+                            turn_function:           Callable[[Union[numpy.ndarray, Dict[int, Dict[int, int]]], int, int, str, Dict[str, List[str]], Dict[str, int], Dict[str, float], Dict[str, Dict[str, Union[None, int]]], List[int], List[str], types.SimpleNamespace], str],
+                            postprocessing_function: Union[None, Callable[[Union[numpy.ndarray, Dict[int, Dict[int, int]]], int, int, str, Dict[str, List[str]], Dict[str, int], Dict[str, float], Dict[str, Dict[str, Union[None, int]]], List[int], List[str], types.SimpleNamespace, Dict[str, Any]], None]]
+                          ) ->                       Tuple[str, Union[None, float]]:
+    
+    """
+        This function calls the adequate function of a player for the given game state.
+        It is used both by the player processes and when the game is played in-process.
+        In:
+            * player:                  Name of the player.
+            * maze:                    Map of the maze, as given to players.
+            * maze_width:              Width of the maze in number of cells.
+            * maze_height:             Height of the maze in number of cells.
+            * teams:                   Recap of the teams of players.
+            * possible_actions:        List of possible actions.
+            * distance_oracle:         Shortest paths between all cells, or None if not computed.
+            * player_locations:        Locations for all players in the game.
+            * player_scores:           Scores for all players in the game.
+            * player_muds:             Indicates which player is currently crossing mud.
+            * cheese:                  List of available pieces of cheese in the maze.
+            * turn:                    Turn number.
+            * deadline:                End of the time given to the player for this turn (given to preprocessing and turn functions asking for it).
+            * final_stats:             Statistics of the game if it is over, None otherwise.
+            * memory:                  Local memory of the player.
+            * preprocessing_function:  Function to call before the game starts.
+            * turn_function:           Function to call at each turn.
+            * postprocessing_function: Function to call after the game ends.
+        Out:
+            * action:   Action returned by the player, or a description of what happened (mud, preprocessing, error...).
+            * duration: Time taken by the player to decide, or None if no decision was asked.
+    """
+
+    # Optional arguments are only given to the functions that ask for them
+    optional_arguments = {}
+    if distance_oracle is not None:
+        optional_arguments["distance_oracle"] = distance_oracle
+
+    # We catch exceptions that may happen in the player's functions
+    duration = None
+    try:
+        
+        # Call postprocessing once the game is over
+        if final_stats is not None:
+            action = "postprocessing_error"
+            if postprocessing_function is not None:
+                postprocessing_function(maze, maze_width, maze_height, player, teams, player_locations, player_scores, player_muds, cheese, possible_actions, memory, final_stats, **_select_arguments(postprocessing_function, optional_arguments))
+            action = "postprocessing"
+            
+        # If in mud, we return immediately (main process will wait for us in all cases)
+        elif player_muds[player]["target"] is not None:
+            action = "mud"
+        
+        # Otherwise, we ask for an action
+        else:
+        
+            # Measure start time
+            start = time.process_time()
+            optional_arguments["deadline"] = deadline
+            
+            # Go
+            if turn == 0:
+                action = "preprocessing_error"
+                if preprocessing_function is not None:
+                    preprocessing_function(maze, maze_width, maze_height, player, teams, player_locations, cheese, possible_actions, memory, **_select_arguments(preprocessing_function, optional_arguments))
+                action = "preprocessing"
+            else:
+                action = "error"
+                a = turn_function(maze, maze_width, maze_height, player, teams, player_locations, player_scores, player_muds, cheese, possible_actions, memory, **_select_arguments(turn_function, optional_arguments))
+                if a not in possible_actions:
+                    raise Exception("Invalid action %s by player %s" % (str(a), player))
+                action = a
+            
+            # Set end time
+            end_time = time.process_time()
+            duration = end_time - start
+                
+    # Print error message in case of a crash
+    except:
+        print("Player %s has crashed with the following error:" % (player), file=sys.stderr)
+        print(traceback.format_exc(), file=sys.stderr)
+    
+    # Return what happened
+    return action, duration
+
+#####################################################################################################################################################
+
+async def _call_player_coroutine ( player:                  str,
+                                   maze:                    Union[numpy.ndarray, Dict[int, Dict[int, int]], MazeCSR],
+                                   maze_width:              int,
+                                   maze_height:             int,
+                                   teams:                   Dict[str, List[str]],
+                                   possible_actions:        List[str],
+                                   distance_oracle:         Union[None, DistanceOracle],
+                                   player_locations:        Dict[str, int],
+                                   player_scores:           Dict[str, float],
+                                   player_muds:             Dict[str, Dict[str, Union[None, int]]],
+                                   cheese:                  List[int],
+                                   turn:                    int,
+                                   deadline:                Deadline,
+                                   final_stats:             Union[None, Dict[str, Any]],
+                                   memory:                  types.SimpleNamespace,
+                                   preprocessing_function:  Union[None, Callable[..., Any]],
+                                   turn_function:           Callable[..., Any],
+                                   postprocessing_function: Union[None, Callable[..., Any]]
+                                 ) ->                       Tuple[str, Union[None, float]]:
+    
+    """
+        This function is the equivalent of _call_player_function for players defined with "async def", used when the game is played in an event loop.
+        All given functions must be coroutines, since a function called directly would block the event loop.
+        As other coroutines run while waiting for the player, the duration is measured as elapsed time rather than processor time.
+        In:
+            * player:                  Name of the player.
+            * maze:                    Map of the maze, as given to players.
+            * maze_width:              Width of the maze in number of cells.
+            * maze_height:             Height of the maze in number of cells.
+            * teams:                   Recap of the teams of players.
+            * possible_actions:        List of possible actions.
+            * distance_oracle:         Shortest paths between all cells, or None if not computed.
+            * player_locations:        Locations for all players in the game.
+            * player_scores:           Scores for all players in the game.
+            * player_muds:             Indicates which player is currently crossing mud.
+            * cheese:                  List of available pieces of cheese in the maze.
+            * turn:                    Turn number.
+            * deadline:                End of the time given to the player for this turn (given to preprocessing and turn functions asking for it).
+            * final_stats:             Statistics of the game if it is over, None otherwise.
+            * memory:                  Local memory of the player.
+            * preprocessing_function:  Function to call before the game starts.
+            * turn_function:           Function to call at each turn.
+            * postprocessing_function: Function to call after the game ends.
+        Out:
+            * action:   Action returned by the player, or a description of what happened (mud, preprocessing, error...).
+            * duration: Time taken by the player to decide, or None if no decision was asked.
+    """
+
+    # Optional arguments are only given to the functions that ask for them
+    optional_arguments = {}
+    if distance_oracle is not None:
+        optional_arguments["distance_oracle"] = distance_oracle
+
+    # We catch exceptions that may happen in the player's functions
+    # Cancellation when the turn is over is not an exception of the player
+    duration = None
+    try:
+        
+        # Call postprocessing once the game is over
+        if final_stats is not None:
+            action = "postprocessing_error"
+            if postprocessing_function is not None:
+                await postprocessing_function(maze, maze_width, maze_height, player, teams, player_locations, player_scores, player_muds, cheese, possible_actions, memory, final_stats, **_select_arguments(postprocessing_function, optional_arguments))
+            action = "postprocessing"
+            
+        # If in mud, we return immediately
+        elif player_muds[player]["target"] is not None:
+            action = "mud"
+        
+        # Otherwise, we ask for an action
+        else:
+        
+            # Measure start time
+            start = time.monotonic()
+            optional_arguments["deadline"] = deadline
+            
+            # Go
+            if turn == 0:
+                action = "preprocessing_error"
+                if preprocessing_function is not None:
+                    await preprocessing_function(maze, maze_width, maze_height, player, teams, player_locations, cheese, possible_actions, memory, **_select_arguments(preprocessing_function, optional_arguments))
+                action = "preprocessing"
+            else:
+                action = "error"
+                a = await turn_function(maze, maze_width, maze_height, player, teams, player_locations, player_scores, player_muds, cheese, possible_actions, memory, **_select_arguments(turn_function, optional_arguments))
+                if a not in possible_actions:
+                    raise Exception("Invalid action %s by player %s" % (str(a), player))
+                action = a
+            
+            # Set end time
+            end_time = time.monotonic()
+            duration = end_time - start
+                
+    # Print error message in case of a crash
+    except asyncio.CancelledError:
+        raise
+    except:
+        print("Player %s has crashed with the following error:" % (player), file=sys.stderr)
+        print(traceback.format_exc(), file=sys.stderr)
+    
+    # Return what happened
+    return action, duration
+
+#####################################################################################################################################################
+
+async def _wait_for_answer ( call:    Awaitable[Tuple[str, Union[None, float]]],
+                             timeout: Union[None, float]
+                           ) ->       Tuple[str, Union[None, float]]:
+
+    """
+        Waits for a player to answer, until the end of the turn.
+        In:
+            * call:    Call to the player, returning its action and duration.
+            * timeout: Time given to the player, or None to wait without limit.
+        Out:
+            * action:   Action returned by the player, or "miss" if it did not answer in time.
+            * duration: Time taken by the player to decide, or None if no decision was received.
+    """
+
+    # Cancel the call if it takes too long
+    try:
+        action, duration = await asyncio.wait_for(call, timeout)
+    except asyncio.TimeoutError:
+        action, duration = "miss", None
+    return action, duration
+
+#####################################################################################################################################################
+
+@functools.lru_cache(maxsize=None)
+def _get_keyword_parameters ( function: Callable[..., Any]
+                            ) ->        Tuple[Set[str], bool]:
+
+    """
+        Lists the parameters of a function that can be given by name.
+        Results are cached, as this is called at every turn.
+        In:
+            * function: Function to inspect.
+        Out:
+            * names:          Names of the parameters.
+            * accepts_kwargs: Whether the function also accepts any other named argument.
+    """
+
+    # Inspect the signature
+    parameters = inspect.signature(function).parameters.values()
+    names = {parameter.name for parameter in parameters if parameter.kind in [inspect.Parameter.POSITIONAL_OR_KEYWORD, inspect.Parameter.KEYWORD_ONLY]}
+    accepts_kwargs = any([parameter.kind == inspect.Parameter.VAR_KEYWORD for parameter in parameters])
+    return names, accepts_kwargs
+
+#####################################################################################################################################################
+
+def _select_arguments ( function:  Callable[..., Any],
+                        arguments: Dict[str, Any]
+                      ) ->         Dict[str, Any]:
+
+    """
+        Keeps the optional arguments that a player function accepts.
+        This allows to give more information to players without breaking the existing programs.
+        In:
+            * function:  Function to call.
+            * arguments: Optional arguments, by name.
+        Out:
+            * selected_arguments: Arguments to give to the function.
+    """
+
+    # Check the signature
+    if len(arguments) == 0:
+        return {}
+    names, accepts_kwargs = _get_keyword_parameters(function)
+    selected_arguments = {name: arguments[name] for name in arguments if accepts_kwargs or name in names}
+    return selected_arguments
+
+#####################################################################################################################################################
+
+def _start_background_function ( player_backgrounds:  Dict[str, Tuple[threading.Thread, ThinkingTime]],
+                                 player:              str,
+                                 final_stats:         Union[None, Dict[str, Any]],
+                                 maze:                Union[numpy.ndarray, Dict[int, Dict[int, int]], MazeCSR],
+                                 maze_width:          int,
+                                 maze_height:         int,
+                                 teams:               Dict[str, List[str]],
+                                 possible_actions:    List[str],
+                                 distance_oracle:     Union[None, DistanceOracle],
+                                 memory:              types.SimpleNamespace,
+                                 background_function: Union[None, Callable[[Union[numpy.ndarray, Dict[int, Dict[int, int]]], int, int, str, Dict[str, List[str]], List[str], types.SimpleNamespace, ThinkingTime], None]]
+                               ) ->                   None:
+
+    """
+        Starts the thread running the background function of a player, once preprocessing is over.
+        In:
+            * player_backgrounds:  Threads running background functions, with their thinking time, indexed by player.
+            * player:              Name of the player.
+            * final_stats:         Statistics of the game if it is over, None otherwise.
+            * maze:                Map of the maze, as given to players.
+            * maze_width:          Width of the maze in number of cells.
+            * maze_height:         Height of the maze in number of cells.
+            * teams:               Recap of the teams of players.
+            * possible_actions:    List of possible actions.
+            * distance_oracle:     Shortest paths between all cells, or None if not computed.
+            * memory:              Local memory of the player.
+            * background_function: Function to run in the thread, or None.
+        Out:
+            * None.
+    """
+
+    # Nothing to do if there is no background function, if it is already started, or if the game is over
+    if background_function is None or player in player_backgrounds or final_stats is not None:
+        return
+
+    # Start the thread
+    optional_arguments = {}
+    if distance_oracle is not None:
+        optional_arguments["distance_oracle"] = distance_oracle
+    thinking_time = ThinkingTime()
+    arguments = (maze, maze_width, maze_height, player, teams, possible_actions, memory, thinking_time)
+    thread = threading.Thread(target=_background_thread_function, args=(player, background_function, thinking_time, arguments, _select_arguments(background_function, optional_arguments)), daemon=True)
+    player_backgrounds[player] = (thread, thinking_time)
+    thread.start()
+
+#####################################################################################################################################################
+
+def _pause_background_functions ( player_backgrounds: Dict[str, Tuple[threading.Thread, ThinkingTime]],
+                                  timeout:            float
+                                ) ->                  None:
+
+    """
+        Makes all background functions wait before a player function is called.
+        They are all asked to pause, and then waited for until they are blocked, or until the timeout is reached.
+        In:
+            * player_backgrounds: Threads running background functions, with their thinking time, indexed by player.
+            * timeout:            Maximum time to wait, usually the time left in the turn.
+        Out:
+            * None.
+    """
+
+    # Ask all threads first, so that they stop their steps at the same time
+    for player in player_backgrounds:
+        player_backgrounds[player][1]._pause()
+    
+    # Wait for them, until the end of the turn
+    end = time.monotonic() + timeout
+    for player in player_backgrounds:
+        player_backgrounds[player][1]._wait_until_parked(max(0.0, end - time.monotonic()))
+
+#####################################################################################################################################################
+
+def _resume_background_functions ( player_backgrounds: Dict[str, Tuple[threading.Thread, ThinkingTime]]
+                                 ) ->                  None:
+
+    """
+        Lets all background functions continue after a player function is called.
+        In:
+            * player_backgrounds: Threads running background functions, with their thinking time, indexed by player.
+        Out:
+            * None.
+    """
+
+    # Resume all threads
+    for player in player_backgrounds:
+        player_backgrounds[player][1]._resume()
+
+#####################################################################################################################################################
+
+def _stop_background_function ( player_backgrounds: Dict[str, Tuple[threading.Thread, ThinkingTime]],
+                                player:             str,
+                                timeout:            float
+                              ) ->                  None:
+
+    """
+        Stops the background function of a player and waits for it to return.
+        If it does not return in time, the thread is abandoned (it does not prevent the process from exiting) and an error is reported.
+        In:
+            * player_backgrounds: Threads running background functions, with their thinking time, indexed by player.
+            * player:             Name of the player.
+            * timeout:            Time given to the background function to return, at least ThinkingTime.MINIMUM_STOP_TIME.
+        Out:
+            * None.
+    """
+
+    # Stop the thread if it exists
+    if player in player_backgrounds:
+        thread, thinking_time = player_backgrounds.pop(player)
+        thinking_time._stop()
+        thread.join(max(timeout, ThinkingTime.MINIMUM_STOP_TIME))
+        if thread.is_alive():
+            print("Background function of player %s did not return in time after being stopped, it is abandoned" % (player), file=sys.stderr)
+
+#####################################################################################################################################################
+
+def _background_thread_function ( player:              str,
+                                  background_function: Callable[..., None],
+                                  thinking_time:       ThinkingTime,
+                                  arguments:           Tuple[Any, ...],
+                                  optional_arguments:  Dict[str, Any]
+                                ) ->                   None:
+
+    """
+        This function is executed in the thread running the background function of a player.
+        In:
+            * player:              Name of the player.
+            * background_function: Function to run.
+            * thinking_time:       Object given to the function to know when it can work.
+            * arguments:           Arguments of the function.
+            * optional_arguments:  Optional arguments the function asks for.
+        Out:
+            * None.
+    """
+
+    # A crash of the background function does not stop the game, as the player can still play
+    try:
+        background_function(*arguments, **optional_arguments)
+    except:
+        print("Background function of player %s has crashed with the following error:" % (player), file=sys.stderr)
+        print(traceback.format_exc(), file=sys.stderr)
+
+    # The game should not wait for it anymore
+    thinking_time._finish()
+
+#####################################################################################################################################################
+
+def _pool_worker_function ( setup_queue: multiprocessing.Queue,
+                            target:      Callable[..., None],
+                            fixed_args:  Tuple[Any, ...]
+                          ) ->           None:
+    
+    """
+        This function is executed in each process of a player pool.
+        It runs the target function for each game received, until asked to stop.
+        In:
+            * setup_queue: Queue to receive the elements of the games, or None to stop.
+            * target:      Function to run for each game.
+            * fixed_args:  Arguments of the target function that do not change across games.
+        Out:
+            * None.
+    """
+
+    # Play games until asked to stop
+    while True:
+        setup = setup_queue.get()
+        if setup is None:
+            break
+
+        # Start from the random state the process would have had if created for the game
+        random_state, *game_args = setup
+        if random_state is not None:
+            nprandom.set_state(random_state)
+        target(*game_args, *fixed_args)
+
+#####################################################################################################################################################
+
+def _player_process_function ( player:                  str,
+                               fixed_data:              List[Any],
+                               shared_memory_name:      Union[None, str],
+                               game_state:              Dict[str, Any],
+                               input_queue:             multiprocessing.Queue,
+                               output_queue:            multiprocessing.Queue,
+                               turn_start_synchronizer: multiprocessing.Barrier,
+                               turn_timeout_lock:       multiprocessing.Lock,
+                               turn_end_synchronizer:   multiprocessing.Barrier,
+                               turn_answer_notifier:    Union[None, multiprocessing.Queue],
+                               preprocessing_function:  Callable[[Any, int, int, str, Dict[str, Any], Dict[str, Tuple[int, int]], Dict[str, Tuple[int, int]], Dict[str, Dict[str, int]], Dict[Tuple[int, int], int], List[str], Any], None],
+                               turn_function:           Callable[[Any, int, int, str, Dict[str, Any], Dict[str, Tuple[int, int]], Dict[str, Tuple[int, int]], Dict[str, Dict[str, int]], Dict[Tuple[int, int], int], List[str], Any], str],
+                               postprocessing_function: Callable[[Any, int, int, str, Dict[str, Any], Dict[str, Tuple[int, int]], Dict[str, Dict[str, int]], Dict[Tuple[int, int], int], List[str], Any, Dict[str, Any]], None],
+                               background_function:     Union[None, Callable[[Any, int, int, str, Dict[str, Any], List[str], Any, ThinkingTime], None]]
+                             ) ->                       None:
+    
+    """
+        This function is executed in a separate process per player.
+        It handles the communication with the player and calls the functions given as arguments.
+        In:
+            * player:                  Name of the player.
+            * fixed_data:              Elements of the game that do not change (maze, dimensions, teams, possible actions, distance oracle), as built by _share_arrays.
+            * shared_memory_name:      Name of the shared memory block with the arrays of the fixed elements, or None if there is none.
+            * game_state:              Initial state of the game, as built by _copy_game_state.
+            * input_queue:             Queue to receive the changes of the game state since the last turn played, with the time given to play.
+            * output_queue:            Queue to send the action.
+            * turn_start_synchronizer: Barrier to synchronize the start of the turn.
+            * turn_timeout_lock:       Lock to synchronize the timeout of the turn.
+            * turn_end_synchronizer:   Barrier to synchronize the end of the turn.
+            * turn_answer_notifier:    Queue to notify that an action was sent, if needed (asynchronous mode).
+            * preprocessing_function:  Function to call before the game starts.
+            * turn_function:           Function to call at each turn.
+            * postprocessing_function: Function to call after the game ends.
+            * background_function:     Function to run in a thread between preprocessing and postprocessing, or None.
+        Out:
+            * None.
+    """
+
+    # We catch exceptions that may happen during the game
+    shared_memory = None
+    memory = None
+    player_backgrounds = {}
+    try:
+
+        # Map the shared arrays
+        shared_memory, fixed_data = _attach_arrays(shared_memory_name, fixed_data)
+
+        # Main loop
+        # Memory is a namespace rather than a threading.local, to be shared with the background function
+        memory = types.SimpleNamespace()
+        while True:
+            
+            # Wait for all players ready
+            turn_start_synchronizer.wait()
+            turn_start = time.monotonic()
+            game_state_delta, turn, turn_duration, final_stats = input_queue.get()
+            _apply_game_state_delta(game_state, game_state_delta)
+            
+            # Players work on their own copy of the game state
+            # The background function is paused while the player decides, and stopped before postprocessing
+            player_game_state = _copy_game_state(**game_state)
+            deadline = Deadline(turn_start + turn_duration)
+            if final_stats is not None:
+                _stop_background_function(player_backgrounds, player, deadline.remaining())
+            _pause_background_functions(player_backgrounds, deadline.remaining())
+            action, duration = _call_player_function(player, *fixed_data, player_game_state["player_locations"], player_game_state["player_scores"], player_game_state["player_muds"], player_game_state["cheese"], turn, deadline, final_stats, memory, preprocessing_function, turn_function, postprocessing_function)
+            _resume_background_functions(player_backgrounds)
+            _start_background_function(player_backgrounds, player, final_stats, *fixed_data, memory, background_function)
+
+            # Turn is over
+            with turn_timeout_lock:
+                output_queue.put((action, duration))
+                if turn_answer_notifier is not None:
+                    turn_answer_notifier.put(player)
+            turn_end_synchronizer.wait()
+            if action.startswith("postprocessing"):
+                break
+
+    # Ignore
+    except:
+        pass
+
+    # Stop the background function if the game ended unexpectedly
+    _stop_background_function(player_backgrounds, player, 0.0)
+
+    # Release the shared arrays, unless the player still has references to them
+    fixed_data = None
+    memory = None
+    if shared_memory is not None:
+        try:
+            shared_memory.close()
+        except BufferError:
+            pass
 
 #####################################################################################################################################################
 
@@ -0,0 +1,120 @@
+#####################################################################################################################################################
+######################################################################## INFO #######################################################################
+#####################################################################################################################################################
+
+"""
+    This file provides tools to play many PyRat games without rendering, for instance to compute statistics on programs.
+    Games are played in-process (see the "in_process" option of PyRat), and spread over a pool of processes.
+    Each game only depends on its seed, so results do not depend on the number of processes used.
+"""
+
+#####################################################################################################################################################
+###################################################################### IMPORTS ######################################################################
+#####################################################################################################################################################
+
+# External imports
+import multiprocessing
+import random
+import os
+from typing import *
+from typing_extensions import *
+
+# PyRat imports
+from pyrat import PyRat
+
+#####################################################################################################################################################
+############################################################### VARIABLES & CONSTANTS ###############################################################
+#####################################################################################################################################################
+
+# Players and configuration of the games played by the current process, set when the process is initialized
+_worker_players = None
+_worker_config = None
+
+#####################################################################################################################################################
+##################################################################### FUNCTIONS #####################################################################
+#####################################################################################################################################################
+
+def run_games ( players:   List[Dict[str, Any]],
+                config:    Dict[str, Any],
+                seeds:     Iterable[int],
+                workers:   Union[None, int] = None,
+                chunksize: Union[None, int] = None
+              ) ->         Iterator[Tuple[int, Dict[str, Any]]]:
+
+    """
+        Plays a game per seed, and returns the statistics of each game as soon as it is over.
+        Games are played without rendering, synchronously and in-process, whatever the given configuration says.
+        Both the game elements and the Python random generator are seeded with the seed of the game, so results are reproducible.
+        Note that players called in-process share their module global variables from one game to the next in the same process.
+        In:
+            * players:   List of players, as given to PyRat.
+            * config:    Configuration of the games, as keyword arguments of the PyRat constructor.
+            * seeds:     Seeds of the games to play.
+            * workers:   Number of processes to use (defaults to the number of CPUs, 1 plays in the current process).
+            * chunksize: Number of consecutive seeds sent at once to a process (chosen automatically if not set).
+        Out:
+            * results: Iterator over pairs (seed, stats), in the order the games end.
+    """
+
+    # Check arguments are correct
+    seeds = list(seeds)
+    workers = workers if workers is not None else os.cpu_count()
+    assert 0 < workers
+    assert chunksize is None or 0 < chunksize
+
+    # Play in the current process if asked
+    if workers == 1 or len(seeds) <= 1:
+        _initialize_worker(players, config)
+        for seed in seeds:
+            yield _run_game(seed)
+        return
+
+    # Otherwise, spread ranges of seeds over a pool of processes
+    chunksize = chunksize if chunksize is not None else max(1, len(seeds) // (4 * workers))
+    with multiprocessing.Pool(min(workers, len(seeds)), initializer=_initialize_worker, initargs=(players, config,)) as pool:
+        for result in pool.imap_unordered(_run_game, seeds, chunksize=chunksize):
+            yield result
+
+#####################################################################################################################################################
+
+def _initialize_worker ( players: List[Dict[str, Any]],
+                         config:  Dict[str, Any]
+                       ) ->       None:
+
+    """
+        Stores the players and configuration of the games to play in the current process.
+        The configuration is adapted to play games quickly.
+        In:
+            * players: List of players, as given to PyRat.
+            * config:  Configuration of the games, as keyword arguments of the PyRat constructor.
+        Out:
+            * None.
+    """
+
+    # Store for later games
+    global _worker_players, _worker_config
+    _worker_players = players
+    _worker_config = {**config, "render_mode": "no_rendering", "synchronous": True, "in_process": True}
+
+#####################################################################################################################################################
+
+def _run_game ( seed: int
+              ) ->    Tuple[int, Dict[str, Any]]:
+
+    """
+        Plays a game with the players and configuration of the current process.
+        In:
+            * seed: Seed of the game.
+        Out:
+            * seed:  Seed of the game.
+            * stats: Game statistics computed during the game.
+    """
+
+    # Seed everything and play
+    random.seed(seed)
+    game = PyRat(_worker_players, **{**_worker_config, "random_seed": seed})
+    stats = game.start()
+    return seed, stats
+
+#####################################################################################################################################################
+#####################################################################################################################################################
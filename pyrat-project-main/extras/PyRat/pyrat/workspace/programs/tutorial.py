@@ -18,7 +18,7 @@ from pyrat import *
 ##################################################################### FUNCTIONS #####################################################################
 #####################################################################################################################################################
 
-def get_vertices ( graph: Union[numpy.ndarray, Dict[int, Dict[int, int]]]
+def get_vertices ( graph: Union[numpy.ndarray, Dict[int, Dict[int, int]], MazeCSR]
                  ) ->     List[int]:
 
     """
@@ -38,6 +38,10 @@ def get_vertices ( graph: Union[numpy.ndarray, Dict[int, Dict[int, int]]]
     elif isinstance(graph, numpy.ndarray):
         vertices = list(graph.sum(axis=0).nonzero()[0])
     
+    # If "maze_representation" option is set to "csr"
+    elif isinstance(graph, MazeCSR):
+        vertices = numpy.diff(graph.indptr).nonzero()[0].tolist()
+    
     # Unhandled data type
     else:
         raise Exception("Unhandled graph type", type(graph))
@@ -48,7 +52,7 @@ def get_vertices ( graph: Union[numpy.ndarray, Dict[int, Dict[int, int]]]
 #####################################################################################################################################################
 
 def get_neighbors ( vertex: int,
-                    graph:  Union[numpy.ndarray, Dict[int, Dict[int, int]]]
+                    graph:  Union[numpy.ndarray, Dict[int, Dict[int, int]], MazeCSR]
                   ) ->      List[int]:
 
     """
@@ -71,6 +75,10 @@ def get_neighbors ( vertex: int,
     elif isinstance(graph, numpy.ndarray):
         neighbors = graph[vertex].nonzero()[0].tolist()
     
+    # If "maze_representation" option is set to "csr"
+    elif isinstance(graph, MazeCSR):
+        neighbors = graph.indices[graph.indptr[vertex]:graph.indptr[vertex + 1]].tolist()
+    
     # Unhandled data type
     else:
         raise Exception("Unhandled graph type", type(graph))
@@ -82,7 +90,7 @@ def get_neighbors ( vertex: int,
 
 def get_weight ( source: int,
                  target: int,
-                 graph:  Union[numpy.ndarray, Dict[int, Dict[int, int]]]
+                 graph:  Union[numpy.ndarray, Dict[int, Dict[int, int]], MazeCSR]
                ) ->      List[int]:
 
     """
@@ -106,6 +114,11 @@ def get_weight ( source: int,
     elif isinstance(graph, numpy.ndarray):
         weight = graph[source, target]
     
+    # If "maze_representation" option is set to "csr"
+    elif isinstance(graph, MazeCSR):
+        position = (graph.indices[graph.indptr[source]:graph.indptr[source + 1]] == target).nonzero()[0][0]
+        weight = int(graph.weights[graph.indptr[source] + position])
+    
     # Unhandled data type
     else:
         raise Exception("Unhandled graph type", type(graph))
@@ -14,6 +14,7 @@
 
 # Import PyRat
 from pyrat import *
+from pyrat.batch import run_games
 
 # External imports
 import sys
@@ -55,6 +56,14 @@ NB_CHEESE = 1
 
 #####################################################################################################################################################
 
+"""
+    Number of processes used to play games in parallel (None to use all available CPUs).
+"""
+
+NB_WORKERS = None
+
+#####################################################################################################################################################
+
 """
     List here the programs you want to compare.
 """
@@ -65,17 +74,15 @@ PROGRAMS = [random_1, random_2, random_3]
 ##################################################################### FUNCTIONS #####################################################################
 #####################################################################################################################################################
 
-def run_one_game ( seed:    int,
-                   program: types.ModuleType
-                 ) ->       Dict[str, Any]:
+def run_all_games ( program: types.ModuleType
+                  ) ->       Iterator[Tuple[int, Dict[str, Any]]]:
 
     """
-        This function runs a PyRat game, with no GUI, for a given seed and program, and returns the obtained stats.
+        This function runs NB_GAMES PyRat games, with no GUI, in parallel for a given program, and returns the obtained stats as soon as games are over.
         In:
-            * seed:    Random seed used to create the game.
-            * program: Program to use in that game.
+            * program: Program to use in the games.
         Out:
-            * stats: Statistics output at the end of the game.
+            * results: Iterator over pairs (seed, stats), where stats are the statistics output at the end of the game created with that seed.
     """
     
     # Map the functions to the character
@@ -91,13 +98,11 @@ def run_one_game ( seed:    int,
               "render_mode": "no_rendering",
               "preprocessing_time": 0.0,
               "turn_time": 0.0,
-              "synchronous": True,
-              "random_seed": seed}
+              "synchronous": True}
         
-    # Start the game
-    game = PyRat(players, **config)
-    stats = game.start()
-    return stats
+    # Start the games, seeded from 0 to NB_GAMES - 1
+    results = run_games(players, config, range(NB_GAMES), workers=NB_WORKERS)
+    return results
     
 #####################################################################################################################################################
 ######################################################################## GO! ########################################################################
@@ -108,10 +113,9 @@ if __name__ == "__main__":
     # Run multiple games for each player
     results = {program.__name__: {"turns": [], "preprocessing_duration": [], "turn_durations": []} for program in PROGRAMS}
     for program in tqdm.tqdm(PROGRAMS, desc="Program", position=0, leave=False):
-        for seed in tqdm.tqdm(range(NB_GAMES), desc="Game", position=1, leave=False):
+        for seed, stats in tqdm.tqdm(run_all_games(program), total=NB_GAMES, desc="Game", position=1, leave=False):
         
             # Here we are interested in the number of turns needed to complete the game, as well as the time it takes 
-            stats = run_one_game(seed, program)
             results[program.__name__]["turns"].append(stats["turns"])
             results[program.__name__]["preprocessing_duration"].append(stats["players"][program.__name__]["preprocessing_duration"])
             results[program.__name__]["turn_durations"] += stats["players"][program.__name__]["turn_durations"]
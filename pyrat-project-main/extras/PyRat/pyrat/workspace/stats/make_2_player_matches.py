@@ -13,6 +13,7 @@
 
 # Import PyRat
 from pyrat import *
+from pyrat.batch import run_games
 
 # External imports
 import sys
@@ -54,23 +55,29 @@ TURN_TIME = 0.0
 PREPROCESSING_TIME = 0.0
 SYNCHRONOUS = True
 
+#####################################################################################################################################################
+
+"""
+    Number of processes used to play games in parallel (None to use all available CPUs).
+"""
+
+NB_WORKERS = None
+
 #####################################################################################################################################################
 ##################################################################### FUNCTIONS #####################################################################
 #####################################################################################################################################################
 
-def run_one_game ( seed:      int,
-                   program_1: types.ModuleType,
-                   program_2: types.ModuleType
-                 ) ->         Dict[str, Any]:
+def run_all_games ( program_1: types.ModuleType,
+                    program_2: types.ModuleType
+                  ) ->         Iterator[Tuple[int, Dict[str, Any]]]:
 
     """
-        This function runs a PyRat game, with no GUI, for a given seed and program, and returns the obtained stats.
+        This function runs NB_GAMES PyRat games, with no GUI, in parallel, and returns the obtained stats as soon as games are over.
         In:
-            * seed:      Random seed used to create the game.
-            * program_1: First program to use in that game.
-            * program_2: Second program to use in that game.
+            * program_1: First program to use in the games.
+            * program_2: Second program to use in the games.
         Out:
-            * stats: Statistics output at the end of the game.
+            * results: Iterator over pairs (seed, stats), where stats are the statistics output at the end of the game created with that seed.
     """
 
     # Map the functions to the character
@@ -87,13 +94,11 @@ def run_one_game ( seed:      int,
               "render_mode": "no_rendering",
               "preprocessing_time": PREPROCESSING_TIME,
               "turn_time": TURN_TIME,
-              "synchronous": True,
-              "random_seed": seed}
+              "synchronous": True}
         
-    # Start the game
-    game = PyRat(players, **config)
-    stats = game.start()
-    return stats
+    # Start the games, seeded from 0 to NB_GAMES - 1
+    results = run_games(players, config, range(NB_GAMES), workers=NB_WORKERS)
+    return results
     
 #####################################################################################################################################################
 ######################################################################## GO! ########################################################################
@@ -103,10 +108,9 @@ if __name__ == "__main__":
 
     # Run multiple games
     results = []
-    for seed in tqdm.tqdm(range(NB_GAMES), desc="Game", position=0, leave=False):
+    for seed, stats in tqdm.tqdm(run_all_games(program_1, program_2), total=NB_GAMES, desc="Game", position=0, leave=False):
         
         # Store score difference as result
-        stats = run_one_game(seed, program_1, program_2)
         results.append(int(stats["players"][program_1.__name__]["score"] - stats["players"][program_2.__name__]["score"]))
         
     # Show results briefly
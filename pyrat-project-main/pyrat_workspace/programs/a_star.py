@@ -22,7 +22,6 @@ from pyrat import *
 
 # External imports 
 import random, heapq
-from queue import PriorityQueue
 
 # Previously developed functions
 from tutorial import get_neighbors, get_weight
@@ -71,18 +70,22 @@ def a_star ( start: int,
              target: int,
              graph: Union[numpy.ndarray, Dict[int, Dict[int, int]]],
              heuristic: Callable[[int, int], float],
-             maze_width : int
+             maze_width : int,
+             tie_breaking: bool = False
            ) -> List[int] :
     """
         A* search algorithm.
         This function returns a path from the start location to the target location in a maze using a heuristic.
+        Scores are only stored for the vertices that are reached, so that a short search does not pay for the whole maze.
+        For a faster version on arrays, that can reuse its memory from one search to the next, see "AStarContext" in "pathfinding.py".
         
         In:
-            * start:      Starting vertex.
-            * target:     Target vertex.
-            * graph:      Graph representation of the maze.
-            * heuristic:  Heuristic function to estimate the distance from a vertex to the target.
-            * maze_width: Width of the maze in number of cells. 
+            * start:        Starting vertex.
+            * target:       Target vertex.
+            * graph:        Graph representation of the maze.
+            * heuristic:    Heuristic function to estimate the distance from a vertex to the target.
+            * maze_width:   Width of the maze in number of cells. 
+            * tie_breaking: If set, vertices with the same f_score are explored starting with the closest to the target according to the heuristic.
             
         Out:
             * List of vertices representing the path from start to target. If no path is found, returns an empty list.
@@ -90,28 +93,21 @@ def a_star ( start: int,
     # Nodes that have already been analyzed and have a path from the start to them
     closed_set = set() 
 
-    # Nodes that are yet to be analyzed but have a known path from the start node
-    open_set = set([start]) 
-
     # A dictionary that maps each node to its predecessor. This is used to reconstruct the path at the end.
     routing_table = {}
 
-    # For each node, the cost of getting from the start node to that node.
-    g_score = {node: float('inf') for node in graph.keys()}
-    g_score[start] = 0
-
-    # For each node, the total cost of getting from the start node to the goal by passing by that node.
-    f_score = {node: float('inf') for node in graph.keys()}
-    f_score[start] = heuristic(start, target, maze_width)
+    # For each node, the cost of getting from the start node to that node (infinite if not in the dictionary).
+    g_score = {start: 0}
 
-    # Nodes to be evaluated, with f_score as the priority
-    open_queue = PriorityQueue()
-    open_queue.put((f_score[start], start))
+    # Nodes to be evaluated, as a binary heap with f_score as the priority
+    # Entries are (f_score, vertex), or (f_score, heuristic, vertex) when breaking ties
+    h_score = heuristic(start, target, maze_width)
+    open_queue = [(h_score, h_score, start) if tie_breaking else (h_score, start)]
 
-    while not open_queue.empty():
+    while open_queue:
         
-        # Get the node in open_set having the lowest f_score value
-        _, current = open_queue.get()
+        # Get the node having the lowest f_score value
+        current = heapq.heappop(open_queue)[-1]
 
         # If the current node is already evaluated, skip it
         if current in closed_set:
@@ -121,7 +117,6 @@ def a_star ( start: int,
         if current == target:
             return _reconstruct_path(routing_table, start, target), g_score[current]
 
-        open_set.remove(current)
         closed_set.add(current)
 
         # Evaluate all neighbors of the current node
@@ -132,7 +127,7 @@ def a_star ( start: int,
 
             tentative_g_score = g_score[current] + get_weight(current, neighbor, graph)
 
-            if tentative_g_score < g_score[neighbor]:
+            if tentative_g_score < g_score.get(neighbor, float('inf')):
 
                 # Mise à jour de la table de routage pour indiquer que le chemin actuel vers 'neighbor' passe par le nœud 'current'.
                 routing_table[neighbor] = current
@@ -140,14 +135,9 @@ def a_star ( start: int,
                 # Mise à jour du coût du chemin le plus court connu pour se rendre de 'start' à 'neighbor'.
                 g_score[neighbor] = tentative_g_score
 
-                # Mise à jour de l'estimation du coût total pour se rendre du nœud de départ au nœud cible
-                f_score[neighbor] = g_score[neighbor] + heuristic(neighbor, target, maze_width)
-
-                # Ajout du nœud 'neighbor' à l'ensemble des nœuds à évaluer.
-                open_set.add(neighbor)
-
-                # Ajout du nœud 'neighbor' à la file de priorité avec son 'f_score' comme priorité.
-                open_queue.put((f_score[neighbor], neighbor))
+                # Ajout du nœud 'neighbor' à la file de priorité, avec l'estimation du coût total pour se rendre à la cible comme priorité.
+                h_score = heuristic(neighbor, target, maze_width)
+                heapq.heappush(open_queue, (tentative_g_score + h_score, h_score, neighbor) if tie_breaking else (tentative_g_score + h_score, neighbor))
     
     # If we reach here, there is no path from start to target
     return [], float('inf')
@@ -182,13 +172,12 @@ def _reconstruct_path ( routing_table ,
         # Update the current node to its predecessor in the path
         current = routing_table[current]
 
-        # Insert the current node at the beginning of the path
-        # This is because we're reconstructing the path from end to start
-        path.insert(0, current)
+        # Add the current node at the end of the path
+        # The path is built from end to start, and reversed once complete
+        path.append(current)
     
     # Return the reconstructed path
-    return path
-
+    return path[::-1]
 
 #####################################################################################################################################################
 ##################################################### EXECUTED ONCE AT THE BEGINNING OF THE GAME ####################################################
@@ -26,6 +26,7 @@ import random, heapq
 # Previously developed functions
 from tutorial import get_neighbors, locations_to_action
 from dijkstra import dijkstra, locations_to_actions, find_route, traversal
+from metagraph import Metagraph
 
 #####################################################################################################################################################
 ############################################################### CONSTANTS & VARIABLES ###############################################################
@@ -65,7 +66,8 @@ def give_score ( graph:          Union[numpy.ndarray, Dict[int, Dict[int, int]]]
 
 def greedy ( graph:          Union[numpy.ndarray, Dict[int, Dict[int, int]]],
              initial_vertex: int,
-             vertices:       List[int]
+             vertices:       List[int],
+             metagraph:      Union[None, Metagraph] = None
            ) ->              List[int]:
     """
         Greedy algorithm that goes to the score maximizer in a loop.
@@ -73,9 +75,14 @@ def greedy ( graph:          Union[numpy.ndarray, Dict[int, Dict[int, int]]],
             * graph:          Graph containing the vertices.
             * initial_vertex: Initial location of the player in the maze.
             * vertices:       Vertices to visit with the greedy heuristic.
+            * metagraph:      Complete graph of the initial vertex and the vertices to visit, built from the graph if not given.
         Out:
             * route: Route to follow to perform the path through all vertices.
     """
+    # Compute all distances and routing tables at once, from the initial vertex and all vertices to visit.
+    if metagraph is None:
+        metagraph = Metagraph(graph, list(dict.fromkeys([initial_vertex] + list(vertices))))
+
     # Initialize current_vertex to initial_vertex and set the list of unvisited vertices.
     current_vertex = initial_vertex
     unvisited = set(vertices)
@@ -86,21 +93,15 @@ def greedy ( graph:          Union[numpy.ndarray, Dict[int, Dict[int, int]]],
     # While there are still unvisited vertices, continue the greedy algorithm.
     while unvisited:
 
-        # Use give_score function to get scores for each unvisited vertex from current_vertex.
-        scores, routing_tables = give_score(graph, current_vertex, list(unvisited))    
-        
-        # Find the vertex with the min score
-        next_vertex = min(zip(unvisited, scores), key=lambda x: x[1])[0]
+        # Find the vertex with the min score, i.e., the closest one from current_vertex.
+        next_vertex = min(unvisited, key=lambda vertex: metagraph.distance(current_vertex, vertex))
         
-        # We use the routing_tables to retrieve the route from current_vertex to next_vertex
-        route_a2b = find_route(routing_tables, current_vertex, next_vertex)
+        # Append the route from current_vertex to next_vertex to the main route, but skip appending the current_vertex as it's already added.
+        route += metagraph.route(current_vertex, next_vertex)[1:]
 
         # Update current_vertex and remove next_vertex from the set of unvisited vertices.
-        current_vertex = route_a2b[-1]
+        current_vertex = next_vertex
         unvisited.remove(current_vertex)
-        
-        # Append the route_a2b to the main route, but skip appending the current_vertex as it's already added.
-        route += route_a2b[1:]
     
     # Return the complete route.
     return route
@@ -139,8 +140,12 @@ def preprocessing ( maze:             Union[numpy.ndarray, Dict[int, Dict[int, i
             * None.
     """
 
+    # The complete graph is kept, to re-plan if other players eat pieces of cheese
     source = player_locations[name]
-    route = greedy(maze, source, cheese)
+    memory.metagraph = Metagraph(maze, list(dict.fromkeys([source] + cheese)))
+    memory.location = source
+    memory.cheese = set(cheese)
+    route = greedy(maze, source, cheese, memory.metagraph)
     memory.actions = locations_to_actions(route, maze_width)
     
 #####################################################################################################################################################
@@ -180,7 +185,23 @@ def turn ( maze:             Union[numpy.ndarray, Dict[int, Dict[int, int]]],
             * action: One of the possible actions, as given in possible_actions.
     """
 
-    # [TODO] Write your turn code here and do not forget to return a possible action
+    # Pieces of cheese that disappeared are removed from the complete graph, without any traversal
+    # The vertex of the player is kept, even if it was a piece of cheese
+    eaten_cheese = memory.cheese - set(cheese)
+    memory.cheese = set(cheese)
+    for piece_of_cheese in eaten_cheese:
+        if piece_of_cheese != memory.location:
+            memory.metagraph.remove_vertex(piece_of_cheese)
+
+    # If a piece of cheese was eaten elsewhere, another player got it and we re-plan from our location
+    # Moving the player in the complete graph only needs a traversal from its new location
+    if any([piece_of_cheese != player_locations[name] for piece_of_cheese in eaten_cheese]):
+        memory.metagraph.replace_vertex(memory.location, player_locations[name])
+        memory.location = player_locations[name]
+        route = greedy(maze, memory.location, cheese, memory.metagraph)
+        memory.actions = locations_to_actions(route, maze_width)
+
+    # Follow the plan
     action = memory.actions.pop(0)
     return action
 
@@ -27,6 +27,7 @@ import random, heapq
 from tutorial import get_neighbors, locations_to_action
 from dijkstra import *
 from a_star import *
+from pathfinding import to_csr, nearest_targets
 
 #####################################################################################################################################################
 ############################################################### CONSTANTS & VARIABLES ###############################################################
@@ -44,41 +45,32 @@ def greedy ( graph: Union[numpy.ndarray, Dict[int, Dict[int, int]]],
              maze_width: int
            ) -> int :
     """
-    Determines the optimal vertex to target from a list of vertices based on A* search algorithm.
+    Determines the closest vertex from a list of vertices using a single Dijkstra search.
     
-    This function computes the shortest path from a given source to all the vertices provided 
-    in the list using A* search algorithm and a Manhattan distance heuristic. It returns the 
-    optimal path and the associated target vertex.
+    This function explores the maze from the given source by increasing distance, and stops 
+    as soon as one of the vertices provided in the list is reached. This is cheaper than 
+    computing a path to every vertex of the list. It returns the optimal path and the 
+    associated target vertex.
     
     In:
-        * graph : A representation of the maze in which the shortest path is to be found. 
+        * graph : A representation of the maze in which the shortest path is to be found (possibly converted with "to_csr"). 
         * source : The starting vertex from which the paths to the vertices are to be determined.
         * vertices : A list of target vertices to which the shortest path from the source is to be determined.
-        * maze_width : Width of the maze in number of cells. Used for the Manhattan distance heuristic.
+        * maze_width : Width of the maze in number of cells. Kept for compatibility with previous versions.
     
     Out:
         * route : The optimal path from the source to the best target vertex 
         * best_cheese : The optimal target vertex itself.
     """
 
-    # Initialisation des variables pour stocker la distance la plus courte et le fromage optimal
-    shortest_distance = float('inf')
+    # Initialisation des variables pour stocker le fromage optimal
     best_cheese = None
     route = None
 
-    # Pour chaque fromage dans la liste des vertices
-    for cheese in vertices:
-
-        # Calculer le chemin et la distance du point de départ au fromage actuel en utilisant l'algorithme A*
-        player_path, distance = a_star(source, cheese, graph, manhattan_distance, maze_width)
-        
-        # Si la distance calculée est plus courte que la meilleure distance trouvée jusqu'à présent
-        if distance < shortest_distance:
-
-            # Mettre à jour la meilleure distance, le meilleur fromage, et le chemin optimal
-            shortest_distance = distance
-            best_cheese = cheese
-            route = player_path
+    # Recherche du fromage le plus proche, en arrêtant l'exploration dès qu'un fromage est atteint
+    nearest = nearest_targets(source, vertices, graph, 1)
+    if len(nearest) > 0:
+        best_cheese, _, route = nearest[0]
 
     # Retourner le chemin optimal et le fromage optimal
     return route, best_cheese
@@ -119,7 +111,9 @@ def preprocessing ( maze:             Union[numpy.ndarray, Dict[int, Dict[int, i
 
     source = player_locations[name]
 
-    route, cheese_goal = greedy (maze, source, cheese, maze_width)
+    # The maze is converted once, to avoid doing it at each search
+    memory.graph = to_csr(maze)
+    route, cheese_goal = greedy (memory.graph, source, cheese, maze_width)
     
     memory.route = route
     memory.goal = cheese_goal
@@ -169,7 +163,7 @@ def turn ( maze:             Union[numpy.ndarray, Dict[int, Dict[int, int]]],
     
     else:
     
-        route_new, cheese_goal_new = greedy (maze, player_locations[name], cheese, maze_width)
+        route_new, cheese_goal_new = greedy (memory.graph, player_locations[name], cheese, maze_width)
         memory.route = route_new
         memory.goal = cheese_goal_new
         memory.actions = locations_to_actions(memory.route, maze_width)
@@ -27,6 +27,7 @@ import random, heapq
 from tutorial import get_neighbors, locations_to_action
 from dijkstra import *
 from a_star import *
+from pathfinding import to_csr, nearest_targets
 
 #####################################################################################################################################################
 ############################################################### CONSTANTS & VARIABLES ###############################################################
@@ -121,17 +122,18 @@ def greedy ( graph: Union[numpy.ndarray, Dict[int, Dict[int, int]]],
              lambda_coefficient: float = 0.5
            ) ->  int :
     """
-    Determines the optimal vertex to target from a list of vertices based on A* search algorithm.
+    Determines the optimal vertex to target from a list of vertices using a single Dijkstra search.
     
-    This function computes the shortest path from a given source to all the vertices provided 
-    in the list using A* search algorithm and a Manhattan distance heuristic. It returns the 
+    This function computes the shortest paths from a given source to all the vertices provided 
+    in the list at once, with a search that stops when the last of them is reached. Each vertex 
+    is then scored using its distance and the density of cheese around it. It returns the 
     optimal path and the associated target vertex.
     
     In:
-        * graph : A representation of the maze in which the shortest path is to be found. 
+        * graph : A representation of the maze in which the shortest path is to be found (possibly converted with "to_csr"). 
         * source : The starting vertex from which the paths to the vertices are to be determined.
         * vertices : A list of target vertices to which the shortest path from the source is to be determined.
-        * maze_width : Width of the maze in number of cells. Used for the Manhattan distance heuristic.
+        * maze_width : Width of the maze in number of cells. Used for the Manhattan distance in the density score.
         * lambda_coefficient : A weight parameter to balance the influence of cheese density in the score calculation.
     
     Out:
@@ -144,14 +146,17 @@ def greedy ( graph: Union[numpy.ndarray, Dict[int, Dict[int, int]]],
     best_cheese = None
     route = None
 
+    # Compute the shortest paths from the source to all cheeses with a single search
+    paths = {cheese: (distance, path) for cheese, distance, path in nearest_targets(source, vertices, graph)}
+
     # Iterate over each cheese in the list of vertices
     for cheese in vertices:
         
         # Compute the density score of the cheese, representing its proximity to other cheeses
         density = cheese_density(graph, cheese, vertices, maze_width, D=5)
         
-        # Calculate the shortest path from the source to the current cheese using A* algorithm
-        player_path, distance_to_cheese = a_star(source, cheese, graph, manhattan_distance, maze_width)
+        # Get the shortest path from the source to the current cheese (unreachable cheeses are infinitely far)
+        distance_to_cheese, player_path = paths.get(cheese, (float('inf'), []))
 
         # Combine the calculated distance and density score into a single evaluation score
         # A lower score is better, indicating a closer and denser cheese
@@ -202,7 +207,9 @@ def preprocessing ( maze:             Union[numpy.ndarray, Dict[int, Dict[int, i
 
     source = player_locations[name]
 
-    route, cheese_goal = greedy (maze, source, cheese, maze_width)
+    # The maze is converted once, to avoid doing it at each search
+    memory.graph = to_csr(maze)
+    route, cheese_goal = greedy (memory.graph, source, cheese, maze_width)
     
     memory.route = route
     memory.goal = cheese_goal
@@ -252,7 +259,7 @@ def turn ( maze:             Union[numpy.ndarray, Dict[int, Dict[int, int]]],
     
     else:
     
-        route_new, cheese_goal_new = greedy (maze, player_locations[name], cheese, maze_width)
+        route_new, cheese_goal_new = greedy (memory.graph, player_locations[name], cheese, maze_width)
         memory.route = route_new
         memory.goal = cheese_goal_new
         memory.actions = locations_to_actions(memory.route, maze_width)
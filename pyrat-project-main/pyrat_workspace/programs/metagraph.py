@@ -0,0 +1,276 @@
+#####################################################################################################################################################
+######################################################################## INFO #######################################################################
+#####################################################################################################################################################
+
+"""
+    This file contains a faster replacement for the "graph_to_metagraph" functions of "tsp_1.py", "tsp_2_bis.py", etc.
+    Instead of a Dijkstra traversal per vertex of interest, all traversals are done in a single call to SciPy.
+    Distances between vertices of interest are kept in a NumPy matrix, and routing tables are kept as arrays of parents.
+    Routes in the maze are only rebuilt when asked for, with "route" or "expand_route".
+    A Metagraph can be given directly to the solvers of "tsp_solvers.py".
+"""
+
+#####################################################################################################################################################
+###################################################################### IMPORTS ######################################################################
+#####################################################################################################################################################
+
+# Import PyRat
+from pyrat import *
+
+# External imports
+import numpy
+import scipy.sparse as sparse
+import scipy.sparse.csgraph as csgraph
+
+# Previously developed functions
+from pathfinding import to_csr
+
+#####################################################################################################################################################
+###################################################################### CLASSES ######################################################################
+#####################################################################################################################################################
+
+class Metagraph ():
+
+    """
+        Complete graph of some vertices of interest in a maze, with the lengths of the shortest paths between them.
+        Vertices of interest are indexed by their position in the list given to the constructor:
+            * distances[i, j] is the length of the shortest path from vertices[i] to vertices[j] (infinity if there is none).
+            * routing_tables[i, v] is the parent of v in the traversal from vertices[i] (negative if there is none).
+        During the game, vertices of interest can be removed (e.g., eaten pieces of cheese) without any traversal.
+        They can also be added or replaced (e.g., the new location of the player) with a single traversal from the new vertex.
+    """
+
+    #############################################################################################################################################
+    #                                                                CONSTRUCTOR                                                                #
+    #############################################################################################################################################
+
+    def __init__ ( self:     Self,
+                   graph:    Union[numpy.ndarray, Dict[int, Dict[int, int]], MazeCSR, Tuple[numpy.ndarray, numpy.ndarray, numpy.ndarray]],
+                   vertices: List[int]
+                 ) ->        Self:
+
+        """
+            This function is the constructor of the class.
+            In:
+                * self:     Reference to the current object.
+                * graph:    Graph containing the vertices of interest.
+                * vertices: Vertices to use in the complete graph (should be distinct).
+            Out:
+                * self: Reference to the current object.
+        """
+
+        # Inherit from parent class
+        super(Metagraph, self).__init__()
+
+        # Check arguments are correct
+        indptr, indices, weights = to_csr(graph)
+        nb_vertices = len(indptr) - 1
+        if len(set(vertices)) != len(vertices) or any([not 0 <= vertex < nb_vertices for vertex in vertices]):
+            raise Exception("Invalid vertices of interest", vertices)
+
+        # Store arguments
+        self.graph = sparse.csr_matrix((weights, indices, indptr), shape=(nb_vertices, nb_vertices))
+        self.vertices = list(vertices)
+        self.vertex_indices = {vertex: i for i, vertex in enumerate(self.vertices)}
+
+        # Traversals from all vertices of interest at once
+        # Distances to all vertices are kept, so that adding a vertex of interest only needs a traversal from it
+        self.maze_distances = numpy.zeros((0, nb_vertices))
+        self.routing_tables = numpy.zeros((0, nb_vertices), dtype=numpy.int32)
+        if len(self.vertices) > 0:
+            self.maze_distances, self.routing_tables = csgraph.dijkstra(self.graph, indices=self.vertices, return_predecessors=True)
+        self.distances = self.maze_distances[:, self.vertices]
+
+    #############################################################################################################################################
+    #                                                               PUBLIC METHODS                                                              #
+    #############################################################################################################################################
+
+    def distance ( self:     Self,
+                   vertex_1: int,
+                   vertex_2: int
+                 ) ->        float:
+
+        """
+            Returns the length of the shortest path between two vertices of interest.
+            In:
+                * self:     Reference to the current object.
+                * vertex_1: Vertex of interest from which the path starts.
+                * vertex_2: Vertex of interest where the path ends.
+            Out:
+                * distance: Length of the shortest path.
+        """
+
+        # Read the matrix
+        return self.distances[self.vertex_indices[vertex_1], self.vertex_indices[vertex_2]]
+
+    #############################################################################################################################################
+
+    def route ( self:     Self,
+                vertex_1: int,
+                vertex_2: int
+              ) ->        List[int]:
+
+        """
+            Returns the shortest path in the maze from a vertex of interest to any vertex.
+            In:
+                * self:     Reference to the current object.
+                * vertex_1: Vertex of interest from which the path starts.
+                * vertex_2: Vertex where the path ends.
+            Out:
+                * route: Sequence of locations from vertex_1 to vertex_2.
+        """
+
+        # Go back from the target until the source is found
+        routing_table = self.routing_tables[self.vertex_indices[vertex_1]]
+        route = [vertex_2]
+        while route[-1] != vertex_1:
+            if routing_table[route[-1]] < 0:
+                raise ValueError("No route found from source to target using the provided routing table.")
+            route.append(int(routing_table[route[-1]]))
+        return route[::-1]
+
+    #############################################################################################################################################
+
+    def expand_route ( self:                    Self,
+                       route_in_complete_graph: List[int]
+                     ) ->                       List[int]:
+
+        """
+            Returns the route in the maze corresponding to a route in the complete graph.
+            In:
+                * self:                    Reference to the current object.
+                * route_in_complete_graph: Sequence of vertices of interest.
+            Out:
+                * route: Sequence of locations in the maze going through all vertices of interest in order.
+        """
+
+        # Concatenate the shortest paths, without repeating the vertices of interest
+        route = route_in_complete_graph[:1]
+        for i in range(len(route_in_complete_graph) - 1):
+            route += self.route(route_in_complete_graph[i], route_in_complete_graph[i + 1])[1:]
+        return route
+
+    #############################################################################################################################################
+
+    def remove_vertex ( self:   Self,
+                        vertex: int
+                      ) ->      None:
+
+        """
+            Removes a vertex of interest from the complete graph.
+            Other vertices of interest keep their order, but the ones after the removed vertex have their index decreased by 1.
+            In:
+                * self:   Reference to the current object.
+                * vertex: Vertex of interest to remove.
+            Out:
+                * None.
+        """
+
+        # Remove the corresponding rows and column
+        index = self.vertex_indices[vertex]
+        self.maze_distances = numpy.delete(self.maze_distances, index, axis=0)
+        self.routing_tables = numpy.delete(self.routing_tables, index, axis=0)
+        self.distances = numpy.delete(numpy.delete(self.distances, index, axis=0), index, axis=1)
+        del self.vertices[index]
+        self.vertex_indices = {vertex: i for i, vertex in enumerate(self.vertices)}
+
+    #############################################################################################################################################
+
+    def add_vertex ( self:   Self,
+                     vertex: int
+                   ) ->      None:
+
+        """
+            Adds a vertex of interest at the end of the complete graph.
+            Only a traversal from the new vertex is needed, as distances to it are known from the traversals of the other vertices of interest.
+            In:
+                * self:   Reference to the current object.
+                * vertex: Vertex to add.
+            Out:
+                * None.
+        """
+
+        # Append a row and a column
+        maze_distances, routing_table = self._traversal(vertex)
+        self.maze_distances = numpy.vstack([self.maze_distances, maze_distances])
+        self.routing_tables = numpy.vstack([self.routing_tables, routing_table])
+        self.vertices.append(vertex)
+        self.vertex_indices[vertex] = len(self.vertices) - 1
+        self.distances = self.maze_distances[:, self.vertices]
+
+    #############################################################################################################################################
+
+    def replace_vertex ( self:       Self,
+                         vertex:     int,
+                         new_vertex: int
+                       ) ->          None:
+
+        """
+            Replaces a vertex of interest by another one, at the same index.
+            This is useful to follow the location of a player, which can stay the first vertex of interest, with a single traversal per move.
+            Note that if the player reaches a piece of cheese, the piece of cheese should be removed first, since vertices of interest are distinct.
+            In:
+                * self:       Reference to the current object.
+                * vertex:     Vertex of interest to replace.
+                * new_vertex: Vertex to put instead.
+            Out:
+                * None.
+        """
+
+        # Nothing to do if the vertex did not change
+        if new_vertex == vertex:
+            return
+
+        # Replace the corresponding row and column
+        index = self.vertex_indices[vertex]
+        self.maze_distances[index], self.routing_tables[index] = self._traversal(new_vertex)
+        self.vertices[index] = new_vertex
+        del self.vertex_indices[vertex]
+        self.vertex_indices[new_vertex] = index
+        self.distances = self.maze_distances[:, self.vertices]
+
+    #############################################################################################################################################
+
+    def as_dictionary ( self: Self
+                      ) ->    Dict[int, Dict[int, float]]:
+
+        """
+            Returns the complete graph in the format of "graph_to_metagraph", i.e., as a dictionary of dictionaries indexed by vertices of interest.
+            In:
+                * self: Reference to the current object.
+            Out:
+                * complete_graph: Complete graph of the vertices of interest.
+        """
+
+        # Copy the matrix
+        distances = self.distances.tolist()
+        return {vertex_1: {vertex_2: distances[i][j] for j, vertex_2 in enumerate(self.vertices) if j != i} for i, vertex_1 in enumerate(self.vertices)}
+
+    #############################################################################################################################################
+    #                                                              PRIVATE METHODS                                                              #
+    #############################################################################################################################################
+
+    def _traversal ( self:   Self,
+                     vertex: int
+                   ) ->      Tuple[numpy.ndarray, numpy.ndarray]:
+
+        """
+            Performs a Dijkstra traversal from a new vertex of interest.
+            In:
+                * self:   Reference to the current object.
+                * vertex: Vertex from which to start the traversal (should not already be a vertex of interest).
+            Out:
+                * maze_distances: Distances from the vertex to all vertices of the maze.
+                * routing_table:  Parent of each vertex in the traversal.
+        """
+
+        # Check arguments are correct
+        if vertex in self.vertex_indices or not 0 <= vertex < self.graph.shape[0]:
+            raise Exception("Invalid vertex of interest", vertex)
+
+        # Single traversal
+        maze_distances, routing_table = csgraph.dijkstra(self.graph, indices=vertex, return_predecessors=True)
+        return maze_distances, routing_table
+
+#####################################################################################################################################################
+#####################################################################################################################################################
@@ -0,0 +1,717 @@
+#####################################################################################################################################################
+######################################################################## INFO #######################################################################
+#####################################################################################################################################################
+
+"""
+    This file contains faster versions of the traversals developed in "bfs.py" and "dijkstra.py".
+    Graphs are first converted to arrays in compressed sparse row format (see the "csr" maze representation of PyRat).
+    Traversals then work on these arrays instead of calling "get_neighbors", and return NumPy arrays indexed by vertex:
+        * distances[v] is the length of the path found to v, or infinity if v was not reached.
+        * routing_table[v] is the parent of v in the traversal, or -1 for the sources and vertices not reached.
+    Functions "bfs" and "dijkstra" can replace those of "bfs.py" and "dijkstra.py", as long as routes are rebuilt with "find_route" from this file.
+    When a traversal is done at every turn, converting the maze once with "to_csr" during preprocessing saves more time.
+    Class "CheeseDistanceField" keeps the distances to the closest piece of cheese up to date during the game, instead of computing them again at each turn.
+    Class "AStarContext" is a faster version of the A* search of "a_star.py", for many searches on the same maze.
+"""
+
+#####################################################################################################################################################
+###################################################################### IMPORTS ######################################################################
+#####################################################################################################################################################
+
+# Import PyRat
+from pyrat import *
+
+# External imports
+import heapq
+import numpy
+
+#####################################################################################################################################################
+##################################################################### FUNCTIONS #####################################################################
+#####################################################################################################################################################
+
+def to_csr ( graph: Union[numpy.ndarray, Dict[int, Dict[int, int]], MazeCSR, Tuple[numpy.ndarray, numpy.ndarray, numpy.ndarray]]
+           ) ->     Tuple[numpy.ndarray, numpy.ndarray, numpy.ndarray]:
+
+    """
+        Function to convert a graph in any representation handled by PyRat to arrays in compressed sparse row format.
+        The neighbors of a vertex are kept in the order given by "get_neighbors", so that traversals explore vertices in the same order.
+        In:
+            * graph: Graph to convert (already converted graphs are returned as they are).
+        Out:
+            * indptr:  Neighbors of vertex v are indices[indptr[v]:indptr[v + 1]].
+            * indices: Neighbors of all vertices.
+            * weights: Weights of the corresponding edges.
+    """
+
+    # If "maze_representation" option is set to "dictionary"
+    if isinstance(graph, dict):
+        nb_vertices = max(graph) + 1 if len(graph) > 0 else 0
+        degrees = numpy.zeros(nb_vertices + 1, dtype=numpy.int64)
+        for vertex in graph:
+            degrees[vertex + 1] = len(graph[vertex])
+        indptr = numpy.cumsum(degrees)
+        indices = numpy.zeros(indptr[-1], dtype=numpy.int64)
+        weights = numpy.zeros(indptr[-1], dtype=numpy.int64)
+        for vertex in graph:
+            indices[indptr[vertex]:indptr[vertex + 1]] = list(graph[vertex].keys())
+            weights[indptr[vertex]:indptr[vertex + 1]] = list(graph[vertex].values())
+
+    # If "maze_representation" option is set to "matrix"
+    elif isinstance(graph, numpy.ndarray):
+        rows, indices = graph.nonzero()
+        indptr = numpy.zeros(graph.shape[0] + 1, dtype=numpy.int64)
+        indptr[1:] = numpy.cumsum(numpy.bincount(rows, minlength=graph.shape[0]))
+        weights = graph[rows, indices].astype(numpy.int64)
+
+    # If "maze_representation" option is set to "csr"
+    elif isinstance(graph, MazeCSR):
+        indptr, indices, weights = graph.indptr, graph.indices, graph.weights
+
+    # Graphs already converted
+    elif isinstance(graph, tuple) and len(graph) == 3:
+        indptr, indices, weights = graph
+
+    # Unhandled data type
+    else:
+        raise Exception("Unhandled graph type", type(graph))
+
+    # Done
+    return indptr, indices, weights
+
+#####################################################################################################################################################
+
+def multi_source_bfs ( sources: List[int],
+                       graph:   Union[numpy.ndarray, Dict[int, Dict[int, int]], MazeCSR, Tuple[numpy.ndarray, numpy.ndarray, numpy.ndarray]]
+                     ) ->       Tuple[numpy.ndarray, numpy.ndarray]:
+
+    """
+        A BFS from several sources at once, where each vertex is reached from the closest source in number of moves (weights are ignored).
+        All vertices at the same distance (the frontier) are processed at once using NumPy operations.
+        Vertices are discovered in the same order as with a FIFO, so results are the same as the BFS of "bfs.py".
+        In:
+            * sources: Vertices from which to start the traversal.
+            * graph:   Graph on which to perform the traversal.
+        Out:
+            * distances:     Array of the number of moves needed to reach each vertex from the closest source.
+            * routing_table: Array of the parent of each vertex, to reconstruct paths with "find_route".
+    """
+
+    # Check arguments
+    indptr, indices, _ = to_csr(graph)
+    nb_vertices = len(indptr) - 1
+    frontier = numpy.array(sources, dtype=numpy.int64)
+    if len(frontier) > 0 and (frontier.min() < 0 or frontier.max() >= nb_vertices):
+        raise Exception("Invalid source vertex", sources)
+
+    # Initialize the sources
+    distances = numpy.full(nb_vertices, numpy.inf)
+    routing_table = numpy.full(nb_vertices, -1, dtype=numpy.int64)
+    distances[frontier] = 0
+    distance = 0
+
+    # Explore frontier by frontier
+    while len(frontier) > 0:
+
+        # Neighbors of all vertices in the frontier, in the order a FIFO would consider them
+        starts = indptr[frontier]
+        counts = indptr[frontier + 1] - starts
+        positions = numpy.repeat(starts - numpy.cumsum(counts) + counts, counts) + numpy.arange(counts.sum())
+        neighbors = indices[positions]
+        parents = numpy.repeat(frontier, counts)
+
+        # Keep the first time each new vertex is seen
+        new_vertices = numpy.isinf(distances[neighbors])
+        neighbors, first_seen = numpy.unique(neighbors[new_vertices], return_index=True)
+        order = numpy.argsort(first_seen)
+        frontier = neighbors[order]
+        distance += 1
+        distances[frontier] = distance
+        routing_table[frontier] = parents[new_vertices][first_seen[order]]
+
+    # Done
+    return distances, routing_table
+
+#####################################################################################################################################################
+
+def bfs ( source: int,
+          graph:  Union[numpy.ndarray, Dict[int, Dict[int, int]], MazeCSR, Tuple[numpy.ndarray, numpy.ndarray, numpy.ndarray]]
+        ) ->      Tuple[numpy.ndarray, numpy.ndarray]:
+
+    """
+        A BFS from a single source, as in "bfs.py".
+        In:
+            * source: Vertex from which to start the traversal.
+            * graph:  Graph on which to perform the traversal.
+        Out:
+            * distances:     Array of the number of moves needed to reach each vertex.
+            * routing_table: Array of the parent of each vertex, to reconstruct paths with "find_route".
+    """
+
+    # Particular case of the multi-source version
+    distances, routing_table = multi_source_bfs([source], graph)
+    return distances, routing_table
+
+#####################################################################################################################################################
+
+def multi_source_dijkstra ( sources: List[int],
+                            graph:   Union[numpy.ndarray, Dict[int, Dict[int, int]], MazeCSR, Tuple[numpy.ndarray, numpy.ndarray, numpy.ndarray]]
+                          ) ->       Tuple[numpy.ndarray, numpy.ndarray]:
+
+    """
+        Dijkstra's algorithm from several sources at once, where each vertex is reached from the closest source.
+        The priority queue is a binary heap of (distance, vertex) pairs, and vertices are only integers.
+        Arrays are turned into lists first, as reading Python lists element by element is faster than reading NumPy arrays.
+        In:
+            * sources: Vertices from which to start the traversal.
+            * graph:   Graph on which to perform the traversal.
+        Out:
+            * distances:     Array of the lengths of the shortest paths from the closest source to each vertex.
+            * routing_table: Array of the parent of each vertex, to reconstruct paths with "find_route".
+    """
+
+    # Check arguments
+    indptr, indices, weights = to_csr(graph)
+    nb_vertices = len(indptr) - 1
+    if any([not 0 <= source < nb_vertices for source in sources]):
+        raise Exception("Invalid source vertex", sources)
+    indptr, indices, weights = indptr.tolist(), indices.tolist(), weights.tolist()
+
+    # Initialize the sources
+    distances = [float("inf")] * nb_vertices
+    routing_table = [-1] * nb_vertices
+    heap = []
+    for source in sources:
+        distances[source] = 0
+        heap.append((0, source))
+    heapq.heapify(heap)
+
+    # Explore vertices by increasing distance, ignoring outdated entries of the heap
+    while len(heap) > 0:
+        distance, vertex = heapq.heappop(heap)
+        if distance > distances[vertex]:
+            continue
+        for i in range(indptr[vertex], indptr[vertex + 1]):
+            neighbor = indices[i]
+            new_distance = distance + weights[i]
+            if new_distance < distances[neighbor]:
+                distances[neighbor] = new_distance
+                routing_table[neighbor] = vertex
+                heapq.heappush(heap, (new_distance, neighbor))
+
+    # Done
+    return numpy.array(distances), numpy.array(routing_table, dtype=numpy.int64)
+
+#####################################################################################################################################################
+
+def dijkstra ( source: int,
+               graph:  Union[numpy.ndarray, Dict[int, Dict[int, int]], MazeCSR, Tuple[numpy.ndarray, numpy.ndarray, numpy.ndarray]]
+             ) ->      Tuple[numpy.ndarray, numpy.ndarray]:
+
+    """
+        Dijkstra's algorithm from a single source, as in "dijkstra.py".
+        In:
+            * source: Vertex from which to start the traversal.
+            * graph:  Graph on which to perform the traversal.
+        Out:
+            * distances:     Array of the lengths of the shortest paths to each vertex.
+            * routing_table: Array of the parent of each vertex, to reconstruct paths with "find_route".
+    """
+
+    # Particular case of the multi-source version
+    distances, routing_table = multi_source_dijkstra([source], graph)
+    return distances, routing_table
+
+#####################################################################################################################################################
+
+def nearest_targets ( source:  int,
+                      targets: List[int],
+                      graph:   Union[numpy.ndarray, Dict[int, Dict[int, int]], MazeCSR, Tuple[numpy.ndarray, numpy.ndarray, numpy.ndarray]],
+                      k:       Union[None, int] = None
+                    ) ->       List[Tuple[int, float, List[int]]]:
+
+    """
+        Dijkstra's algorithm from a source, stopped as soon as the k closest targets are reached.
+        This replaces one search per target by a single search, that only explores the part of the maze closer than the k-th closest target.
+        Only explored vertices are stored, so that a search that stops early does not pay for the whole maze.
+        In:
+            * source:  Vertex from which to start the traversal.
+            * targets: Vertices to reach.
+            * graph:   Graph on which to perform the traversal.
+            * k:       Number of targets to reach (all reachable targets if None).
+        Out:
+            * nearest: List of (target, distance, route) for the reached targets, from the closest to the farthest.
+    """
+
+    # Check arguments
+    indptr, indices, weights = to_csr(graph)
+    if not 0 <= source < len(indptr) - 1:
+        raise Exception("Invalid source vertex", source)
+    indptr, indices, weights = indptr.tolist(), indices.tolist(), weights.tolist()
+    remaining_targets = set(targets)
+    k = len(remaining_targets) if k is None else min(k, len(remaining_targets))
+
+    # Explore vertices by increasing distance until enough targets are reached
+    distances = {source: 0}
+    routing_table = {source: None}
+    explored_vertices = set()
+    reached_targets = []
+    heap = [(0, source)]
+    while len(heap) > 0 and len(reached_targets) < k:
+        distance, vertex = heapq.heappop(heap)
+        if vertex in explored_vertices:
+            continue
+        explored_vertices.add(vertex)
+        if vertex in remaining_targets:
+            reached_targets.append(vertex)
+        for i in range(indptr[vertex], indptr[vertex + 1]):
+            neighbor = indices[i]
+            new_distance = distance + weights[i]
+            if new_distance < distances.get(neighbor, float("inf")):
+                distances[neighbor] = new_distance
+                routing_table[neighbor] = vertex
+                heapq.heappush(heap, (new_distance, neighbor))
+
+    # Build the routes
+    nearest = [(target, distances[target], find_route(routing_table, source, target)) for target in reached_targets]
+    return nearest
+
+#####################################################################################################################################################
+
+def find_route ( routing_table: Union[numpy.ndarray, Dict[int, Union[None, int]]],
+                 source:        int,
+                 target:        int
+               ) ->             List[int]:
+
+    """
+        Function to return a sequence of locations using a provided routing table.
+        It works with the arrays returned by the traversals of this file, as well as with dictionaries as in "bfs.py".
+        In:
+            * routing_table: Routing table as obtained by the traversal.
+            * source:        Vertex from which we start the route (should be one of the sources of the traversal).
+            * target:        Target to reach using the routing table.
+        Out:
+            * route: Sequence of locations to reach the target from the source, as performed in the traversal.
+    """
+
+    # Go back from the target until the source is found
+    route = [target]
+    while route[-1] != source:
+        parent = routing_table[route[-1]] if isinstance(routing_table, numpy.ndarray) or route[-1] in routing_table else None
+        if parent is None or parent < 0:
+            raise ValueError("No route found from source to target using the provided routing table.")
+        route.append(int(parent))
+    return route[::-1]
+
+#####################################################################################################################################################
+###################################################################### CLASSES ######################################################################
+#####################################################################################################################################################
+
+class CheeseDistanceField ():
+
+    """
+        Distance from every vertex to the closest remaining piece of cheese, kept up to date as pieces of cheese are eaten.
+        It is computed once with a Dijkstra search from all pieces of cheese, and then repaired when pieces of cheese disappear.
+        When a piece of cheese is eaten, only the vertices for which it was the closest one are explored again.
+        Edges are assumed to have the same weight in both directions, as in PyRat mazes.
+        Then, going to the closest piece of cheese only requires following "next_vertex" from the current location.
+    """
+
+    #############################################################################################################################################
+    #                                                                CONSTRUCTOR                                                                #
+    #############################################################################################################################################
+
+    def __init__ ( self:   Self,
+                   graph:  Union[numpy.ndarray, Dict[int, Dict[int, int]], MazeCSR, Tuple[numpy.ndarray, numpy.ndarray, numpy.ndarray]],
+                   cheese: List[int]
+                 ) ->      Self:
+
+        """
+            This function is the constructor of the class.
+            In:
+                * self:   Reference to the current object.
+                * graph:  Graph on which to compute distances.
+                * cheese: Locations of the pieces of cheese.
+            Out:
+                * self: Reference to the current object.
+        """
+
+        # Inherit from parent class
+        super(CheeseDistanceField, self).__init__()
+
+        # Graph as lists, as in "multi_source_dijkstra"
+        indptr, indices, weights = to_csr(graph)
+        self.indptr, self.indices, self.weights = indptr.tolist(), indices.tolist(), weights.tolist()
+        nb_vertices = len(self.indptr) - 1
+        if any([not 0 <= vertex < nb_vertices for vertex in cheese]):
+            raise Exception("Invalid cheese location", cheese)
+
+        # For each vertex, distance to the closest piece of cheese, next vertex towards it, and that piece of cheese
+        self.distances = [float("inf")] * nb_vertices
+        self.next_vertices = [-1] * nb_vertices
+        self.closest_cheese = [-1] * nb_vertices
+
+        # Vertices for which each piece of cheese is the closest one
+        self.regions = {}
+
+        # Dijkstra's algorithm from all pieces of cheese
+        heap = []
+        for vertex in set(cheese):
+            self.distances[vertex] = 0
+            self._set_closest_cheese(vertex, vertex)
+            heap.append((0, vertex))
+        heapq.heapify(heap)
+        self._propagate(heap)
+
+    #############################################################################################################################################
+    #                                                               PUBLIC METHODS                                                              #
+    #############################################################################################################################################
+
+    def distance ( self:   Self,
+                   vertex: int
+                 ) ->      float:
+
+        """
+            Returns the distance from a vertex to the closest remaining piece of cheese.
+            In:
+                * self:   Reference to the current object.
+                * vertex: Vertex to consider.
+            Out:
+                * distance: Length of the shortest path to the closest piece of cheese, or infinity if no piece of cheese can be reached.
+        """
+
+        # Stored
+        return self.distances[vertex]
+
+    #############################################################################################################################################
+
+    def next_vertex ( self:   Self,
+                      vertex: int
+                    ) ->      int:
+
+        """
+            Returns the neighbor of a vertex that leads to the closest remaining piece of cheese.
+            In:
+                * self:   Reference to the current object.
+                * vertex: Vertex to consider.
+            Out:
+                * next_vertex: Next vertex towards the closest piece of cheese, or -1 if the vertex has cheese or no piece of cheese can be reached.
+        """
+
+        # Stored
+        return self.next_vertices[vertex]
+
+    #############################################################################################################################################
+
+    def route ( self:   Self,
+                vertex: int
+              ) ->      List[int]:
+
+        """
+            Returns the route from a vertex to the closest remaining piece of cheese.
+            In:
+                * self:   Reference to the current object.
+                * vertex: Vertex from which to start the route.
+            Out:
+                * route: Sequence of locations from the vertex to the closest piece of cheese.
+        """
+
+        # Follow the next vertices until a piece of cheese is found
+        if self.closest_cheese[vertex] < 0:
+            raise ValueError("No piece of cheese can be reached from the given vertex.")
+        route = [vertex]
+        while self.next_vertices[route[-1]] >= 0:
+            route.append(self.next_vertices[route[-1]])
+        return route
+
+    #############################################################################################################################################
+
+    def update ( self:   Self,
+                 cheese: List[int]
+               ) ->      None:
+
+        """
+            Updates the distances with the current list of pieces of cheese.
+            Pieces of cheese that are not in the list anymore are removed, and new ones are added.
+            This can be called at every turn, and costs nothing if no piece of cheese was eaten.
+            In:
+                * self:   Reference to the current object.
+                * cheese: Locations of the remaining pieces of cheese.
+            Out:
+                * None.
+        """
+
+        # Compare with the known pieces of cheese
+        cheese = set(cheese)
+        for vertex in [vertex for vertex in self.regions if vertex not in cheese]:
+            self.remove_cheese(vertex)
+        for vertex in cheese:
+            if vertex not in self.regions:
+                self.add_cheese(vertex)
+
+    #############################################################################################################################################
+
+    def add_cheese ( self:   Self,
+                     vertex: int
+                   ) ->      None:
+
+        """
+            Adds a piece of cheese, and updates the distances of the vertices that are now closer to cheese.
+            In:
+                * self:   Reference to the current object.
+                * vertex: Location of the new piece of cheese.
+            Out:
+                * None.
+        """
+
+        # Distances can only decrease, so a search from the new piece of cheese is enough
+        if vertex in self.regions:
+            return
+        self.distances[vertex] = 0
+        self.next_vertices[vertex] = -1
+        self._set_closest_cheese(vertex, vertex)
+        self._propagate([(0, vertex)])
+
+    #############################################################################################################################################
+
+    def remove_cheese ( self:   Self,
+                        vertex: int
+                      ) ->      None:
+
+        """
+            Removes a piece of cheese, and repairs the distances of the vertices for which it was the closest one.
+            Other vertices are not affected, as their shortest path to their closest piece of cheese does not go through these vertices.
+            In:
+                * self:   Reference to the current object.
+                * vertex: Location of the eaten piece of cheese.
+            Out:
+                * None.
+        """
+
+        # Forget the distances in the region of the piece of cheese
+        if vertex not in self.regions:
+            raise Exception("No piece of cheese at given location", vertex)
+        region = self.regions.pop(vertex)
+        for region_vertex in region:
+            self.distances[region_vertex] = float("inf")
+            self.next_vertices[region_vertex] = -1
+            self.closest_cheese[region_vertex] = -1
+
+        # Vertices of the region are reached again from the vertices around it, that still have correct distances
+        heap = []
+        for region_vertex in region:
+            for i in range(self.indptr[region_vertex], self.indptr[region_vertex + 1]):
+                neighbor = self.indices[i]
+                if neighbor not in region and self.distances[neighbor] + self.weights[i] < self.distances[region_vertex]:
+                    self.distances[region_vertex] = self.distances[neighbor] + self.weights[i]
+                    self.next_vertices[region_vertex] = neighbor
+                    self._set_closest_cheese(region_vertex, self.closest_cheese[neighbor])
+            if self.closest_cheese[region_vertex] >= 0:
+                heap.append((self.distances[region_vertex], region_vertex))
+        heapq.heapify(heap)
+        self._propagate(heap)
+
+    #############################################################################################################################################
+    #                                                              PRIVATE METHODS                                                              #
+    #############################################################################################################################################
+
+    def _set_closest_cheese ( self:   Self,
+                              vertex: int,
+                              cheese: int
+                            ) ->      None:
+
+        """
+            Moves a vertex to the region of a piece of cheese.
+            In:
+                * self:   Reference to the current object.
+                * vertex: Vertex to move.
+                * cheese: Location of its new closest piece of cheese.
+            Out:
+                * None.
+        """
+
+        # Update the regions
+        previous_cheese = self.closest_cheese[vertex]
+        if previous_cheese >= 0 and previous_cheese in self.regions:
+            self.regions[previous_cheese].discard(vertex)
+        self.closest_cheese[vertex] = cheese
+        self.regions.setdefault(cheese, set()).add(vertex)
+
+    #############################################################################################################################################
+
+    def _propagate ( self: Self,
+                     heap: List[Tuple[float, int]]
+                   ) ->    None:
+
+        """
+            Dijkstra's algorithm from the vertices in the heap, that updates the vertices for which a shorter path to cheese is found.
+            In:
+                * self: Reference to the current object.
+                * heap: Binary heap of (distance, vertex) pairs to start from.
+            Out:
+                * None.
+        """
+
+        # Explore vertices by increasing distance, ignoring outdated entries of the heap
+        while len(heap) > 0:
+            distance, vertex = heapq.heappop(heap)
+            if distance > self.distances[vertex]:
+                continue
+            for i in range(self.indptr[vertex], self.indptr[vertex + 1]):
+                neighbor = self.indices[i]
+                new_distance = distance + self.weights[i]
+                if new_distance < self.distances[neighbor]:
+                    self.distances[neighbor] = new_distance
+                    self.next_vertices[neighbor] = vertex
+                    self._set_closest_cheese(neighbor, self.closest_cheese[vertex])
+                    heapq.heappush(heap, (new_distance, neighbor))
+
+#####################################################################################################################################################
+
+class AStarContext ():
+
+    """
+        A* search on a maze, that keeps its memory from one search to the next.
+        Scores and parents are stored in lists allocated once, as reading Python lists element by element is faster than reading NumPy arrays.
+        Instead of resetting them before each search, each search has a number, and entries written by previous searches are considered empty.
+        This makes repeated searches on the same maze (e.g., to all pieces of cheese at each turn) cost only the vertices they explore.
+    """
+
+    #############################################################################################################################################
+    #                                                                CONSTRUCTOR                                                                #
+    #############################################################################################################################################
+
+    def __init__ ( self:         Self,
+                   graph:        Union[numpy.ndarray, Dict[int, Dict[int, int]], MazeCSR, Tuple[numpy.ndarray, numpy.ndarray, numpy.ndarray]],
+                   maze_width:   int,
+                   heuristic:    Union[None, Callable[[int, int], float]] = None,
+                   tie_breaking: bool = False
+                 ) ->            Self:
+
+        """
+            This function is the constructor of the class.
+            In:
+                * self:         Reference to the current object.
+                * graph:        Graph on which to perform the searches.
+                * maze_width:   Width of the maze in number of cells.
+                * heuristic:    Function estimating the distance from a vertex to the target, or None for the Manhattan distance.
+                * tie_breaking: If set, vertices with the same estimated total distance are explored starting with the closest to the target.
+            Out:
+                * self: Reference to the current object.
+        """
+
+        # Inherit from parent class
+        super(AStarContext, self).__init__()
+
+        # Store arguments
+        indptr, indices, weights = to_csr(graph)
+        self.indptr, self.indices, self.weights = indptr.tolist(), indices.tolist(), weights.tolist()
+        self.maze_width = maze_width
+        self.heuristic = heuristic
+        self.tie_breaking = tie_breaking
+
+        # Memory of the searches, indexed by vertex
+        nb_vertices = len(self.indptr) - 1
+        self.g_scores = [float("inf")] * nb_vertices
+        self.routing_table = [-1] * nb_vertices
+        self.reached_in_search = [0] * nb_vertices
+        self.closed_in_search = [0] * nb_vertices
+        self.search_number = 0
+
+    #############################################################################################################################################
+    #                                                               PUBLIC METHODS                                                              #
+    #############################################################################################################################################
+
+    def search ( self:   Self,
+                 source: int,
+                 target: int
+               ) ->      Tuple[List[int], float]:
+
+        """
+            Finds a shortest path from a source to a target with the A* algorithm.
+            In:
+                * self:   Reference to the current object.
+                * source: Vertex from which to start the search.
+                * target: Vertex to reach.
+            Out:
+                * route:    Sequence of locations from the source to the target, or an empty list if the target cannot be reached.
+                * distance: Length of the route, or infinity if the target cannot be reached.
+        """
+
+        # Check arguments
+        nb_vertices = len(self.indptr) - 1
+        if not 0 <= source < nb_vertices or not 0 <= target < nb_vertices:
+            raise Exception("Invalid source or target vertex", source, target)
+
+        # Entries from previous searches become outdated
+        self.search_number += 1
+        search_number = self.search_number
+        indptr, indices, weights = self.indptr, self.indices, self.weights
+        g_scores, routing_table, reached_in_search, closed_in_search = self.g_scores, self.routing_table, self.reached_in_search, self.closed_in_search
+
+        # Heuristic is the Manhattan distance by default
+        maze_width, heuristic, tie_breaking = self.maze_width, self.heuristic, self.tie_breaking
+        target_row, target_col = divmod(target, maze_width)
+        def _manhattan_distance (vertex, target):
+            row, col = divmod(vertex, maze_width)
+            return abs(row - target_row) + abs(col - target_col)
+        if heuristic is None:
+            heuristic = _manhattan_distance
+
+        # Initialize the source
+        g_scores[source] = 0
+        routing_table[source] = -1
+        reached_in_search[source] = search_number
+        h_score = heuristic(source, target)
+        heap = [(h_score, h_score, source) if tie_breaking else (h_score, source)]
+
+        # Explore vertices by increasing estimated total distance
+        while len(heap) > 0:
+            vertex = heapq.heappop(heap)[-1]
+            if closed_in_search[vertex] == search_number:
+                continue
+            if vertex == target:
+                return self._find_route(source, target), g_scores[target]
+            closed_in_search[vertex] = search_number
+            g_score = g_scores[vertex]
+            for i in range(indptr[vertex], indptr[vertex + 1]):
+                neighbor = indices[i]
+                if closed_in_search[neighbor] == search_number:
+                    continue
+                new_g_score = g_score + weights[i]
+                if reached_in_search[neighbor] != search_number or new_g_score < g_scores[neighbor]:
+                    g_scores[neighbor] = new_g_score
+                    routing_table[neighbor] = vertex
+                    reached_in_search[neighbor] = search_number
+                    h_score = heuristic(neighbor, target)
+                    heapq.heappush(heap, (new_g_score + h_score, h_score, neighbor) if tie_breaking else (new_g_score + h_score, neighbor))
+
+        # Target not found
+        return [], float("inf")
+
+    #############################################################################################################################################
+    #                                                              PRIVATE METHODS                                                              #
+    #############################################################################################################################################
+
+    def _find_route ( self:   Self,
+                      source: int,
+                      target: int
+                    ) ->      List[int]:
+
+        """
+            Rebuilds the route found by the last search.
+            In:
+                * self:   Reference to the current object.
+                * source: Vertex from which the search started.
+                * target: Vertex reached by the search.
+            Out:
+                * route: Sequence of locations from the source to the target.
+        """
+
+        # Go back from the target until the source is found
+        route = [target]
+        while route[-1] != source:
+            route.append(self.routing_table[route[-1]])
+        return route[::-1]
+
+#####################################################################################################################################################
+#####################################################################################################################################################
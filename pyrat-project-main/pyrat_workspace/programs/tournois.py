@@ -396,6 +396,51 @@ def _reconstruct_path ( routing_table ,
     
     return path
 
+#####################################################################################################################################################
+
+def nearest_targets ( source:  int,
+                      targets: List[int],
+                      graph:   Union[numpy.ndarray, Dict[int, Dict[int, int]]],
+                      k:       Union[None, int] = None
+                    ) ->       List[Tuple[int, float, List[int]]]:
+
+    """
+        Dijkstra's algorithm from a source, stopped as soon as the k closest targets are reached.
+        This replaces one search per target by a single search.
+        In:
+            * source:  Vertex from which to start the traversal.
+            * targets: Vertices to reach.
+            * graph:   Graph on which to perform the traversal.
+            * k:       Number of targets to reach (all reachable targets if None).
+        Out:
+            * nearest: List of (target, distance, route) for the reached targets, from the closest to the farthest.
+    """
+
+    remaining_targets = set(targets)
+    k = len(remaining_targets) if k is None else min(k, len(remaining_targets))
+
+    # Explore vertices by increasing distance until enough targets are reached
+    distances = {source: 0}
+    routing_table = {source: None}
+    explored_vertices = set()
+    reached_targets = []
+    heap = [(0, source)]
+    while heap and len(reached_targets) < k:
+        distance, vertex = heapq.heappop(heap)
+        if vertex in explored_vertices:
+            continue
+        explored_vertices.add(vertex)
+        if vertex in remaining_targets:
+            reached_targets.append(vertex)
+        for neighbor in get_neighbors(vertex, graph):
+            new_distance = distance + get_weight(vertex, neighbor, graph)
+            if new_distance < distances.get(neighbor, float('inf')):
+                distances[neighbor] = new_distance
+                routing_table[neighbor] = vertex
+                heapq.heappush(heap, (new_distance, neighbor))
+
+    return [(target, distances[target], _reconstruct_path(routing_table, source, target)) for target in reached_targets]
+
 #####################################################################################################################################################
 ##################################################################### FUNCTIONS #####################################################################
 #####################################################################################################################################################
@@ -451,17 +496,17 @@ def tournois ( graph: Union[numpy.ndarray, Dict[int, Dict[int, int]]],
              lambda_coefficient: float = 0.5
            ) ->  int :
     """
-    Determines the optimal vertex to target from a list of vertices based on A* search algorithm.
+    Determines the optimal vertex to target from a list of vertices based on Dijkstra's algorithm.
     
-    This function computes the shortest path from a given source to all the vertices provided 
-    in the list using A* search algorithm and a Manhattan distance heuristic. It returns the 
-    optimal path and the associated target vertex.
+    This function computes the shortest paths from a given source to all the vertices provided 
+    in the list with a single search, and scores them using the density of cheese around them. 
+    It returns the optimal path and the associated target vertex.
     
     In:
         * graph : A representation of the maze in which the shortest path is to be found. 
         * source : The starting vertex from which the paths to the vertices are to be determined.
         * vertices : A list of target vertices to which the shortest path from the source is to be determined.
-        * maze_width : Width of the maze in number of cells. Used for the Manhattan distance heuristic.
+        * maze_width : Width of the maze in number of cells. Used for the Manhattan distance in the density score.
     
     Out:
         * route : The optimal path from the source to the best target vertex 
@@ -474,9 +519,12 @@ def tournois ( graph: Union[numpy.ndarray, Dict[int, Dict[int, int]]],
     best_cheese = None
     route = None
 
+    # Shortest paths to all cheeses, computed with a single search
+    paths = {cheese: (distance, path) for cheese, distance, path in nearest_targets(source, vertices, graph)}
+
     for cheese in vertices:
         density = cheese_density(graph, cheese, vertices, maze_width, 7)  
-        player_path, distance_to_cheese = a_star(source, cheese, graph, manhattan_distance, maze_width)
+        distance_to_cheese, player_path = paths.get(cheese, (float('inf'), []))
 
         # Combine distance and density into a single score
         score = distance_to_cheese + lambda_coefficient * (1 - density)
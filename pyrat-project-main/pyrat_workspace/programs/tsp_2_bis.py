@@ -26,12 +26,19 @@ import random
 # Previously developed functions
 from tutorial import get_neighbors, locations_to_action
 from dijkstra import dijkstra, locations_to_actions, find_route
+from metagraph import Metagraph
+import tsp_solvers
 
 #####################################################################################################################################################
 ############################################################### CONSTANTS & VARIABLES ###############################################################
 #####################################################################################################################################################
 
-# [TODO] It is good practice to keep all your constants and global variables in an easily identifiable section
+# Processor time given to the TSP solver when there are too many pieces of cheese to find the best route exactly
+# This is only used if the game does not tell how much time is left, or if no time is left (e.g., synchronous games with no preprocessing time)
+TSP_TIME_BUDGET = 2.0
+
+# Time kept when the game gives a deadline, to turn the best route found into actions before the end of preprocessing
+TSP_SAFETY_MARGIN = 0.2
 
 #####################################################################################################################################################
 ##################################################################### FUNCTIONS #####################################################################
@@ -253,7 +260,8 @@ def preprocessing ( maze:             Union[numpy.ndarray, Dict[int, Dict[int, i
                     player_locations: Dict[str, int],
                     cheese:           List[int],
                     possible_actions: List[str],
-                    memory:           threading.local
+                    memory:           threading.local,
+                    deadline:         Union[None, Deadline] = None
                   ) ->                None:
 
     """
@@ -271,6 +279,7 @@ def preprocessing ( maze:             Union[numpy.ndarray, Dict[int, Dict[int, i
             * cheese:           List of available pieces of cheese in the maze.
             * possible_actions: List of possible actions.
             * memory:           Local memory to share information between preprocessing, turn and postprocessing.
+            * deadline:         End of the preprocessing time, given by the game.
         Out:
             * None.
     """
@@ -278,12 +287,17 @@ def preprocessing ( maze:             Union[numpy.ndarray, Dict[int, Dict[int, i
     current_position = player_locations[name]
     vertices_of_interest = [current_position] + cheese
 
-    # Build the complete graph and routing tables using graph_to_metagraph function
-    complete_graph, routing_tables = graph_to_metagraph(maze, vertices_of_interest)
+    # Build the complete graph with a single batched search (graph_to_metagraph does one Dijkstra per vertex of interest)
+    complete_graph = Metagraph(maze, vertices_of_interest)
 
-    best_route, best_length = tsp(complete_graph, current_position)
+    # Exhaustive search with function tsp is too slow beyond about 10 pieces of cheese
+    # The solver is given all the time left, if known
+    # A deadline already passed means that no time was given, as in synchronous games with no preprocessing time, where the game waits for us anyway
+    remaining_time = None if deadline is None else deadline.remaining()
+    time_budget = TSP_TIME_BUDGET if remaining_time is None or remaining_time <= 0.0 else max(0.0, remaining_time - TSP_SAFETY_MARGIN)
+    best_route, best_length = tsp_solvers.tsp(complete_graph, current_position, time_budget)
 
-    route = expand_route(best_route, routing_tables, vertices_of_interest)
+    route = complete_graph.expand_route(best_route)
 
     memory.actions = locations_to_actions(route, maze_width)
 
@@ -0,0 +1,426 @@
+#####################################################################################################################################################
+######################################################################## INFO #######################################################################
+#####################################################################################################################################################
+
+"""
+    This file contains solvers for the TSP on the complete graphs built by "graph_to_metagraph" (see "tsp_2_bis.py" and "tsp_3_bis.py").
+    Complete graphs can be dictionaries indexed by locations in the maze, or matrices indexed by positions in the list of vertices of interest.
+    They can also be instances of "Metagraph" (see "metagraph.py"), in which case vertices are locations in the maze.
+    Routes are returned with the same vertices as the complete graph, start at the source, and do not come back to it.
+    Solvers are:
+        * "held_karp": Exact dynamic programming over subsets of vertices, in time and memory exponential in the number of vertices (up to about 20 pieces of cheese).
+        * "branch_and_bound": Depth-first search that skips routes that cannot be better than the best one found, and can be stopped after some time.
+        * "local_search": Improves routes with 2-opt and Or-opt moves until some time is spent, for any number of vertices.
+        * "tsp": Uses the exact solver when possible, and the time-limited one otherwise.
+"""
+
+#####################################################################################################################################################
+###################################################################### IMPORTS ######################################################################
+#####################################################################################################################################################
+
+# Import PyRat
+from pyrat import *
+
+# External imports
+import time
+import random
+import numpy
+
+# Previously developed functions
+from metagraph import Metagraph
+
+#####################################################################################################################################################
+############################################################### CONSTANTS & VARIABLES ###############################################################
+#####################################################################################################################################################
+
+# Largest number of vertices (besides the source) for which the exact solver is used
+# The memory used by "held_karp" is about 4 * 2^n * n bytes, i.e., 84MB for 20 vertices
+HELD_KARP_MAX_VERTICES = 20
+
+# Processor time in seconds given by default to "tsp" for larger complete graphs
+TSP_DEFAULT_TIME_BUDGET = 1.0
+
+#####################################################################################################################################################
+##################################################################### FUNCTIONS #####################################################################
+#####################################################################################################################################################
+
+def held_karp ( complete_graph: Union[numpy.ndarray, Dict[int, Dict[int, int]], Metagraph],
+                source:         int
+              ) ->              Tuple[List[int], float]:
+
+    """
+        Held-Karp algorithm, that finds the shortest route from the source visiting all vertices of the complete graph.
+        For each set of visited vertices (encoded as a bitmask) and each last vertex of the route, it computes the length of the shortest route.
+        All sets with the same number of vertices are computed at once using NumPy operations.
+        In:
+            * complete_graph: Complete graph of the vertices of interest.
+            * source:         Vertex from which to start the route.
+        Out:
+            * best_route:  Shortest route visiting all vertices.
+            * best_length: Length of the route.
+    """
+
+    # Distances between the vertices to visit, and from the source to them
+    distances, vertices = _to_distance_matrix(complete_graph)
+    source_index = vertices.index(source)
+    others = [i for i in range(len(vertices)) if i != source_index]
+    nb_others = len(others)
+    if nb_others == 0:
+        return [source], 0
+    if nb_others > 25:
+        raise Exception("Too many vertices for the exact solver", nb_others)
+    from_source = distances[source_index, others].astype(numpy.float32)
+    between_others = distances[numpy.ix_(others, others)].astype(numpy.float32)
+
+    # Lengths of the shortest routes for each last vertex and set of visited vertices (infinite when the last vertex is not in the set)
+    # Distances in PyRat are small integers, so float32 computations are exact
+    nb_sets = 1 << nb_others
+    lengths = numpy.full((nb_others, nb_sets), numpy.inf, dtype=numpy.float32)
+    lengths[numpy.arange(nb_others), 1 << numpy.arange(nb_others)] = from_source
+
+    # Sets grouped by number of vertices
+    all_sets = numpy.arange(nb_sets, dtype=numpy.int64)
+    set_sizes = numpy.zeros(nb_sets, dtype=numpy.int64)
+    for i in range(nb_others):
+        set_sizes += (all_sets >> i) & 1
+    sets_by_size = numpy.split(all_sets[numpy.argsort(set_sizes, kind="stable")], numpy.cumsum(numpy.bincount(set_sizes))[:-1])
+
+    # Extend shortest routes one vertex at a time, from all sets of the same size at once
+    # Minimums are computed over the first axis, which is faster than over the last one
+    for size in range(1, nb_others):
+        sets = sets_by_size[size]
+        set_lengths = lengths[:, sets]
+        for next_vertex in range(nb_others):
+            not_visited = (sets >> next_vertex) & 1 == 0
+            new_lengths = (set_lengths[:, not_visited] + between_others[:, next_vertex, None]).min(axis=0)
+            lengths[next_vertex, sets[not_visited] | (1 << next_vertex)] = new_lengths
+
+    # Go back from the best last vertex, finding each time the previous vertex that led to the optimum
+    visited = nb_sets - 1
+    last = int(numpy.argmin(lengths[:, visited]))
+    route_indices = [last]
+    while visited != 1 << last:
+        visited ^= 1 << last
+        last = int(numpy.argmin(lengths[:, visited] + between_others[:, last]))
+        route_indices.append(last)
+
+    # Convert back to vertices of the complete graph
+    best_route = [source] + [vertices[others[i]] for i in reversed(route_indices)]
+    best_length = _route_length(complete_graph, best_route)
+    return best_route, best_length
+
+#####################################################################################################################################################
+
+def branch_and_bound ( complete_graph: Union[numpy.ndarray, Dict[int, Dict[int, int]], Metagraph],
+                       source:         int,
+                       time_budget:    Union[None, float] = None
+                     ) ->              Tuple[List[int], float]:
+
+    """
+        Depth-first search over routes, that skips the routes that cannot be shorter than the best route found so far.
+        A route is skipped when its length, plus the shortest edge leading to each vertex not visited yet, is not shorter than the best one.
+        Neighbors are explored from the closest to the farthest, starting from the route found by always going to the closest vertex.
+        If a time budget is given, the search stops after that much processor time and returns the best route found.
+        In:
+            * complete_graph: Complete graph of the vertices of interest.
+            * source:         Vertex from which to start the route.
+            * time_budget:    Processor time in seconds after which to stop searching (no limit if None).
+        Out:
+            * best_route:  Shortest route found.
+            * best_length: Length of the route.
+    """
+
+    # Distances as lists, with neighbors sorted by distance
+    distances, vertices = _to_distance_matrix(complete_graph)
+    nb_vertices = len(vertices)
+    source_index = vertices.index(source)
+    sorted_neighbors = numpy.argsort(distances + numpy.diag(numpy.full(nb_vertices, numpy.inf)), axis=1, kind="stable")[:, :-1].tolist()
+    shortest_edge_to = numpy.min(distances + numpy.diag(numpy.full(nb_vertices, numpy.inf)), axis=0).tolist() if nb_vertices > 1 else [0]
+    distances = distances.tolist()
+    deadline = time.process_time() + time_budget if time_budget is not None else float("inf")
+
+    # Initial solution going to the closest vertex each time
+    best_route = _nearest_neighbor_route(distances, source_index)
+    best_length = _route_length(distances, best_route)
+
+    # Recursive search, stopped when the deadline is reached
+    route = [source_index]
+    visited = [False] * nb_vertices
+    visited[source_index] = True
+    nb_explored = 0
+    def _search (length, remaining_bound):
+        nonlocal best_route, best_length, nb_explored
+        nb_explored += 1
+        if nb_explored % 1000 == 0 and time.process_time() > deadline:
+            return True
+        if len(route) == nb_vertices:
+            if length < best_length:
+                best_route, best_length = route[:], length
+            return False
+        for neighbor in sorted_neighbors[route[-1]]:
+            if not visited[neighbor]:
+                new_length = length + distances[route[-1]][neighbor]
+                new_remaining_bound = remaining_bound - shortest_edge_to[neighbor]
+                if new_length + new_remaining_bound < best_length:
+                    visited[neighbor] = True
+                    route.append(neighbor)
+                    timeout = _search(new_length, new_remaining_bound)
+                    route.pop()
+                    visited[neighbor] = False
+                    if timeout:
+                        return True
+        return False
+    _search(0, sum(shortest_edge_to) - shortest_edge_to[source_index])
+
+    # Convert back to vertices of the complete graph
+    best_route = [vertices[i] for i in best_route]
+    best_length = _route_length(complete_graph, best_route)
+    return best_route, best_length
+
+#####################################################################################################################################################
+
+def local_search ( complete_graph: Union[numpy.ndarray, Dict[int, Dict[int, int]], Metagraph],
+                   source:         int,
+                   time_budget:    float,
+                   seed:           Union[None, int] = None
+                 ) ->              Tuple[List[int], float]:
+
+    """
+        Anytime heuristic, that improves routes until the time budget is spent, and returns the best route found.
+        It starts from the route found by always going to the closest vertex, and improves it with the following moves until none applies:
+            * 2-opt: Reverses a part of the route.
+            * Or-opt: Moves 1 to 3 consecutive vertices elsewhere in the route, possibly reversed.
+        Then, it repeatedly perturbs the best route found (by swapping two parts of it) and improves it again, to escape local optima.
+        Distances are assumed to be the same in both directions, as in PyRat mazes.
+        In:
+            * complete_graph: Complete graph of the vertices of interest.
+            * source:         Vertex from which to start the route.
+            * time_budget:    Processor time in seconds after which to stop searching.
+            * seed:           Seed of the random generator used for perturbations.
+        Out:
+            * best_route:  Shortest route found.
+            * best_length: Length of the route.
+    """
+
+    # Distances as lists
+    distances, vertices = _to_distance_matrix(complete_graph)
+    source_index = vertices.index(source)
+    distances = distances.tolist()
+    deadline = time.process_time() + time_budget
+    random_generator = random.Random(seed)
+
+    # Local optimum from the route going to the closest vertex each time
+    best_route = _improve_route(distances, _nearest_neighbor_route(distances, source_index), deadline)
+    best_length = _route_length(distances, best_route)
+
+    # Perturb and improve until the deadline (perturbations need at least 4 vertices after the source)
+    while len(best_route) >= 5 and time.process_time() < deadline:
+        route = _improve_route(distances, _perturb_route(best_route, random_generator), deadline)
+        length = _route_length(distances, route)
+        if length < best_length:
+            best_route, best_length = route, length
+
+    # Convert back to vertices of the complete graph
+    best_route = [vertices[i] for i in best_route]
+    best_length = _route_length(complete_graph, best_route)
+    return best_route, best_length
+
+#####################################################################################################################################################
+
+def tsp ( complete_graph: Union[numpy.ndarray, Dict[int, Dict[int, int]], Metagraph],
+          source:         int,
+          time_budget:    Union[None, float] = TSP_DEFAULT_TIME_BUDGET,
+          exact:          bool = False
+        ) ->              Tuple[List[int], float]:
+
+    """
+        Solves the TSP exactly with "held_karp" for small complete graphs.
+        Otherwise, the best route found by "local_search" within the time budget is returned.
+        If "exact" is set, "branch_and_bound" is used instead, which finds the best route if there is no time budget, but can be very long.
+        In:
+            * complete_graph: Complete graph of the vertices of interest.
+            * source:         Vertex from which to start the route.
+            * time_budget:    Processor time in seconds given to the solver for large complete graphs (no limit if None, only allowed if "exact" is set).
+            * exact:          Indicates if "branch_and_bound" should be used for large complete graphs.
+        Out:
+            * best_route:  Shortest route found.
+            * best_length: Length of the route.
+    """
+
+    # Choose the solver depending on the number of vertices
+    _, vertices = _to_distance_matrix(complete_graph)
+    if len(vertices) - 1 <= HELD_KARP_MAX_VERTICES:
+        return held_karp(complete_graph, source)
+    if exact:
+        return branch_and_bound(complete_graph, source, time_budget)
+    if time_budget is None:
+        raise Exception("A time budget is needed to solve the TSP on large complete graphs, unless an exact solution is requested")
+    return local_search(complete_graph, source, time_budget)
+
+#####################################################################################################################################################
+
+def _nearest_neighbor_route ( distances:    List[List[float]],
+                              source_index: int
+                            ) ->            List[int]:
+
+    """
+        Builds a route by always going to the closest vertex not visited yet.
+        In:
+            * distances:    Matrix of distances between vertices.
+            * source_index: Index of the vertex from which to start the route.
+        Out:
+            * route: Indices of the vertices in the order they are visited.
+    """
+
+    # Go to the closest remaining vertex each time
+    route = [source_index]
+    remaining = set(range(len(distances))) - {source_index}
+    while len(remaining) > 0:
+        route.append(min(remaining, key=lambda vertex: (distances[route[-1]][vertex], vertex)))
+        remaining.remove(route[-1])
+    return route
+
+#####################################################################################################################################################
+
+def _improve_route ( distances: List[List[float]],
+                     route:     List[int],
+                     deadline:  float
+                   ) ->         List[int]:
+
+    """
+        Applies 2-opt and Or-opt moves that shorten the route, until no move applies or the deadline is reached.
+        The first vertex of the route is never moved, and the route does not come back to it.
+        In:
+            * distances: Matrix of distances between vertices.
+            * route:     Route to improve.
+            * deadline:  Processor time after which to stop.
+        Out:
+            * route: Improved route.
+    """
+
+    # Alternate between both types of moves while they improve the route
+    route = list(route)
+    improved = True
+    while improved and time.process_time() < deadline:
+        improved = False
+
+        # 2-opt: reverse route[i:j + 1] if it makes the route shorter
+        for i in range(1, len(route) - 1):
+            for j in range(i + 1, len(route)):
+                delta = distances[route[i - 1]][route[j]] - distances[route[i - 1]][route[i]]
+                if j + 1 < len(route):
+                    delta += distances[route[i]][route[j + 1]] - distances[route[j]][route[j + 1]]
+                if delta < 0:
+                    route[i:j + 1] = route[i:j + 1][::-1]
+                    improved = True
+
+        # Or-opt: move segment route[i:i + size] after another vertex, in the same or reverse order
+        for size in range(1, 4):
+            i = 1
+            while i + size <= len(route):
+                segment = route[i:i + size]
+                rest = route[:i] + route[i + size:]
+                removal_gain = distances[rest[i - 1]][segment[0]]
+                if i < len(rest):
+                    removal_gain += distances[segment[-1]][rest[i]] - distances[rest[i - 1]][rest[i]]
+                best_delta, best_insertion = 0, None
+                for position in range(len(rest)):
+                    if position == i - 1:
+                        continue
+                    for oriented_segment in [segment, segment[::-1]]:
+                        delta = distances[rest[position]][oriented_segment[0]] - removal_gain
+                        if position + 1 < len(rest):
+                            delta += distances[oriented_segment[-1]][rest[position + 1]] - distances[rest[position]][rest[position + 1]]
+                        if delta < best_delta:
+                            best_delta, best_insertion = delta, (position, oriented_segment)
+                if best_insertion is not None:
+                    position, oriented_segment = best_insertion
+                    route = rest[:position + 1] + oriented_segment + rest[position + 1:]
+                    improved = True
+                i += 1
+
+    # Done
+    return route
+
+#####################################################################################################################################################
+
+def _perturb_route ( route:            List[int],
+                     random_generator: random.Random
+                   ) ->                List[int]:
+
+    """
+        Perturbs a route by swapping two consecutive parts of it, chosen at random (double-bridge move).
+        The first vertex of the route stays in place.
+        In:
+            * route:            Route to perturb, with at least 5 vertices.
+            * random_generator: Random generator to choose the parts.
+        Out:
+            * perturbed_route: New route.
+    """
+
+    # Cut after the source and swap the two middle parts
+    cut_1, cut_2, cut_3 = sorted(random_generator.sample(range(1, len(route)), 3))
+    return route[:cut_1] + route[cut_2:cut_3] + route[cut_1:cut_2] + route[cut_3:]
+
+#####################################################################################################################################################
+
+def _to_distance_matrix ( complete_graph: Union[numpy.ndarray, Dict[int, Dict[int, int]], Metagraph]
+                        ) ->              Tuple[numpy.ndarray, List[int]]:
+
+    """
+        Converts a complete graph to a matrix of distances.
+        In:
+            * complete_graph: Complete graph of the vertices of interest.
+        Out:
+            * distances: Matrix of distances, where row and column i correspond to vertices[i].
+            * vertices:  Vertices of the complete graph.
+    """
+
+    # If the complete graph is a matrix
+    if isinstance(complete_graph, numpy.ndarray):
+        vertices = list(range(complete_graph.shape[0]))
+        distances = complete_graph.astype(numpy.float64)
+
+    # If the complete graph is a Metagraph
+    elif isinstance(complete_graph, Metagraph):
+        vertices = complete_graph.vertices
+        distances = complete_graph.distances
+
+    # If the complete graph is a dictionary
+    elif isinstance(complete_graph, dict):
+        vertices = list(complete_graph.keys())
+        distances = numpy.zeros((len(vertices), len(vertices)))
+        for i, vertex_1 in enumerate(vertices):
+            for j, vertex_2 in enumerate(vertices):
+                if i != j:
+                    distances[i, j] = complete_graph[vertex_1][vertex_2]
+
+    # Unhandled data type
+    else:
+        raise Exception("Unhandled graph type", type(complete_graph))
+
+    # Done
+    return distances, vertices
+
+#####################################################################################################################################################
+
+def _route_length ( complete_graph: Union[numpy.ndarray, Dict[int, Dict[int, int]], Metagraph],
+                    route:          List[int]
+                  ) ->              float:
+
+    """
+        Computes the length of a route in the complete graph, with the distances as given in it.
+        In:
+            * complete_graph: Complete graph of the vertices of interest.
+            * route:          Sequence of vertices of the complete graph.
+        Out:
+            * length: Length of the route.
+    """
+
+    # Sum the distances along the route
+    if isinstance(complete_graph, Metagraph):
+        return sum([complete_graph.distance(route[i], route[i + 1]) for i in range(len(route) - 1)])
+    return sum([complete_graph[route[i]][route[i + 1]] for i in range(len(route) - 1)])
+
+#####################################################################################################################################################
+#####################################################################################################################################################
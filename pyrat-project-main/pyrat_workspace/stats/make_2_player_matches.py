@@ -13,10 +13,10 @@
 
 # Import PyRat
 from pyrat import *
+from pyrat.batch import run_games
 
 # External imports
 import sys
-import time
 import matplotlib.pyplot as pyplot
 import scipy.stats
 import os
@@ -55,23 +55,29 @@ TURN_TIME = 0.0
 PREPROCESSING_TIME = 0.0
 SYNCHRONOUS = True
 
+#####################################################################################################################################################
+
+"""
+    Number of processes used to play games in parallel (None to use all available CPUs).
+"""
+
+NB_WORKERS = None
+
 #####################################################################################################################################################
 ##################################################################### FUNCTIONS #####################################################################
 #####################################################################################################################################################
 
-def run_one_game ( seed:      int,
-                   program_1: types.ModuleType,
-                   program_2: types.ModuleType
-                 ) ->         Dict[str, Any]:
+def run_all_games ( program_1: types.ModuleType,
+                    program_2: types.ModuleType
+                  ) ->         Iterator[Tuple[int, Dict[str, Any]]]:
 
     """
-        This function runs a PyRat game, with no GUI, for a given seed and program, and returns the obtained stats.
+        This function runs NB_GAMES PyRat games, with no GUI, in parallel, and returns the obtained stats as soon as games are over.
         In:
-            * seed:      Random seed used to create the game.
-            * program_1: First program to use in that game.
-            * program_2: Second program to use in that game.
+            * program_1: First program to use in the games.
+            * program_2: Second program to use in the games.
         Out:
-            * stats: Statistics output at the end of the game.
+            * results: Iterator over pairs (seed, stats), where stats are the statistics output at the end of the game created with that seed.
     """
 
     # Map the functions to the character
@@ -88,33 +94,11 @@ def run_one_game ( seed:      int,
               "render_mode": "no_rendering",
               "preprocessing_time": PREPROCESSING_TIME,
               "turn_time": TURN_TIME,
-              "synchronous": True,
-              "random_seed": seed}
+              "synchronous": True}
         
-    # Start the game
-    game = PyRat(players, **config)
-
-    program_1_times = []
-    program_2_times = []
-
-    game = PyRat(players, **config)
-
-    for turn in range(game.nb_turns):
-        start_time = time.time()
-        program_1.turn(...)
-        program_1_times.append(time.time() - start_time)
-
-        start_time = time.time()
-        program_2.turn(...)
-        program_2_times.append(time.time() - start_time)
-
-
-    stats = game.start()
-
-    stats["program_1_execution_time"] = sum(program_1_times)
-    stats["program_2_execution_time"] = sum(program_2_times)
-
-    return stats
+    # Start the games, seeded from 0 to NB_GAMES - 1
+    results = run_games(players, config, range(NB_GAMES), workers=NB_WORKERS)
+    return results
     
 #####################################################################################################################################################
 ######################################################################## GO! ########################################################################
@@ -122,18 +106,16 @@ def run_one_game ( seed:      int,
 
 if __name__ == "__main__":
 
-    program_1_total_time = []
-    program_2_total_time = []
-
     # Run multiple games
     results = []
-    for seed in tqdm.tqdm(range(NB_GAMES), desc="Game", position=0, leave=False):
+    program_1_total_time = []
+    program_2_total_time = []
+    for seed, stats in tqdm.tqdm(run_all_games(program_1, program_2), total=NB_GAMES, desc="Game", position=0, leave=False):
         
         # Store score difference as result
-        stats = run_one_game(seed, program_1, program_2)
         results.append(int(stats["players"][program_1.__name__]["score"] - stats["players"][program_2.__name__]["score"]))
-        program_1_total_time.append(stats["program_1_execution_time"])
-        program_2_total_time.append(stats["program_2_execution_time"])
+        program_1_total_time.append(sum(stats["players"][program_1.__name__]["turn_durations"]))
+        program_2_total_time.append(sum(stats["players"][program_2.__name__]["turn_durations"]))
         
     # Show results briefly
     print("#" * 20)
@@ -145,6 +127,8 @@ if __name__ == "__main__":
     print(program_1.__name__, "(rat)   <-  ", len(rat_victories), "  -  ", nb_draws, "  -  ", len(python_victories), "  ->  ", program_2.__name__, "(python)")
     print("Average score difference when %s wins:" % program_1.__name__, numpy.mean(rat_victories) if len(rat_victories) > 0 else "n/a")
     print("Average score difference when %s wins:" % program_2.__name__, numpy.mean(numpy.abs(python_victories))if len(python_victories) > 0 else "n/a")
+    print("Average time spent in turns per game by %s:" % program_1.__name__, numpy.mean(program_1_total_time), "seconds")
+    print("Average time spent in turns per game by %s:" % program_2.__name__, numpy.mean(program_2_total_time), "seconds")
 
     # More formal statistics to check if the mean of the distribution is significantly different from 0
     print("#" * 21)
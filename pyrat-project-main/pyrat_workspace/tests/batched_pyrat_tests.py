@@ -0,0 +1,86 @@
+#####################################################################################################################################################
+######################################################################## INFO #######################################################################
+#####################################################################################################################################################
+
+"""
+    This program contains all the unit tests for the class "BatchedPyRat" of PyRat, that simulates many games together.
+    Games are played with random actions on small random mazes, and compared with the same games updated by PyRat.
+"""
+
+#####################################################################################################################################################
+###################################################################### IMPORTS ######################################################################
+#####################################################################################################################################################
+
+# Import PyRat
+from pyrat import *
+
+# External imports
+import unittest
+import numpy
+
+#####################################################################################################################################################
+############################################################### UNIT TESTS DEFINITION ###############################################################
+#####################################################################################################################################################
+
+class TestsBatchedPyRat (unittest.TestCase):
+
+    """
+        Here we choose to use the unittest module to perform unit tests.
+        This module is very simple to use and allows to easily check if the code is working as expected.
+    """
+
+    #############################################################################################################################################
+    #                                                               PUBLIC METHODS                                                              #
+    #############################################################################################################################################
+
+    def test_same_as_pyrat ( self: Self
+                           ) ->    None:
+
+        """
+            This function tests that "step" updates all games exactly as "PyRat._update_game_state" would.
+            Locations, mud, cheese, scores and end of the games are compared after each turn, with various numbers of players and teams.
+            In:
+                * self: Reference to the current object.
+            Out:
+                * None.
+        """
+
+        # Configurations with players sharing cells, mud and teams of several players
+        configurations = [([{"name": "a", "team": "1"}, {"name": "b", "team": "2", "location": "same"}], 30, 400, {"maze_width": 7, "maze_height": 5, "nb_cheese": 9, "mud_percentage": 40}),
+                          ([{"name": "a", "team": "1"}, {"name": "b", "team": "2", "location": "random"}, {"name": "c", "team": "2", "location": "random"}, {"name": "d", "team": "3", "location": "same"}], 30, 600, {"maze_width": 9, "maze_height": 7, "nb_cheese": 15, "mud_percentage": 30}),
+                          ([{"name": "a"}, {"name": "b", "location": "same"}], 20, 800, {"maze_width": 5, "maze_height": 5, "nb_cheese": 5})]
+
+        # Play the same random actions in both simulations
+        for players, nb_games, nb_turns, config in configurations:
+            games = [PyRat([{"turn_function": None, **player} for player in players], random_seed=seed, render_mode="no_rendering", **config) for seed in range(nb_games)]
+            batch = BatchedPyRat(games)
+            random_generator = numpy.random.default_rng(0)
+            done = [False] * nb_games
+            for turn in range(nb_turns):
+                actions = random_generator.integers(0, len(BatchedPyRat.POSSIBLE_ACTIONS), size=(nb_games, len(players)))
+                batch.step(actions)
+                for i, game in enumerate(games):
+                    if done[i]:
+                        continue
+                    done[i] = game._update_game_state({player: "nothing" if game._is_in_mud(player) else BatchedPyRat.POSSIBLE_ACTIONS[actions[i, j]] for j, player in enumerate(batch.player_names)})
+                    self.assertEqual([game.player_locations[player] for player in batch.player_names], batch.player_locations[i].tolist())
+                    self.assertEqual([-1 if game.player_muds[player]["target"] is None else game.player_muds[player]["target"] for player in batch.player_names], batch.mud_targets[i].tolist())
+                    self.assertEqual([game.player_muds[player]["count"] for player in batch.player_names], batch.mud_counts[i].tolist())
+                    self.assertEqual(sorted(game.cheese), numpy.flatnonzero(batch.cheese[i]).tolist())
+                    self.assertEqual([game.player_scores[player] for player in batch.player_names], batch.player_scores[i].tolist())
+                    self.assertEqual(done[i], batch.done[i])
+
+            # Most games should be over, so that the end of games is checked too
+            self.assertGreater(sum(done), nb_games // 2)
+
+#####################################################################################################################################################
+######################################################################## GO! ########################################################################
+#####################################################################################################################################################
+
+if __name__ == "__main__":
+
+    # Run all unit tests
+    unittest.main(verbosity=2)
+
+#####################################################################################################################################################
+#####################################################################################################################################################
@@ -0,0 +1,154 @@
+#####################################################################################################################################################
+######################################################################## INFO #######################################################################
+#####################################################################################################################################################
+
+"""
+    This program contains all the unit tests for the class "Env" of PyRat, that plays a game step by step.
+    Games are played with two greedy players from the program "greedy_3.py", on small random mazes.
+"""
+
+#####################################################################################################################################################
+###################################################################### IMPORTS ######################################################################
+#####################################################################################################################################################
+
+# Import PyRat
+from pyrat import *
+
+# External imports
+import unittest
+import random
+import types
+import sys
+import os
+
+# Previously developed functions
+sys.path.append(os.path.join(os.path.dirname(os.path.realpath(__file__)), "..", "programs"))
+import greedy_3
+
+#####################################################################################################################################################
+############################################################### UNIT TESTS DEFINITION ###############################################################
+#####################################################################################################################################################
+
+class TestsEnv (unittest.TestCase):
+
+    """
+        Here we choose to use the unittest module to perform unit tests.
+        This module is very simple to use and allows to easily check if the code is working as expected.
+    """
+
+    #############################################################################################################################################
+    #                                                                CONSTRUCTOR                                                                #
+    #############################################################################################################################################
+
+    def __init__ ( self:     Self,
+                   *args:    Any,
+                   **kwargs: Any,
+                 ) ->        Self:
+
+        """
+            This function is the constructor of the class.
+            In:
+                * self:   Reference to the current object.
+                * args:   Arguments of the parent constructor.
+                * kwargs: Keyword arguments of the parent constructor.
+            Out:
+                * self: Reference to the current object.
+        """
+
+        # Inherit from parent class
+        super(TestsEnv, self).__init__(*args, **kwargs)
+
+        # Game configuration, with mud to check that actions in mud are handled as in PyRat
+        self.config = {"maze_width": 11, "maze_height": 9, "nb_cheese": 11, "mud_percentage": 30}
+        self.players = [{"name": "a", "team": "1"},
+                        {"name": "b", "team": "2", "location": "random"}]
+
+    #############################################################################################################################################
+    #                                                               PUBLIC METHODS                                                              #
+    #############################################################################################################################################
+
+    def test_same_as_start ( self: Self
+                           ) ->    None:
+
+        """
+            This function tests that a game played with "Env" gives the same result as the same game played with "PyRat.start".
+            In:
+                * self: Reference to the current object.
+            Out:
+                * None.
+        """
+
+        # Compare a few games
+        for seed in range(3):
+
+            # Game played by PyRat
+            players = [{**player, "preprocessing_function": greedy_3.preprocessing, "turn_function": greedy_3.turn} for player in self.players]
+            stats = PyRat(players, random_seed=seed, render_mode="no_rendering", synchronous=True, in_process=True, preprocessing_time=0.0, turn_time=0.0, **self.config).start()
+
+            # Same game played step by step, asking players only when they are not in mud
+            env = Env(self.players, **self.config)
+            observation = env.reset(seed)
+            memories = {player["name"]: types.SimpleNamespace() for player in self.players}
+            for player in memories:
+                greedy_3.preprocessing(observation["maze"], observation["maze_width"], observation["maze_height"], player, observation["teams"], observation["player_locations"], observation["cheese"], env.possible_actions, memories[player])
+            done = False
+            while not done:
+                actions = {player: greedy_3.turn(observation["maze"], observation["maze_width"], observation["maze_height"], player, observation["teams"], observation["player_locations"], observation["player_scores"], observation["player_muds"], observation["cheese"], env.possible_actions, memories[player]) for player in memories if observation["player_muds"][player]["target"] is None}
+                observation, rewards, done, info = env.step(actions)
+
+            # Same scores and number of turns
+            self.assertEqual(env.turn, stats["turns"])
+            self.assertEqual(observation["player_scores"], {player: stats["players"][player]["score"] for player in stats["players"]})
+
+    #############################################################################################################################################
+
+    def test_clone_restore ( self: Self
+                           ) ->    None:
+
+        """
+            This function tests that restoring a cloned state and playing the same actions gives the same trajectory.
+            This is checked with traces of bounded and unbounded length, since they are also updated during the game.
+            In:
+                * self: Reference to the current object.
+            Out:
+                * None.
+        """
+
+        # Random actions from the middle of the game
+        for trace_length in [1, 0, 5]:
+            env = Env(self.players, trace_length=trace_length, **self.config)
+            env.reset(0)
+            random_generator = random.Random(0)
+            for _ in range(20):
+                env.step({player["name"]: random_generator.choice(env.possible_actions) for player in self.players})
+            state = env.clone()
+            actions = [{player["name"]: random_generator.choice(env.possible_actions) for player in self.players} for _ in range(100)]
+
+            # Play the same actions several times from the saved state
+            trajectories = []
+            for _ in range(3):
+                env.restore(state)
+                trajectory = []
+                for turn_actions in actions:
+                    if env.done:
+                        break
+                    trajectory.append(env.step(turn_actions))
+                trajectories.append((trajectory, {player: list(env.game.player_traces[player]) for player in env.game.player_traces}))
+            self.assertEqual(trajectories[0], trajectories[1])
+            self.assertEqual(trajectories[0], trajectories[2])
+
+            # The saved state is not modified by playing
+            env.restore(state)
+            self.assertEqual(env.clone(), state)
+
+#####################################################################################################################################################
+######################################################################## GO! ########################################################################
+#####################################################################################################################################################
+
+if __name__ == "__main__":
+
+    # Run all unit tests
+    unittest.main(verbosity=2)
+
+#####################################################################################################################################################
+#####################################################################################################################################################
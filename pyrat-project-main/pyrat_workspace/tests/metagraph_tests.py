@@ -0,0 +1,219 @@
+#####################################################################################################################################################
+######################################################################## INFO #######################################################################
+#####################################################################################################################################################
+
+"""
+    This program contains all the unit tests for the functions developed in the program "metagraph.py".
+    Let's consider the following maze for our tests:
+    #############################################################
+    # (0)       # (1)      # (2)       ⵗ (3)       # (4)        #
+    #           #          #           ⵗ           #            #
+    #           #          #           ⵗ           #            #
+    #⋅⋅⋅⋅⋅⋅⋅⋅⋅⋅⋅⋅⋅⋅⋅⋅⋅⋅⋅⋅⋅############⋅⋅⋅⋅⋅⋅⋅⋅⋅⋅⋅⋅⋅⋅⋅⋅⋅⋅⋅⋅##########################
+    # (5)       ⵗ (6)       ⵗ (7)       ⵘ (8)       ⵘ (9)       #
+    #           ⵗ           ⵗ           6           9            #
+    #           ⵗ           ⵗ           ⵘ           ⵘ           #
+    #⋅⋅⋅⋅⋅⋅⋅⋅⋅⋅⋅⋅⋅⋅⋅⋅⋅⋅⋅⋅⋅#ⴾⴾⴾⴾⴾⴾ8ⴾⴾⴾⴾⴾⴾ############⋅⋅⋅⋅⋅⋅⋅⋅⋅⋅⋅⋅⋅⋅⋅⋅⋅⋅⋅⋅⋅#############
+    # (10)      ⵗ (11)      # (12)      # (13)      # (14)      #
+    #           ⵗ           #           #           #           #
+    #           ⵗ           #           #           #           #
+    #ⴾⴾⴾⴾⴾⴾ9ⴾⴾⴾⴾⴾⴾ#⋅⋅⋅⋅⋅⋅⋅⋅⋅⋅⋅⋅⋅⋅⋅⋅⋅⋅⋅⋅#############ⴾⴾⴾⴾⴾⴾ6ⴾⴾⴾⴾⴾⴾ#⋅⋅⋅⋅⋅⋅⋅⋅⋅⋅⋅⋅⋅⋅⋅⋅⋅⋅⋅⋅⋅#
+    # (15)      ⵘ (16)      ⵗ (17)      ⵘ (18)      ⵗ (19)      #
+    #           4           ⵗ           5           ⵗ            #
+    #           ⵘ           ⵗ           ⵘ           ⵗ           #
+    #⋅⋅⋅⋅⋅⋅⋅⋅⋅⋅⋅⋅⋅⋅⋅⋅⋅⋅⋅⋅⋅#⋅⋅⋅⋅⋅⋅⋅⋅⋅⋅⋅⋅⋅⋅⋅⋅⋅⋅⋅⋅#⋅⋅⋅⋅⋅⋅⋅⋅⋅⋅⋅⋅⋅⋅⋅⋅⋅⋅⋅⋅⋅#⋅⋅⋅⋅⋅⋅⋅⋅⋅⋅⋅⋅⋅⋅⋅⋅⋅⋅⋅⋅#⋅⋅⋅⋅⋅⋅⋅⋅⋅⋅⋅⋅⋅⋅⋅⋅⋅⋅⋅⋅⋅#
+    # (20)      # (21)      ⵗ (22)      # (23)      # (24)      #
+    #           #           ⵗ           #           #           #
+    #           #           ⵗ           #           #           #
+    #############################################################
+"""
+
+#####################################################################################################################################################
+###################################################################### IMPORTS ######################################################################
+#####################################################################################################################################################
+
+# Import PyRat
+from pyrat import *
+
+# External imports
+import unittest
+import numpy
+import sys
+import os
+
+# Previously developed functions
+sys.path.append(os.path.join(os.path.dirname(os.path.realpath(__file__)), "..", "programs"))
+from metagraph import *
+from tsp_2_bis import graph_to_metagraph
+
+#####################################################################################################################################################
+############################################################### UNIT TESTS DEFINITION ###############################################################
+#####################################################################################################################################################
+
+class TestsMetagraph (unittest.TestCase):
+
+    """
+        Here we choose to use the unittest module to perform unit tests.
+        This module is very simple to use and allows to easily check if the code is working as expected.
+    """
+
+    #############################################################################################################################################
+    #                                                                CONSTRUCTOR                                                                #
+    #############################################################################################################################################
+
+    def __init__ ( self:     Self,
+                   *args:    Any,
+                   **kwargs: Any,
+                 ) ->        Self:
+
+        """
+            This function is the constructor of the class.
+            In:
+                * self:   Reference to the current object.
+                * args:   Arguments of the parent constructor.
+                * kwargs: Keyword arguments of the parent constructor.
+            Out:
+                * self: Reference to the current object.
+        """
+
+        # Inherit from parent class
+        super(TestsMetagraph, self).__init__(*args, **kwargs)
+
+        # We need to store the width of the maze
+        self.maze_width = 5
+
+        # We define the graph structure that will be used for the tests
+        self.graph_dictionary = {0: {5: 1},
+                                 2: {3: 1, 7: 1},
+                                 3: {2: 1},
+                                 5: {0: 1, 6: 1, 10: 1},
+                                 6: {5: 1, 7: 1, 11: 8},
+                                 7: {2: 1, 3: 1, 6: 1, 8: 6},
+                                 8: {7: 6, 9: 9, 13: 1},
+                                 9: {8: 9},
+                                 10: {5: 1, 11: 1, 15: 9},
+                                 11: {6: 8, 10: 1, 16: 1},
+                                 13: {8: 1, 18: 6},
+                                 14: {19: 1},
+                                 15: {10: 9, 16: 4, 20: 1},
+                                 16: {11: 1, 15: 4, 17: 1, 21: 1},
+                                 17: {16: 1, 18: 5, 22: 1},
+                                 18: {13: 6, 17: 5, 19: 1, 23: 1},
+                                 19: {14: 1, 18: 1, 24: 1},
+                                 20: {15: 1},
+                                 21: {16: 1, 22: 1},
+                                 22: {17: 1, 21: 1},
+                                 23: {18: 1},
+                                 24: {19: 1}}
+
+        # Vertices of interest
+        self.vertices = [0, 9, 14, 20, 23, 3, 21]
+
+    #############################################################################################################################################
+    #                                                               PUBLIC METHODS                                                              #
+    #############################################################################################################################################
+
+    def test_distances ( self: Self
+                       ) ->    None:
+
+        """
+            This function tests the constructor and the methods "distance" and "as_dictionary" of the class "Metagraph".
+            It checks that distances are the same as those computed by "graph_to_metagraph", for all representations of the maze.
+            In:
+                * self: Reference to the current object.
+            Out:
+                * None.
+        """
+
+        # Same distances as graph_to_metagraph
+        complete_graph, _ = graph_to_metagraph(self.graph_dictionary, self.vertices)
+        for graph in [self.graph_dictionary, MazeCSR.from_dictionary(self.graph_dictionary, self.maze_width, 5)]:
+            metagraph = Metagraph(graph, self.vertices)
+            self.assertEqual(metagraph.as_dictionary(), complete_graph)
+            for vertex_1 in self.vertices:
+                for vertex_2 in self.vertices:
+                    if vertex_1 != vertex_2:
+                        self.assertEqual(metagraph.distance(vertex_1, vertex_2), complete_graph[vertex_1][vertex_2])
+
+        # Vertices of interest should be distinct and in the maze
+        self.assertRaises(Exception, Metagraph, self.graph_dictionary, [0, 0])
+        self.assertRaises(Exception, Metagraph, self.graph_dictionary, [0, 100])
+
+    #############################################################################################################################################
+
+    def test_routes ( self: Self
+                    ) ->    None:
+
+        """
+            This function tests the methods "route" and "expand_route" of the class "Metagraph".
+            It checks that routes are shortest paths in the maze, and that routes through vertices of interest do not repeat them.
+            In:
+                * self: Reference to the current object.
+            Out:
+                * None.
+        """
+
+        # Routes are shortest paths
+        metagraph = Metagraph(self.graph_dictionary, self.vertices)
+        for vertex_1 in self.vertices:
+            for vertex_2 in self.vertices:
+                route = metagraph.route(vertex_1, vertex_2)
+                self.assertEqual(route[0], vertex_1)
+                self.assertEqual(route[-1], vertex_2)
+                self.assertEqual(sum([self.graph_dictionary[route[i]][route[i + 1]] for i in range(len(route) - 1)]), metagraph.distance(vertex_1, vertex_2) if vertex_1 != vertex_2 else 0)
+
+        # Routes can also end at vertices that are not of interest, but not at unreachable ones
+        self.assertEqual(metagraph.route(14, 18), [14, 19, 18])
+        self.assertRaises(ValueError, metagraph.route, 14, 1)
+
+        # Expanded routes go through all vertices of interest in order, without stopping
+        route = metagraph.expand_route([0, 20, 21, 23])
+        self.assertEqual(route[0], 0)
+        self.assertEqual(route[-1], 23)
+        self.assertTrue(all([route[i + 1] in self.graph_dictionary[route[i]] for i in range(len(route) - 1)]))
+        self.assertEqual(sum([self.graph_dictionary[route[i]][route[i + 1]] for i in range(len(route) - 1)]), metagraph.distance(0, 20) + metagraph.distance(20, 21) + metagraph.distance(21, 23))
+        self.assertEqual(metagraph.expand_route([14]), [14])
+
+    #############################################################################################################################################
+
+    def test_updates ( self: Self
+                     ) ->    None:
+
+        """
+            This function tests the methods "remove_vertex", "add_vertex" and "replace_vertex" of the class "Metagraph".
+            It checks that the complete graph is the same as if it was built again from the new vertices of interest.
+            In:
+                * self: Reference to the current object.
+            Out:
+                * None.
+        """
+
+        # Player moves and eats cheese
+        metagraph = Metagraph(self.graph_dictionary, self.vertices)
+        metagraph.replace_vertex(0, 5)
+        metagraph.remove_vertex(20)
+        metagraph.add_vertex(17)
+        metagraph.replace_vertex(5, 5)
+        expected_vertices = [5, 9, 14, 23, 3, 21, 17]
+        expected_metagraph = Metagraph(self.graph_dictionary, expected_vertices)
+        self.assertEqual(metagraph.vertices, expected_vertices)
+        self.assertTrue(numpy.array_equal(metagraph.distances, expected_metagraph.distances))
+        self.assertTrue(numpy.array_equal(metagraph.maze_distances, expected_metagraph.maze_distances))
+        self.assertEqual(metagraph.route(5, 17), expected_metagraph.route(5, 17))
+        self.assertEqual(metagraph.distance(21, 9), expected_metagraph.distance(21, 9))
+
+        # Vertices of interest should stay distinct
+        self.assertRaises(Exception, metagraph.add_vertex, 9)
+        self.assertRaises(Exception, metagraph.replace_vertex, 5, 9)
+
+#####################################################################################################################################################
+######################################################################## GO! ########################################################################
+#####################################################################################################################################################
+
+if __name__ == "__main__":
+
+    # Run all unit tests
+    unittest.main(verbosity=2)
+
+#####################################################################################################################################################
+#####################################################################################################################################################
@@ -0,0 +1,416 @@
+#####################################################################################################################################################
+######################################################################## INFO #######################################################################
+#####################################################################################################################################################
+
+"""
+    This program contains all the unit tests for the functions developed in the program "pathfinding.py".
+    Let's consider the following maze for our tests:
+    #############################################################
+    # (0)       # (1)      # (2)       ⵗ (3)       # (4)        #
+    #           #          #           ⵗ           #            #
+    #           #          #           ⵗ           #            #
+    #⋅⋅⋅⋅⋅⋅⋅⋅⋅⋅⋅⋅⋅⋅⋅⋅⋅⋅⋅⋅⋅############⋅⋅⋅⋅⋅⋅⋅⋅⋅⋅⋅⋅⋅⋅⋅⋅⋅⋅⋅⋅##########################
+    # (5)       ⵗ (6)       ⵗ (7)       ⵘ (8)       ⵘ (9)       #
+    #           ⵗ           ⵗ           6           9            #
+    #           ⵗ           ⵗ           ⵘ           ⵘ           #
+    #⋅⋅⋅⋅⋅⋅⋅⋅⋅⋅⋅⋅⋅⋅⋅⋅⋅⋅⋅⋅⋅#ⴾⴾⴾⴾⴾⴾ8ⴾⴾⴾⴾⴾⴾ############⋅⋅⋅⋅⋅⋅⋅⋅⋅⋅⋅⋅⋅⋅⋅⋅⋅⋅⋅⋅⋅#############
+    # (10)      ⵗ (11)      # (12)      # (13)      # (14)      #
+    #           ⵗ           #           #           #           #
+    #           ⵗ           #           #           #           #
+    #ⴾⴾⴾⴾⴾⴾ9ⴾⴾⴾⴾⴾⴾ#⋅⋅⋅⋅⋅⋅⋅⋅⋅⋅⋅⋅⋅⋅⋅⋅⋅⋅⋅⋅#############ⴾⴾⴾⴾⴾⴾ6ⴾⴾⴾⴾⴾⴾ#⋅⋅⋅⋅⋅⋅⋅⋅⋅⋅⋅⋅⋅⋅⋅⋅⋅⋅⋅⋅⋅#
+    # (15)      ⵘ (16)      ⵗ (17)      ⵘ (18)      ⵗ (19)      #
+    #           4           ⵗ           5           ⵗ            #
+    #           ⵘ           ⵗ           ⵘ           ⵗ           #
+    #⋅⋅⋅⋅⋅⋅⋅⋅⋅⋅⋅⋅⋅⋅⋅⋅⋅⋅⋅⋅⋅#⋅⋅⋅⋅⋅⋅⋅⋅⋅⋅⋅⋅⋅⋅⋅⋅⋅⋅⋅⋅#⋅⋅⋅⋅⋅⋅⋅⋅⋅⋅⋅⋅⋅⋅⋅⋅⋅⋅⋅⋅⋅#⋅⋅⋅⋅⋅⋅⋅⋅⋅⋅⋅⋅⋅⋅⋅⋅⋅⋅⋅⋅#⋅⋅⋅⋅⋅⋅⋅⋅⋅⋅⋅⋅⋅⋅⋅⋅⋅⋅⋅⋅⋅#
+    # (20)      # (21)      ⵗ (22)      # (23)      # (24)      #
+    #           #           ⵗ           #           #           #
+    #           #           ⵗ           #           #           #
+    #############################################################
+"""
+
+#####################################################################################################################################################
+###################################################################### IMPORTS ######################################################################
+#####################################################################################################################################################
+
+# Import PyRat
+from pyrat import *
+
+# External imports
+import unittest
+import numpy
+import sys
+import os
+
+# Previously developed functions
+sys.path.append(os.path.join(os.path.dirname(os.path.realpath(__file__)), "..", "programs"))
+from pathfinding import *
+from tutorial import get_neighbors
+import bfs as reference_bfs
+import dijkstra as reference_dijkstra
+
+#####################################################################################################################################################
+############################################################### UNIT TESTS DEFINITION ###############################################################
+#####################################################################################################################################################
+
+class TestsPathfinding (unittest.TestCase):
+
+    """
+        Here we choose to use the unittest module to perform unit tests.
+        This module is very simple to use and allows to easily check if the code is working as expected.
+    """
+
+    #############################################################################################################################################
+    #                                                                CONSTRUCTOR                                                                #
+    #############################################################################################################################################
+
+    def __init__ ( self:     Self,
+                   *args:    Any,
+                   **kwargs: Any,
+                 ) ->        Self:
+
+        """
+            This function is the constructor of the class.
+            In:
+                * self:   Reference to the current object.
+                * args:   Arguments of the parent constructor.
+                * kwargs: Keyword arguments of the parent constructor.
+            Out:
+                * self: Reference to the current object.
+        """
+
+        # Inherit from parent class
+        super(TestsPathfinding, self).__init__(*args, **kwargs)
+
+        # We need to store the width of the maze
+        self.maze_width = 5
+
+        # We define the graph structures that will be used for the tests
+        self.graph_dictionary = {0: {5: 1},
+                                 2: {3: 1, 7: 1},
+                                 3: {2: 1},
+                                 5: {0: 1, 6: 1, 10: 1},
+                                 6: {5: 1, 7: 1, 11: 8},
+                                 7: {2: 1, 3: 1, 6: 1, 8: 6},
+                                 8: {7: 6, 9: 9, 13: 1},
+                                 9: {8: 9},
+                                 10: {5: 1, 11: 1, 15: 9},
+                                 11: {6: 8, 10: 1, 16: 1},
+                                 13: {8: 1, 18: 6},
+                                 14: {19: 1},
+                                 15: {10: 9, 16: 4, 20: 1},
+                                 16: {11: 1, 15: 4, 17: 1, 21: 1},
+                                 17: {16: 1, 18: 5, 22: 1},
+                                 18: {13: 6, 17: 5, 19: 1, 23: 1},
+                                 19: {14: 1, 18: 1, 24: 1},
+                                 20: {15: 1},
+                                 21: {16: 1, 22: 1},
+                                 22: {17: 1, 21: 1},
+                                 23: {18: 1},
+                                 24: {19: 1}}
+        
+        # Here is the same graph represented as an adjacency matrix
+        self.graph_matrix = numpy.array([[0, 0, 0, 0, 0, 1, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0],
+                                         [0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0],
+                                         [0, 0, 0, 1, 0, 0, 0, 1, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0],
+                                         [0, 0, 1, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0],
+                                         [0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0],
+                                         [1, 0, 0, 0, 0, 0, 1, 0, 0, 0, 1, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0],
+                                         [0, 0, 0, 0, 0, 1, 0, 1, 0, 0, 0, 8, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0],
+                                         [0, 0, 1, 0, 0, 0, 1, 0, 6, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0],
+                                         [0, 0, 0, 0, 0, 0, 0, 6, 0, 9, 0, 0, 0, 1, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0],
+                                         [0, 0, 0, 0, 0, 0, 0, 0, 9, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0],
+                                         [0, 0, 0, 0, 0, 1, 0, 0, 0, 0, 0, 1, 0, 0, 0, 9, 0, 0, 0, 0, 0, 0, 0, 0, 0],
+                                         [0, 0, 0, 0, 0, 0, 8, 0, 0, 0, 1, 0, 0, 0, 0, 0, 1, 0, 0, 0, 0, 0, 0, 0, 0],
+                                         [0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 1, 0, 0, 0, 0, 0, 0, 0],
+                                         [0, 0, 0, 0, 0, 0, 0, 0, 1, 0, 0, 0, 0, 0, 0, 0, 0, 0, 6, 0, 0, 0, 0, 0, 0],
+                                         [0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 1, 0, 0, 0, 0, 0],
+                                         [0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 9, 0, 0, 0, 0, 0, 4, 0, 0, 0, 1, 0, 0, 0, 0],
+                                         [0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 1, 0, 0, 0, 4, 0, 1, 0, 0, 0, 1, 0, 0, 0],
+                                         [0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 1, 0, 5, 0, 0, 0, 1, 0, 0],
+                                         [0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 6, 0, 0, 0, 5, 0, 1, 0, 0, 0, 1, 0],
+                                         [0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 1, 0, 0, 0, 1, 0, 0, 0, 0, 0, 1],
+                                         [0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 1, 0, 0, 0, 0, 0, 0, 0, 0, 0],
+                                         [0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 1, 0, 0, 0, 0, 0, 1, 0, 0],
+                                         [0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 1, 0, 0, 0],
+                                         [0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 1, 0, 0, 0, 0, 0, 0],
+                                         [0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 1, 0, 0, 0, 0, 0]])
+
+        # And in compressed sparse row format
+        self.graph_csr = MazeCSR.from_dictionary(self.graph_dictionary, self.maze_width, 5)
+
+        # Each graph is given with the dictionary on which to compute reference results
+        matrix_as_dictionary = {vertex: {neighbor: int(self.graph_matrix[vertex, neighbor]) for neighbor in self.graph_matrix[vertex].nonzero()[0]} for vertex in range(len(self.graph_matrix)) if self.graph_matrix[vertex].any()}
+        self.graphs = [(self.graph_dictionary, self.graph_dictionary), (self.graph_matrix, matrix_as_dictionary), (self.graph_csr, self.graph_dictionary), (to_csr(self.graph_dictionary), self.graph_dictionary)]
+        
+    #############################################################################################################################################
+    #                                                               PUBLIC METHODS                                                              #
+    #############################################################################################################################################
+
+    def test_to_csr ( self: Self
+                    ) ->    None:
+
+        """
+            This function tests the function "to_csr" of the file "pathfinding.py".
+            It checks that all representations give the same neighbors and weights.
+            In:
+                * self: Reference to the current object.
+            Out:
+                * None.
+        """
+
+        # Neighbors and weights should match the original graph, in the same order as "get_neighbors"
+        for graph, reference_graph in self.graphs:
+            indptr, indices, weights = to_csr(graph)
+            for vertex in reference_graph:
+                neighbors = indices[indptr[vertex]:indptr[vertex + 1]].tolist()
+                self.assertEqual(sorted(neighbors), sorted(reference_graph[vertex].keys()))
+                if not isinstance(graph, tuple):
+                    self.assertEqual(neighbors, get_neighbors(vertex, graph))
+                self.assertEqual(weights[indptr[vertex]:indptr[vertex + 1]].tolist(), [reference_graph[vertex][neighbor] for neighbor in neighbors])
+
+        # Invalid graph types are rejected
+        self.assertRaises(Exception, to_csr, [1, 2, 3])
+
+    #############################################################################################################################################
+
+    def test_bfs ( self: Self
+                 ) ->    None:
+
+        """
+            This function tests the function "bfs" of the file "pathfinding.py".
+            It checks that results are the same as with the function "bfs" of the file "bfs.py".
+            In:
+                * self: Reference to the current object.
+            Out:
+                * None.
+        """
+
+        # Compare with the reference from all sources
+        for graph, reference_graph in self.graphs:
+            for source in self.graph_dictionary:
+                distances, routing_table = bfs(source, graph)
+                reference_distances, _ = reference_bfs.bfs(source, reference_graph)
+                for vertex in range(len(distances)):
+                    self.assertEqual(distances[vertex], reference_distances.get(vertex, float("inf")))
+
+        # Same routes as the reference, as vertices are explored in the same order
+        distances, routing_table = bfs(0, self.graph_dictionary)
+        self.assertEqual(find_route(routing_table, 0, 7), [0, 5, 6, 7])
+        self.assertEqual(find_route(routing_table, 0, 22), [0, 5, 6, 11, 16, 17, 22])
+
+        # Vertices that are not reached
+        self.assertEqual(distances[1], float("inf"))
+        self.assertEqual(routing_table[1], -1)
+
+        # Invalid sources
+        self.assertRaises(Exception, bfs, -1, self.graph_dictionary)
+        self.assertRaises(Exception, bfs, 1000, self.graph_dictionary)
+
+    #############################################################################################################################################
+
+    def test_dijkstra ( self: Self
+                      ) ->    None:
+
+        """
+            This function tests the function "dijkstra" of the file "pathfinding.py".
+            It checks that distances are the same as with the function "dijkstra" of the file "dijkstra.py", and that routes have the same length.
+            In:
+                * self: Reference to the current object.
+            Out:
+                * None.
+        """
+
+        # Compare with the reference from all sources
+        for graph, reference_graph in self.graphs:
+            for source in self.graph_dictionary:
+                distances, routing_table = dijkstra(source, graph)
+                reference_distances, _ = reference_dijkstra.dijkstra(source, reference_graph)
+                for vertex in range(len(distances)):
+                    self.assertEqual(distances[vertex], reference_distances.get(vertex, float("inf")))
+                    if distances[vertex] < float("inf"):
+                        route = find_route(routing_table, source, vertex)
+                        self.assertEqual(sum([reference_graph[route[i]][route[i + 1]] for i in range(len(route) - 1)]), distances[vertex])
+
+        # Some known values
+        distances, routing_table = dijkstra(0, self.graph_dictionary)
+        self.assertEqual(distances[8], 9)
+        self.assertEqual(find_route(routing_table, 0, 8), [0, 5, 6, 7, 8])
+
+        # Invalid sources
+        self.assertRaises(Exception, dijkstra, -1, self.graph_dictionary)
+        self.assertRaises(Exception, dijkstra, 1000, self.graph_dictionary)
+
+    #############################################################################################################################################
+
+    def test_multi_source ( self: Self
+                          ) ->    None:
+
+        """
+            This function tests the functions "multi_source_bfs" and "multi_source_dijkstra" of the file "pathfinding.py".
+            It checks that each vertex is reached from the closest source.
+            In:
+                * self: Reference to the current object.
+            Out:
+                * None.
+        """
+
+        # Distances should be the minimum over sources
+        sources = [0, 24, 9]
+        for multi_source_traversal, traversal in [(multi_source_bfs, bfs), (multi_source_dijkstra, dijkstra)]:
+            for graph, _ in self.graphs:
+                distances, routing_table = multi_source_traversal(sources, graph)
+                single_source_distances = numpy.min([traversal(source, graph)[0] for source in sources], axis=0)
+                self.assertTrue(numpy.array_equal(distances, single_source_distances))
+                for source in sources:
+                    self.assertEqual(routing_table[source], -1)
+
+        # Routes lead back to one of the sources
+        distances, routing_table = multi_source_dijkstra(sources, self.graph_dictionary)
+        self.assertEqual(find_route(routing_table, 24, 14), [24, 19, 14])
+        self.assertEqual(find_route(routing_table, 0, 17), [0, 5, 10, 11, 16, 17])
+
+    #############################################################################################################################################
+
+    def test_nearest_targets ( self: Self
+                             ) ->    None:
+
+        """
+            This function tests the function "nearest_targets" of the file "pathfinding.py".
+            It checks that the closest targets are returned in order, with the same distances as a complete traversal.
+            In:
+                * self: Reference to the current object.
+            Out:
+                * None.
+        """
+
+        # Targets are found by increasing distance, with valid routes
+        targets = [24, 9, 17, 20]
+        for graph, _ in self.graphs:
+            distances, _ = dijkstra(0, graph)
+            nearest = nearest_targets(0, targets, graph)
+            self.assertEqual(sorted(target for target, _, _ in nearest), sorted(targets))
+            self.assertEqual([distance for _, distance, _ in nearest], sorted(distances[targets].tolist()))
+            for target, distance, route in nearest:
+                self.assertEqual(route[0], 0)
+                self.assertEqual(route[-1], target)
+                self.assertEqual(distance, distances[target])
+
+        # Only the k closest targets are returned
+        for k in range(len(targets) + 2):
+            nearest = nearest_targets(0, targets, self.graph_dictionary, k)
+            self.assertEqual(nearest, nearest_targets(0, targets, self.graph_dictionary)[:k])
+
+        # Unreachable targets are ignored, and a target at the source is at distance 0
+        self.assertEqual(nearest_targets(0, [1], self.graph_dictionary), [])
+        self.assertEqual(nearest_targets(0, [0, 24], self.graph_dictionary, 1), [(0, 0, [0])])
+
+        # Source should be in the graph
+        self.assertRaises(Exception, nearest_targets, 100, targets, self.graph_dictionary)
+
+    #############################################################################################################################################
+
+    def test_cheese_distance_field ( self: Self
+                                   ) ->    None:
+
+        """
+            This function tests the class "CheeseDistanceField" of the file "pathfinding.py".
+            It checks that distances stay the same as those of "multi_source_dijkstra" when pieces of cheese are eaten or added.
+            In:
+                * self: Reference to the current object.
+            Out:
+                * None.
+        """
+
+        # Distances should match a complete traversal after each update
+        for graph, _ in self.graphs:
+            cheese = [24, 9, 17, 20]
+            field = CheeseDistanceField(graph, cheese)
+            for new_cheese in [[24, 9, 17], [24, 17], [24, 17, 5], [5], [], [9]]:
+                field.update(new_cheese)
+                distances, _ = multi_source_dijkstra(new_cheese, graph)
+                self.assertTrue(numpy.array_equal(field.distances, distances))
+
+        # Routes lead to the closest piece of cheese
+        field = CheeseDistanceField(self.graph_dictionary, [24, 17])
+        self.assertEqual(field.route(14), [14, 19, 24])
+        self.assertEqual(field.next_vertex(14), 19)
+        self.assertEqual(field.distance(14), 2)
+        field.remove_cheese(24)
+        self.assertEqual(field.route(14)[-1], 17)
+        self.assertEqual(field.next_vertex(17), -1)
+
+        # Unreachable vertices and invalid updates
+        self.assertRaises(ValueError, field.route, 1)
+        self.assertRaises(Exception, field.remove_cheese, 24)
+        self.assertRaises(Exception, CheeseDistanceField, self.graph_dictionary, [100])
+
+    #############################################################################################################################################
+
+    def test_a_star_context ( self: Self
+                            ) ->    None:
+
+        """
+            This function tests the class "AStarContext" of the file "pathfinding.py".
+            It checks that consecutive searches with the same context find shortest paths, as "dijkstra" does.
+            In:
+                * self: Reference to the current object.
+            Out:
+                * None.
+        """
+
+        # Shortest paths between all pairs of vertices, with and without tie breaking, and with a custom heuristic
+        for graph, reference_graph in self.graphs:
+            contexts = [AStarContext(graph, self.maze_width), AStarContext(graph, self.maze_width, tie_breaking=True), AStarContext(graph, self.maze_width, lambda vertex, target: 0)]
+            for source in reference_graph:
+                distances, _ = dijkstra(source, graph)
+                for target in range(len(distances)):
+                    for context in contexts:
+                        route, distance = context.search(source, target)
+                        self.assertEqual(distance, distances[target])
+                        if distance < float("inf"):
+                            self.assertEqual(route[0], source)
+                            self.assertEqual(route[-1], target)
+                            self.assertEqual(sum([reference_graph[route[i]][route[i + 1]] for i in range(len(route) - 1)]), distance)
+                        else:
+                            self.assertEqual(route, [])
+
+        # Vertices should be in the graph
+        self.assertRaises(Exception, AStarContext(self.graph_dictionary, self.maze_width).search, 0, 100)
+
+    #############################################################################################################################################
+
+    def test_find_route ( self: Self
+                        ) ->    None:
+
+        """
+            This function tests the function "find_route" of the file "pathfinding.py".
+            It checks that it works with both arrays and dictionaries, and detects incomplete routing tables.
+            In:
+                * self: Reference to the current object.
+            Out:
+                * None.
+        """
+
+        # Arrays and dictionaries give the same routes
+        _, routing_table = dijkstra(0, self.graph_dictionary)
+        routing_table_dictionary = {vertex: (int(routing_table[vertex]) if routing_table[vertex] >= 0 else None) for vertex in self.graph_dictionary}
+        self.assertEqual(find_route(routing_table, 0, 22), find_route(routing_table_dictionary, 0, 22))
+        self.assertEqual(find_route(routing_table, 0, 0), [0])
+
+        # Missing routes
+        with self.assertRaises(ValueError):
+            find_route(routing_table, 0, 1)
+        with self.assertRaises(ValueError):
+            find_route(routing_table_dictionary, 0, 99)
+
+#####################################################################################################################################################
+######################################################################## GO! ########################################################################
+#####################################################################################################################################################
+
+if __name__ == "__main__":
+
+    # Run all unit tests
+    unittest.main(verbosity=2)
+
+#####################################################################################################################################################
+#####################################################################################################################################################
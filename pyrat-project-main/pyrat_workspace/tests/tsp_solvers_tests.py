@@ -0,0 +1,226 @@
+#####################################################################################################################################################
+######################################################################## INFO #######################################################################
+#####################################################################################################################################################
+
+"""
+    This program contains all the unit tests for the functions developed in the program "tsp_solvers.py".
+    Let's consider the following maze for our tests:
+    #############################################################
+    # (0)       # (1)      # (2)       ⵗ (3)       # (4)        #
+    #           #          #           ⵗ           #            #
+    #           #          #           ⵗ           #            #
+    #⋅⋅⋅⋅⋅⋅⋅⋅⋅⋅⋅⋅⋅⋅⋅⋅⋅⋅⋅⋅⋅############⋅⋅⋅⋅⋅⋅⋅⋅⋅⋅⋅⋅⋅⋅⋅⋅⋅⋅⋅⋅##########################
+    # (5)       ⵗ (6)       ⵗ (7)       ⵘ (8)       ⵘ (9)       #
+    #           ⵗ           ⵗ           6           9            #
+    #           ⵗ           ⵗ           ⵘ           ⵘ           #
+    #⋅⋅⋅⋅⋅⋅⋅⋅⋅⋅⋅⋅⋅⋅⋅⋅⋅⋅⋅⋅⋅#ⴾⴾⴾⴾⴾⴾ8ⴾⴾⴾⴾⴾⴾ############⋅⋅⋅⋅⋅⋅⋅⋅⋅⋅⋅⋅⋅⋅⋅⋅⋅⋅⋅⋅⋅#############
+    # (10)      ⵗ (11)      # (12)      # (13)      # (14)      #
+    #           ⵗ           #           #           #           #
+    #           ⵗ           #           #           #           #
+    #ⴾⴾⴾⴾⴾⴾ9ⴾⴾⴾⴾⴾⴾ#⋅⋅⋅⋅⋅⋅⋅⋅⋅⋅⋅⋅⋅⋅⋅⋅⋅⋅⋅⋅#############ⴾⴾⴾⴾⴾⴾ6ⴾⴾⴾⴾⴾⴾ#⋅⋅⋅⋅⋅⋅⋅⋅⋅⋅⋅⋅⋅⋅⋅⋅⋅⋅⋅⋅⋅#
+    # (15)      ⵘ (16)      ⵗ (17)      ⵘ (18)      ⵗ (19)      #
+    #           4           ⵗ           5           ⵗ            #
+    #           ⵘ           ⵗ           ⵘ           ⵗ           #
+    #⋅⋅⋅⋅⋅⋅⋅⋅⋅⋅⋅⋅⋅⋅⋅⋅⋅⋅⋅⋅⋅#⋅⋅⋅⋅⋅⋅⋅⋅⋅⋅⋅⋅⋅⋅⋅⋅⋅⋅⋅⋅#⋅⋅⋅⋅⋅⋅⋅⋅⋅⋅⋅⋅⋅⋅⋅⋅⋅⋅⋅⋅⋅#⋅⋅⋅⋅⋅⋅⋅⋅⋅⋅⋅⋅⋅⋅⋅⋅⋅⋅⋅⋅#⋅⋅⋅⋅⋅⋅⋅⋅⋅⋅⋅⋅⋅⋅⋅⋅⋅⋅⋅⋅⋅#
+    # (20)      # (21)      ⵗ (22)      # (23)      # (24)      #
+    #           #           ⵗ           #           #           #
+    #           #           ⵗ           #           #           #
+    #############################################################
+"""
+
+#####################################################################################################################################################
+###################################################################### IMPORTS ######################################################################
+#####################################################################################################################################################
+
+# Import PyRat
+from pyrat import *
+
+# External imports
+import unittest
+import itertools
+import time
+import numpy
+import sys
+import os
+
+# Previously developed functions
+sys.path.append(os.path.join(os.path.dirname(os.path.realpath(__file__)), "..", "programs"))
+from tsp_solvers import *
+from metagraph import Metagraph
+from tsp_2_bis import graph_to_metagraph as graph_to_dictionary_metagraph
+from tsp_3_bis import graph_to_metagraph as graph_to_matrix_metagraph
+
+#####################################################################################################################################################
+############################################################### UNIT TESTS DEFINITION ###############################################################
+#####################################################################################################################################################
+
+class TestsTspSolvers (unittest.TestCase):
+
+    """
+        Here we choose to use the unittest module to perform unit tests.
+        This module is very simple to use and allows to easily check if the code is working as expected.
+    """
+
+    #############################################################################################################################################
+    #                                                                CONSTRUCTOR                                                                #
+    #############################################################################################################################################
+
+    def __init__ ( self:     Self,
+                   *args:    Any,
+                   **kwargs: Any,
+                 ) ->        Self:
+
+        """
+            This function is the constructor of the class.
+            In:
+                * self:   Reference to the current object.
+                * args:   Arguments of the parent constructor.
+                * kwargs: Keyword arguments of the parent constructor.
+            Out:
+                * self: Reference to the current object.
+        """
+
+        # Inherit from parent class
+        super(TestsTspSolvers, self).__init__(*args, **kwargs)
+
+        # We define the graph structure that will be used for the tests
+        self.graph_dictionary = {0: {5: 1},
+                                 2: {3: 1, 7: 1},
+                                 3: {2: 1},
+                                 5: {0: 1, 6: 1, 10: 1},
+                                 6: {5: 1, 7: 1, 11: 8},
+                                 7: {2: 1, 3: 1, 6: 1, 8: 6},
+                                 8: {7: 6, 9: 9, 13: 1},
+                                 9: {8: 9},
+                                 10: {5: 1, 11: 1, 15: 9},
+                                 11: {6: 8, 10: 1, 16: 1},
+                                 13: {8: 1, 18: 6},
+                                 14: {19: 1},
+                                 15: {10: 9, 16: 4, 20: 1},
+                                 16: {11: 1, 15: 4, 17: 1, 21: 1},
+                                 17: {16: 1, 18: 5, 22: 1},
+                                 18: {13: 6, 17: 5, 19: 1, 23: 1},
+                                 19: {14: 1, 18: 1, 24: 1},
+                                 20: {15: 1},
+                                 21: {16: 1, 22: 1},
+                                 22: {17: 1, 21: 1},
+                                 23: {18: 1},
+                                 24: {19: 1}}
+
+        # Complete graphs of some vertices, as dictionary and matrix (where the source is the first vertex)
+        self.vertices = [0, 9, 14, 20, 23, 3, 21]
+        self.dictionary_metagraph, _ = graph_to_dictionary_metagraph(self.graph_dictionary, self.vertices)
+        self.matrix_metagraph, _ = graph_to_matrix_metagraph(self.graph_dictionary, self.vertices)
+
+    #############################################################################################################################################
+    #                                                               PUBLIC METHODS                                                              #
+    #############################################################################################################################################
+
+    def brute_force ( self:           Self,
+                      complete_graph: Union[numpy.ndarray, Dict[int, Dict[int, int]]],
+                      source:         int
+                    ) ->              float:
+
+        """
+            This function computes the length of the shortest route by trying all of them, to compare solvers with.
+            In:
+                * self:           Reference to the current object.
+                * complete_graph: Complete graph of the vertices of interest.
+                * source:         Vertex from which to start the route.
+            Out:
+                * best_length: Length of the shortest route.
+        """
+
+        # Try all orders
+        if isinstance(complete_graph, Metagraph):
+            complete_graph = complete_graph.as_dictionary()
+        vertices = [vertex for vertex in (complete_graph.keys() if isinstance(complete_graph, dict) else range(len(complete_graph))) if vertex != source]
+        routes = [[source] + list(order) for order in itertools.permutations(vertices)]
+        return min([sum([complete_graph[route[i]][route[i + 1]] for i in range(len(route) - 1)]) for route in routes])
+
+    #############################################################################################################################################
+
+    def test_solvers ( self: Self
+                     ) ->    None:
+
+        """
+            This function tests the functions "held_karp", "branch_and_bound", "local_search" and "tsp" of the file "tsp_solvers.py".
+            It checks that they find routes visiting all vertices, with the same length as the shortest one.
+            In:
+                * self: Reference to the current object.
+            Out:
+                * None.
+        """
+
+        # Optimal routes from the given source, for both types of complete graphs
+        for complete_graph, vertices, source in [(self.dictionary_metagraph, self.vertices, 0), (self.dictionary_metagraph, self.vertices, 14), (self.matrix_metagraph, list(range(len(self.vertices))), 0), (Metagraph(self.graph_dictionary, self.vertices), self.vertices, 9)]:
+            best_length = self.brute_force(complete_graph, source)
+            for solver in [held_karp, branch_and_bound, lambda complete_graph, source: local_search(complete_graph, source, 0.1, 0), tsp]:
+                route, length = solver(complete_graph, source)
+                self.assertEqual(route[0], source)
+                self.assertEqual(sorted(route), sorted(vertices))
+                self.assertEqual(length, best_length)
+                if not isinstance(complete_graph, Metagraph):
+                    self.assertEqual(length, sum([complete_graph[route[i]][route[i + 1]] for i in range(len(route) - 1)]))
+
+        # A single vertex gives an empty route
+        for solver in [held_karp, branch_and_bound, lambda complete_graph, source: local_search(complete_graph, source, 0.1), tsp]:
+            self.assertEqual(solver({0: {}}, 0), ([0], 0))
+
+    #############################################################################################################################################
+
+    def test_time_budget ( self: Self
+                         ) ->    None:
+
+        """
+            This function tests that "branch_and_bound" and "local_search" return a complete route even with no time to search.
+            In:
+                * self: Reference to the current object.
+            Out:
+                * None.
+        """
+
+        # At worst, the route found by going to the closest vertex is returned
+        for solver in [branch_and_bound, local_search]:
+            route, length = solver(self.dictionary_metagraph, 0, 0.0)
+            self.assertEqual(sorted(route), sorted(self.vertices))
+            self.assertGreaterEqual(length, self.brute_force(self.dictionary_metagraph, 0))
+
+    #############################################################################################################################################
+
+    def test_large_tsp ( self: Self
+                       ) ->    None:
+
+        """
+            This function tests that "tsp" is bounded in time by default on complete graphs too large for "held_karp".
+            It also checks that "branch_and_bound" is only used when an exact solution is requested.
+            In:
+                * self: Reference to the current object.
+            Out:
+                * None.
+        """
+
+        # Random points in the plane, with a few more vertices than "held_karp" handles
+        points = numpy.random.default_rng(0).uniform(0, 100, (HELD_KARP_MAX_VERTICES + 10, 2))
+        complete_graph = numpy.round(numpy.linalg.norm(points[:, None] - points[None, :], axis=2))
+
+        # The default time budget applies, and no time budget requires an exact solution
+        start_time = time.process_time()
+        route, length = tsp(complete_graph, 0)
+        self.assertLess(time.process_time() - start_time, TSP_DEFAULT_TIME_BUDGET + 0.5)
+        self.assertEqual(sorted(route), list(range(len(points))))
+        self.assertRaises(Exception, tsp, complete_graph, 0, None)
+        route, length = tsp(complete_graph, 0, 0.0, exact=True)
+        self.assertEqual(sorted(route), list(range(len(points))))
+
+#####################################################################################################################################################
+######################################################################## GO! ########################################################################
+#####################################################################################################################################################
+
+if __name__ == "__main__":
+
+    # Run all unit tests
+    unittest.main(verbosity=2)
+
+#####################################################################################################################################################
+#####################################################################################################################################################
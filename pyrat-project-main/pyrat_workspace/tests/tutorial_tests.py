@@ -132,6 +132,9 @@ class TestsTutorial (unittest.TestCase):
                                          [0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 1, 0, 0, 0, 0, 0, 0],
                                          [0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 1, 0, 0, 0, 0, 0]])
         
+        # And here in the compact format
+        self.graph_csr = MazeCSR.from_dictionary(self.graph_dictionary, self.maze_width, 5)
+        
     #############################################################################################################################################
     #                                                               PUBLIC METHODS                                                              #
     #############################################################################################################################################
@@ -141,15 +144,15 @@ class TestsTutorial (unittest.TestCase):
 
         """
             This function tests the function "get_vertices" of the file "tutorial.py".
-            It checks that the function returns the correct list of vertices for both graph structures.
+            It checks that the function returns the correct list of vertices for all graph structures.
             In:
                 * self: Reference to the current object.
             Out:
                 * None.
         """
 
-        # We test the function for both graph structures
-        for graph in [self.graph_dictionary, self.graph_matrix]:
+        # We test the function for all graph structures
+        for graph in [self.graph_dictionary, self.graph_matrix, self.graph_csr]:
 
             # We check that the function returns the correct list of vertices
             self.assertEqual(get_vertices(graph), [0, 2, 3, 5, 6, 7, 8, 9, 10, 11, 13, 14, 15, 16, 17, 18, 19, 20, 21, 22, 23, 24])
@@ -161,15 +164,15 @@ class TestsTutorial (unittest.TestCase):
 
         """
             This function tests the function "get_neighbors" of the file "tutorial.py".
-            It checks that the function returns the correct list of neighbors for both graph structures.
+            It checks that the function returns the correct list of neighbors for all graph structures.
             In:
                 * self: Reference to the current object.
             Out:
                 * None.
         """
 
-        # We test the function for both graph structures
-        for graph in [self.graph_dictionary, self.graph_matrix]:
+        # We test the function for all graph structures
+        for graph in [self.graph_dictionary, self.graph_matrix, self.graph_csr]:
 
             # We check that the function returns the correct list of neighbors for standard cases
             self.assertEqual(get_neighbors(9, graph), [8])
@@ -183,6 +186,7 @@ class TestsTutorial (unittest.TestCase):
         # Note the different behavior between structures when not using the function correctly (cf. comments regarding assertions in function definition)
         self.assertRaises(Exception, get_neighbors, 1, self.graph_dictionary)
         self.assertEqual(get_neighbors(1, self.graph_matrix), [])
+        self.assertEqual(get_neighbors(1, self.graph_csr), [])
 
     #############################################################################################################################################
 
@@ -191,15 +195,15 @@ class TestsTutorial (unittest.TestCase):
 
         """
             This function tests the function "get_weight" of the file "tutorial.py".
-            It checks that the function returns the correct weight for both graph structures.
+            It checks that the function returns the correct weight for all graph structures.
             In:
                 * self: Reference to the current object.
             Out:
                 * None.
         """
 
-        # We test the function for both graph structures
-        for graph in [self.graph_dictionary, self.graph_matrix]:
+        # We test the function for all graph structures
+        for graph in [self.graph_dictionary, self.graph_matrix, self.graph_csr]:
 
             # We check that the function returns the correct weight for standard cases
             self.assertEqual(get_weight(9, 8, graph), 9)
@@ -211,6 +215,8 @@ class TestsTutorial (unittest.TestCase):
         # Note the different behavior between structures when not using the function correctly (cf. comments regarding assertions in function definition)
         self.assertRaises(Exception, get_weight, 0, 0, self.graph_dictionary)
         self.assertRaises(Exception, get_weight, 0, 1, self.graph_dictionary)
+        self.assertRaises(Exception, get_weight, 0, 0, self.graph_csr)
+        self.assertRaises(Exception, get_weight, 0, 1, self.graph_csr)
         self.assertEqual(get_weight(0, 0, self.graph_matrix), 0)
         self.assertEqual(get_weight(0, 1, self.graph_matrix), 0)
 